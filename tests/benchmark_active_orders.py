@@ -0,0 +1,91 @@
+"""
+Cost of active order lookups in OmsEngine over 10k active orders: scanning
+all active orders versus the symbol, gateway and reference indexes.
+
+Run with: python tests/benchmark_active_orders.py
+"""
+
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Callable, List
+
+from vnpy.event import Event, EventEngine
+from vnpy.trader.constant import Direction, Exchange, Offset, Status
+from vnpy.trader.engine import OmsEngine
+from vnpy.trader.event import EVENT_ORDER
+from vnpy.trader.object import OrderData
+
+
+def create_orders(count: int) -> List[OrderData]:
+    """
+    Create active orders spread over 100 symbols, 10 gateways and 50 references.
+    """
+    orders: List[OrderData] = []
+
+    for i in range(count):
+        orders.append(
+            OrderData(
+                symbol=f"s{i % 100}",
+                exchange=Exchange.SHFE,
+                orderid=str(i),
+                direction=Direction.LONG,
+                offset=Offset.OPEN,
+                price=3500,
+                volume=1,
+                status=Status.NOTTRADED,
+                reference=f"strategy{i % 50}",
+                gateway_name=f"gateway{i % 10}"
+            )
+        )
+
+    return orders
+
+
+def measure(func: Callable[[int], object], count: int) -> float:
+    """
+    Return microseconds per call of func(i) for i in range(count).
+    """
+    start: float = perf_counter()
+    for i in range(count):
+        func(i)
+    return (perf_counter() - start) / count * 1_000_000
+
+
+def main() -> None:
+    """"""
+    oms: OmsEngine = OmsEngine(SimpleNamespace(), EventEngine())
+    orders: List[OrderData] = create_orders(10000)
+
+    cost: float = measure(lambda i: oms.process_order_event(Event(EVENT_ORDER, orders[i])), len(orders))
+    print(f"process_order_event {cost:.2f} us")
+
+    active: dict = oms.active_orders
+    loops: int = 1000
+
+    for name, key, scan, index in (
+        (
+            "symbol",
+            lambda i: f"s{i % 100}.SHFE",
+            lambda key: [o for o in active.values() if o.vt_symbol == key],
+            oms.get_all_active_orders
+        ),
+        (
+            "gateway",
+            lambda i: f"gateway{i % 10}",
+            lambda key: [o for o in active.values() if o.gateway_name == key],
+            oms.get_gateway_active_orders
+        ),
+        (
+            "reference",
+            lambda i: f"strategy{i % 50}",
+            lambda key: [o for o in active.values() if o.reference == key],
+            oms.get_reference_active_orders
+        ),
+    ):
+        scan_cost: float = measure(lambda i: scan(key(i)), loops)
+        index_cost: float = measure(lambda i: index(key(i)), loops)
+        print(f"{name:10s} scan {scan_cost:8.1f} us, index {index_cost:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
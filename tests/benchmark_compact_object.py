@@ -0,0 +1,98 @@
+"""
+Construction time and memory of TickData/BarData versus the slotted
+CompactTickData/CompactBarData with interned vt_symbol.
+
+Run with: python tests/benchmark_compact_object.py
+"""
+
+import tracemalloc
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import TickData, BarData, CompactTickData, CompactBarData
+
+
+def create_tick(cls: type, i: int, dt: datetime) -> TickData:
+    """
+    Create a tick with all prices and volumes filled.
+    """
+    price: float = 3500 + i % 100
+    return cls(
+        symbol="rb2505",
+        exchange=Exchange.SHFE,
+        datetime=dt,
+        gateway_name="CTP",
+        volume=i,
+        turnover=i * price * 10,
+        open_interest=100000,
+        last_price=price,
+        high_price=price + 10,
+        low_price=price - 10,
+        pre_close=3500,
+        bid_price_1=price - 1,
+        ask_price_1=price + 1,
+        bid_volume_1=10,
+        ask_volume_1=20
+    )
+
+
+def create_bar(cls: type, i: int, dt: datetime) -> BarData:
+    """
+    Create a one minute bar.
+    """
+    price: float = 3500 + i % 100
+    return cls(
+        symbol="rb2505",
+        exchange=Exchange.SHFE,
+        datetime=dt,
+        gateway_name="CTP",
+        interval=Interval.MINUTE,
+        volume=i,
+        turnover=i * price * 10,
+        open_interest=100000,
+        open_price=price,
+        high_price=price + 10,
+        low_price=price - 10,
+        close_price=price
+    )
+
+
+def measure(factory: Callable[[type, int, datetime], object], cls: type, count: int) -> Tuple[float, float]:
+    """
+    Return (microseconds, bytes) per object of creating count objects.
+    """
+    dts: List[datetime] = [datetime(2025, 1, 2, 9) + timedelta(seconds=i) for i in range(count)]
+
+    start: float = perf_counter()
+    objects: list = [factory(cls, i, dt) for i, dt in zip(range(count), dts)]
+    cost: float = perf_counter() - start
+    del objects
+
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    objects = [factory(cls, i, dt) for i, dt in zip(range(count), dts)]
+    size: int = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    assert len({id(obj.vt_symbol) for obj in objects}) == 1
+
+    return cost / count * 1_000_000, size / count
+
+
+def main() -> None:
+    """"""
+    count: int = 100000
+
+    for factory, classes in (
+        (create_tick, (TickData, CompactTickData)),
+        (create_bar, (BarData, CompactBarData)),
+    ):
+        for cls in classes:
+            cost, size = measure(factory, cls, count)
+            print(f"{cls.__name__:16s} {cost:.2f} us/obj {size:6.0f} B/obj")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Throughput of EventEngine: per-event loop versus batched drain.
+
+Run with: python tests/benchmark_event_engine.py
+"""
+
+from threading import Event as ThreadEvent
+from time import perf_counter
+
+from vnpy.event import Event, EventEngine
+
+
+def measure(batch: bool, count: int) -> float:
+    """
+    Return events per second of putting count events and processing them.
+    """
+    engine: EventEngine = EventEngine(interval=3600, batch=batch)
+    finished: ThreadEvent = ThreadEvent()
+    processed: list = [0]
+
+    def handler(event: Event) -> None:
+        """"""
+        processed[0] += 1
+        if processed[0] == count:
+            finished.set()
+
+    engine.register("eBenchmark", handler)
+    engine.start()
+
+    start: float = perf_counter()
+    for i in range(count):
+        engine.put(Event("eBenchmark", i))
+    finished.wait()
+    cost: float = perf_counter() - start
+
+    engine.stop()
+    return count / cost
+
+
+def main() -> None:
+    """"""
+    count: int = 500000
+
+    for batch in (False, True):
+        rate: float = measure(batch, count)
+        name: str = "batch drain" if batch else "per event"
+        print(f"{name:12s} {rate:,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
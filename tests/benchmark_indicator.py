@@ -0,0 +1,83 @@
+"""
+Throughput of ArrayManager indicators: talib over the window on every bar
+versus incremental indicators.
+
+Run with: python tests/benchmark_indicator.py
+"""
+
+from time import perf_counter
+from typing import List
+
+from vnpy.trader.indicator import (
+    SmaIndicator,
+    EmaIndicator,
+    AtrIndicator,
+    RsiIndicator,
+    MacdIndicator,
+    BollIndicator,
+    DonchianIndicator
+)
+from vnpy.trader.object import BarData
+from vnpy.trader.utility import ArrayManager, RingArrayManager
+
+from test_indicator import generate_bars
+
+
+def benchmark_talib(manager_class: type, bars: List[BarData]) -> float:
+    """
+    Return microseconds per bar of updating and calculating with talib.
+    """
+    manager: ArrayManager = manager_class(100)
+    start: float = perf_counter()
+
+    for bar in bars:
+        manager.update_bar(bar)
+        manager.sma(20)
+        manager.ema(20)
+        manager.atr(14)
+        manager.rsi(14)
+        manager.macd(12, 26, 9)
+        manager.boll(20, 2)
+        manager.donchian(20)
+
+    return (perf_counter() - start) / len(bars) * 1_000_000
+
+
+def benchmark_incremental(manager_class: type, bars: List[BarData]) -> float:
+    """
+    Return microseconds per bar of updating with incremental indicators.
+    """
+    manager: ArrayManager = manager_class(100)
+    manager.register_indicator("sma", SmaIndicator(20))
+    manager.register_indicator("ema", EmaIndicator(20))
+    manager.register_indicator("atr", AtrIndicator(14))
+    manager.register_indicator("rsi", RsiIndicator(14))
+    manager.register_indicator("macd", MacdIndicator(12, 26, 9))
+    manager.register_indicator("boll", BollIndicator(20, 2))
+    manager.register_indicator("donchian", DonchianIndicator(20))
+
+    start: float = perf_counter()
+
+    for bar in bars:
+        manager.update_bar(bar)
+
+    return (perf_counter() - start) / len(bars) * 1_000_000
+
+
+def main() -> None:
+    """"""
+    bars: List[BarData] = generate_bars(20000)
+
+    for manager_class in (ArrayManager, RingArrayManager):
+        talib_cost: float = benchmark_talib(manager_class, bars)
+        incremental_cost: float = benchmark_incremental(manager_class, bars)
+
+        print(
+            f"{manager_class.__name__}: "
+            f"talib {talib_cost:.1f} us/bar, "
+            f"incremental {incremental_cost:.1f} us/bar"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Cost of price rounding: Decimal reference, PriceRounder scalar and array.
+
+Run with: python tests/benchmark_price_rounder.py
+"""
+
+from time import perf_counter
+from typing import Callable, Dict
+
+import numpy as np
+
+from vnpy.trader.utility import PriceRounder, decimal_floor_to, floor_to
+
+
+def measure(func: Callable[[float], float], values: np.ndarray) -> float:
+    """
+    Return nanoseconds per value of calling func on every value.
+    """
+    data: list = values.tolist()
+    start: float = perf_counter()
+
+    for value in data:
+        func(value)
+
+    return (perf_counter() - start) / len(data) * 1_000_000_000
+
+
+def measure_array(func: Callable[[np.ndarray], np.ndarray], values: np.ndarray) -> float:
+    """
+    Return nanoseconds per value of calling func on the whole array.
+    """
+    start: float = perf_counter()
+    func(values)
+    return (perf_counter() - start) / len(values) * 1_000_000_000
+
+
+def main() -> None:
+    """"""
+    pricetick: float = 0.2
+    rounder: PriceRounder = PriceRounder(pricetick)
+    rng: np.random.Generator = np.random.default_rng(0)
+
+    samples: Dict[str, np.ndarray] = {
+        "random": rng.uniform(3000, 4000, 100000),
+        "on grid": rng.integers(15000, 20000, 100000) * 2 / 10,
+    }
+
+    for name, values in samples.items():
+        print(
+            f"{name:8s} "
+            f"decimal {measure(lambda v: decimal_floor_to(v, pricetick), values):.0f} ns, "
+            f"floor_to {measure(lambda v: floor_to(v, pricetick), values):.0f} ns, "
+            f"PriceRounder.floor_to {measure(rounder.floor_to, values):.0f} ns, "
+            f"floor_array {measure_array(rounder.floor_array, values):.1f} ns"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Parity of BulkBarGenerator with the streaming BarGenerator.
+"""
+
+import unittest
+from datetime import datetime, time, timedelta
+from typing import List, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from vnpy.trader.constant import BarType, Exchange, Interval
+from vnpy.trader.object import BarData, TickData, BarBatch, TickBatch
+from vnpy.trader.utility import BarGenerator, BulkBarGenerator
+
+
+# Trading sessions of generated ticks, the night session crosses midnight
+SESSIONS: List[Tuple[time, timedelta]] = [
+    (time(9, 0), timedelta(minutes=75)),
+    (time(10, 30), timedelta(minutes=60)),
+    (time(13, 30), timedelta(minutes=90)),
+    (time(21, 0), timedelta(minutes=330)),
+]
+
+
+def generate_ticks(days: int, seed: int = 11) -> List[TickData]:
+    """
+    Generate random ticks with zero price ticks and tick high/low spikes.
+    """
+    tz: ZoneInfo = ZoneInfo("Asia/Shanghai")
+    rng: np.random.Generator = np.random.default_rng(seed)
+    ticks: List[TickData] = []
+
+    for d in range(days):
+        day: datetime = datetime(2024, 3, 4, tzinfo=tz) + timedelta(days=d)
+        volume: int = 0
+        turnover: float = 0
+        price: float = 3500
+        high: float = price
+        low: float = price
+
+        for start, length in SESSIONS:
+            dt: datetime = day.replace(hour=start.hour, minute=start.minute)
+            end: datetime = dt + length
+
+            while dt < end:
+                dt += timedelta(milliseconds=int(rng.integers(200, 3000)))
+
+                price = round(price + rng.normal(0, 1))
+                change: int = int(rng.integers(0, 20))
+                volume += change
+                turnover += change * price * 10
+
+                spike: float = 3 if rng.random() < 0.02 else 0
+                high = max(high, price + spike)
+                low = min(low, price - spike)
+
+                last_price: float = 0 if rng.random() < 0.005 else price
+
+                ticks.append(
+                    TickData(
+                        gateway_name="DB",
+                        symbol="rb2505",
+                        exchange=Exchange.SHFE,
+                        datetime=dt,
+                        volume=volume,
+                        turnover=turnover,
+                        open_interest=1000 + d + len(ticks) % 7,
+                        last_price=last_price,
+                        high_price=high,
+                        low_price=low
+                    )
+                )
+
+    return ticks
+
+
+class BulkBarGeneratorTest(unittest.TestCase):
+    """"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """"""
+        cls.ticks: List[TickData] = generate_ticks(4)
+
+        cls.bars: List[BarData] = []
+        generator: BarGenerator = BarGenerator(cls.bars.append)
+        for tick in cls.ticks:
+            generator.update_tick(tick)
+
+    def test_minute_bars(self) -> None:
+        """"""
+        batch: TickBatch = TickBatch.from_list(self.ticks)
+
+        bars: List[BarData] = BulkBarGenerator().generate_bars(batch).to_list()
+        self.assertEqual(bars, self.bars)
+
+        # Flush returns the pending bar, same as BarGenerator.generate
+        generator: BarGenerator = BarGenerator(lambda bar: None)
+        for tick in self.ticks:
+            generator.update_tick(tick)
+        last_bar: BarData = generator.generate()
+
+        bars = BulkBarGenerator().generate_bars(batch, flush=True).to_list()
+        self.assertEqual(bars, self.bars + [last_bar])
+
+    def test_window_bars(self) -> None:
+        """"""
+        batch: BarBatch = BarBatch.from_list(self.bars)
+
+        for window, interval, daily_end in (
+            (5, Interval.MINUTE, None),
+            (7, Interval.MINUTE, None),
+            (15, Interval.MINUTE, None),
+            (30, Interval.MINUTE, None),
+            (1, Interval.HOUR, None),
+            (2, Interval.HOUR, None),
+            (0, Interval.DAILY, time(14, 59)),
+        ):
+            with self.subTest(window=window, interval=interval.value):
+                expected: List[BarData] = []
+                generator: BarGenerator = BarGenerator(
+                    lambda bar: None, window, expected.append, interval, daily_end
+                )
+                for bar in self.bars:
+                    generator.update_bar(bar)
+
+                bulk: BulkBarGenerator = BulkBarGenerator(window, interval, daily_end)
+                result: List[BarData] = bulk.generate_window_bars(batch).to_list()
+
+                self.assertTrue(expected)
+                self.assertEqual(result, expected)
+
+
+def create_tick(dt: datetime, price: float, volume: float) -> TickData:
+    """
+    Create a tick with last price and accumulated volume only.
+    """
+    return TickData(
+        gateway_name="DB",
+        symbol="rb2505",
+        exchange=Exchange.SHFE,
+        datetime=dt,
+        volume=volume,
+        last_price=price
+    )
+
+
+def create_minute_bars(start: datetime, end: datetime) -> List[BarData]:
+    """
+    Create 1 minute bars in [start, end) with volume 1 and close price equal to minute of day.
+    """
+    bars: List[BarData] = []
+    dt: datetime = start
+
+    while dt < end:
+        price: float = dt.hour * 60 + dt.minute
+        bars.append(
+            BarData(
+                gateway_name="DB",
+                symbol="rb2505",
+                exchange=Exchange.SHFE,
+                datetime=dt,
+                interval=Interval.MINUTE,
+                volume=1,
+                open_price=price,
+                high_price=price,
+                low_price=price,
+                close_price=price
+            )
+        )
+        dt += timedelta(minutes=1)
+
+    return bars
+
+
+class TickWindowTest(unittest.TestCase):
+    """"""
+
+    def generate_window_bars(self, ticks: List[TickData], window: float, interval: Interval, bar_type: BarType) -> List[BarData]:
+        """
+        Feed ticks and return pushed window bars.
+        """
+        window_bars: List[BarData] = []
+        generator: BarGenerator = BarGenerator(
+            lambda bar: None,
+            window,
+            window_bars.append,
+            interval,
+            bar_type=bar_type
+        )
+
+        for tick in ticks:
+            generator.update_tick(tick)
+
+        return window_bars
+
+    def test_second_window(self) -> None:
+        """
+        15 second bars are aligned to 00:00 of the day and split at midnight.
+        """
+        day: datetime = datetime(2024, 3, 4, 9, tzinfo=ZoneInfo("Asia/Shanghai"))
+        ticks: List[TickData] = [
+            create_tick(day + timedelta(seconds=1), 100, 0),
+            create_tick(day + timedelta(seconds=14.5), 101, 2),
+            create_tick(day + timedelta(seconds=15), 102, 5),
+            create_tick(day + timedelta(seconds=29.9), 99, 6),
+            create_tick(day + timedelta(seconds=31), 98, 10),
+            create_tick(day + timedelta(seconds=127), 97, 11),
+            create_tick(day.replace(hour=23, minute=59, second=59), 96, 15),
+            create_tick(day + timedelta(hours=15, seconds=1), 95, 16),
+            create_tick(day + timedelta(hours=15, seconds=20), 94, 20),
+        ]
+
+        bars: List[BarData] = self.generate_window_bars(ticks, 15, Interval.SECOND, BarType.TIME)
+
+        self.assertEqual(
+            [bar.datetime for bar in bars],
+            [
+                day,
+                day + timedelta(seconds=15),
+                day + timedelta(seconds=30),
+                day + timedelta(seconds=120),
+                day.replace(hour=23, minute=59, second=45),
+                day + timedelta(hours=15),
+            ]
+        )
+        self.assertEqual([bar.open_price for bar in bars], [100, 102, 98, 97, 96, 95])
+        self.assertEqual([bar.close_price for bar in bars], [101, 99, 98, 97, 96, 95])
+        self.assertEqual([bar.volume for bar in bars], [2, 4, 4, 1, 4, 1])
+        self.assertTrue(all(bar.interval == Interval.SECOND for bar in bars))
+
+    def test_volume_window(self) -> None:
+        """
+        Volume bar is pushed at the first tick reaching the volume threshold.
+        """
+        dt: datetime = datetime(2024, 3, 4, 9, tzinfo=ZoneInfo("Asia/Shanghai"))
+        volumes: List[float] = [0, 3, 7, 12, 15, 25, 26, 30, 41, 45]
+        ticks: List[TickData] = [
+            create_tick(dt + timedelta(seconds=i), 100 + i, volume)
+            for i, volume in enumerate(volumes)
+        ]
+
+        bars: List[BarData] = self.generate_window_bars(ticks, 10, Interval.MINUTE, BarType.VOLUME)
+
+        self.assertEqual([bar.volume for bar in bars], [12, 13, 16])
+        self.assertEqual([bar.open_price for bar in bars], [100, 104, 106])
+        self.assertEqual([bar.close_price for bar in bars], [103, 105, 108])
+        self.assertEqual([bar.datetime for bar in bars], [ticks[0].datetime, ticks[4].datetime, ticks[6].datetime])
+
+    def test_range_window(self) -> None:
+        """
+        Range bar is pushed at the first tick reaching the price range threshold.
+        """
+        dt: datetime = datetime(2024, 3, 4, 9, tzinfo=ZoneInfo("Asia/Shanghai"))
+        prices: List[float] = [100, 102, 104, 105, 103, 101, 98, 99, 100, 104, 103]
+        ticks: List[TickData] = [
+            create_tick(dt + timedelta(seconds=i), price, i)
+            for i, price in enumerate(prices)
+        ]
+
+        bars: List[BarData] = self.generate_window_bars(ticks, 5, Interval.MINUTE, BarType.RANGE)
+
+        self.assertEqual(
+            [(bar.open_price, bar.high_price, bar.low_price, bar.close_price) for bar in bars],
+            [(100, 105, 100, 105), (103, 103, 98, 98), (99, 104, 99, 104)]
+        )
+        self.assertEqual([bar.volume for bar in bars], [3, 3, 3])
+
+    def test_minute_window(self) -> None:
+        """
+        45 and 90 minute bars close by minute of the day, including across a session break.
+        """
+        day: datetime = datetime(2024, 3, 4, tzinfo=ZoneInfo("Asia/Shanghai"))
+        bars: List[BarData] = (
+            create_minute_bars(day.replace(hour=9), day.replace(hour=11, minute=30))
+            + create_minute_bars(day.replace(hour=13, minute=30), day.replace(hour=15))
+        )
+
+        for window, starts, volumes in (
+            (45, ["09:00", "09:45", "10:30", "11:15", "14:15"], [45, 45, 45, 60, 45]),
+            (90, ["09:00", "10:30"], [90, 150]),
+        ):
+            with self.subTest(window=window):
+                window_bars: List[BarData] = []
+                generator: BarGenerator = BarGenerator(lambda bar: None, window, window_bars.append)
+
+                for bar in bars:
+                    generator.update_bar(bar)
+
+                self.assertEqual([bar.datetime.strftime("%H:%M") for bar in window_bars], starts)
+                self.assertEqual([bar.volume for bar in window_bars], volumes)
+
+                # Close price of each window bar is the last minute before the boundary
+                for bar in window_bars:
+                    self.assertEqual((bar.close_price + 1) % window, 0)
+
+    def test_forwarded_minute_bars_ignored(self) -> None:
+        """
+        Forwarding 1 minute bars with update_bar in on_bar, as strategies
+        usually do, must not change tick window bars.
+        """
+        ticks: List[TickData] = generate_ticks(1)
+
+        for window, interval, bar_type in (
+            (5, Interval.MINUTE, BarType.VOLUME),
+            (10, Interval.MINUTE, BarType.RANGE),
+            (15, Interval.SECOND, BarType.TIME),
+        ):
+            with self.subTest(interval=interval.value, bar_type=bar_type.value):
+                window_bars: List[BarData] = []
+                generator: BarGenerator = BarGenerator(
+                    lambda bar: generator.update_bar(bar),
+                    window,
+                    window_bars.append,
+                    interval,
+                    bar_type=bar_type
+                )
+
+                for tick in ticks:
+                    generator.update_tick(tick)
+
+                expected: List[BarData] = self.generate_window_bars(ticks, window, interval, bar_type)
+
+                self.assertTrue(window_bars)
+                self.assertEqual(window_bars, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
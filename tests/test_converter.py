@@ -0,0 +1,207 @@
+"""
+Equivalence of incremental frozen volume in PositionHolding with full
+recalculation over all active orders.
+"""
+
+import random
+import unittest
+from copy import copy
+from typing import Dict, List, Tuple
+
+from vnpy.trader.constant import Direction, Exchange, Offset, Product, Status
+from vnpy.trader.converter import PositionHolding
+from vnpy.trader.object import ContractData, OrderData, PositionData
+
+
+OFFSETS: List[Offset] = [
+    Offset.OPEN,
+    Offset.CLOSE,
+    Offset.CLOSE,
+    Offset.CLOSETODAY,
+    Offset.CLOSEYESTERDAY,
+    Offset.NONE
+]
+
+
+def calculate_frozen(holding: PositionHolding) -> Tuple[float, float, float, float]:
+    """
+    Original calculation walking all active orders in sequence, returns
+    (long_td, long_yd, short_td, short_yd) frozen volume.
+    """
+    long_td: float = 0
+    long_yd: float = 0
+    short_td: float = 0
+    short_yd: float = 0
+
+    for order in holding.active_orders.values():
+        if order.offset == Offset.OPEN:
+            continue
+
+        frozen: float = order.volume - order.traded
+
+        if order.direction == Direction.LONG:
+            if order.offset == Offset.CLOSETODAY:
+                short_td += frozen
+            elif order.offset == Offset.CLOSEYESTERDAY:
+                short_yd += frozen
+            elif order.offset == Offset.CLOSE:
+                short_td += frozen
+                if short_td > holding.short_td:
+                    short_yd += short_td - holding.short_td
+                    short_td = holding.short_td
+        elif order.direction == Direction.SHORT:
+            if order.offset == Offset.CLOSETODAY:
+                long_td += frozen
+            elif order.offset == Offset.CLOSEYESTERDAY:
+                long_yd += frozen
+            elif order.offset == Offset.CLOSE:
+                long_td += frozen
+                if long_td > holding.long_td:
+                    long_yd += long_td - holding.long_td
+                    long_td = holding.long_td
+
+    return (
+        min(long_td, holding.long_td),
+        min(long_yd, holding.long_yd),
+        min(short_td, holding.short_td),
+        min(short_yd, holding.short_yd)
+    )
+
+
+class FrozenVolumeTest(unittest.TestCase):
+    """"""
+
+    def setUp(self) -> None:
+        """"""
+        self.rng: random.Random = random.Random(7)
+        self.contract: ContractData = ContractData(
+            gateway_name="GW",
+            symbol="rb2405",
+            exchange=Exchange.DCE,
+            name="rb2405",
+            product=Product.FUTURES,
+            size=10,
+            pricetick=1
+        )
+
+    def update_position(self, holding: PositionHolding) -> None:
+        """
+        Update random long and short position.
+        """
+        for direction in (Direction.LONG, Direction.SHORT):
+            volume: int = self.rng.randint(0, 60)
+            position: PositionData = PositionData(
+                gateway_name="GW",
+                symbol="rb2405",
+                exchange=Exchange.DCE,
+                direction=direction,
+                volume=volume,
+                yd_volume=self.rng.randint(0, volume)
+            )
+            holding.update_position(position)
+
+    def generate_order(self, live: Dict[str, OrderData], count: int, fraction: bool) -> OrderData:
+        """
+        Generate new order, or random update of an active order: trade,
+        cancel, offset/direction change or repeated push.
+        """
+        rng: random.Random = self.rng
+
+        if rng.random() < 0.35 or not live:
+            volume: float = rng.randint(1, 10)
+            if fraction:
+                volume += rng.random()
+
+            return OrderData(
+                gateway_name="GW",
+                symbol="rb2405",
+                exchange=Exchange.DCE,
+                orderid=str(count),
+                direction=rng.choice([Direction.LONG, Direction.SHORT]),
+                offset=rng.choice(OFFSETS),
+                volume=volume,
+                status=Status.NOTTRADED
+            )
+
+        order: OrderData = copy(live[rng.choice(list(live))])
+        n: float = rng.random()
+
+        if n < 0.4:
+            order.traded = min(order.volume, order.traded + rng.randint(1, 3))
+            if order.traded >= order.volume:
+                order.status = Status.ALLTRADED
+            else:
+                order.status = Status.PARTTRADED
+        elif n < 0.7:
+            order.status = Status.CANCELLED
+        elif n < 0.75:
+            order.offset = rng.choice(OFFSETS)
+        elif n < 0.78:
+            if order.direction == Direction.LONG:
+                order.direction = Direction.SHORT
+            else:
+                order.direction = Direction.LONG
+
+        return order
+
+    def assert_frozen(self, holding: PositionHolding) -> None:
+        """"""
+        result: Tuple[float, float, float, float] = (
+            holding.long_td_frozen,
+            holding.long_yd_frozen,
+            holding.short_td_frozen,
+            holding.short_yd_frozen
+        )
+        expected: Tuple[float, float, float, float] = calculate_frozen(holding)
+
+        for value, expected_value in zip(result, expected):
+            self.assertAlmostEqual(value, expected_value, places=9)
+
+        self.assertEqual(holding.long_pos_frozen, holding.long_td_frozen + holding.long_yd_frozen)
+        self.assertEqual(holding.short_pos_frozen, holding.short_td_frozen + holding.short_yd_frozen)
+
+    def test_random_updates(self) -> None:
+        """"""
+        for trial in range(100):
+            holding: PositionHolding = PositionHolding(self.contract)
+            self.update_position(holding)
+
+            live: Dict[str, OrderData] = {}
+
+            for count in range(400):
+                order: OrderData = self.generate_order(live, count, trial % 3 == 0)
+
+                if order.is_active():
+                    live[order.vt_orderid] = order
+                else:
+                    live.pop(order.vt_orderid, None)
+
+                holding.update_order(order)
+
+                # Position update is followed by order update, as in OmsEngine
+                if self.rng.random() < 0.05:
+                    self.update_position(holding)
+                    holding.update_order(order)
+
+                self.assert_frozen(holding)
+
+    def test_full_recalculation(self) -> None:
+        """"""
+        holding: PositionHolding = PositionHolding(self.contract)
+        self.update_position(holding)
+
+        live: Dict[str, OrderData] = {}
+        for count in range(400):
+            order: OrderData = self.generate_order(live, count, False)
+            if order.is_active():
+                live[order.vt_orderid] = order
+            else:
+                live.pop(order.vt_orderid, None)
+            holding.update_order(order)
+
+        holding.calculate_frozen()
+        self.assert_frozen(holding)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Queue monitoring and dispatch table of EventEngine.
+"""
+
+import unittest
+from threading import Thread
+from time import sleep
+from typing import Dict, List
+
+from vnpy.event import Event, EventEngine
+from vnpy.event.async_engine import AsyncEventEngine
+
+
+class EventEngineTest(unittest.TestCase):
+    """"""
+
+    def test_sharded_queue_size(self) -> None:
+        """
+        Queue size in sharded mode includes events waiting in worker queues.
+        """
+        engine: EventEngine = EventEngine(workers=2)
+
+        for i in range(10):
+            engine.put(Event("eTest", i))
+        self.assertEqual(engine.get_queue_size(), 10)
+
+        events: List[Event] = engine._queue.drain()
+        for event in events[:6]:
+            engine._route(event)
+        for event in events[6:]:
+            engine._queue.put(event)
+
+        self.assertEqual(engine.get_queue_size(), 10)
+
+    def test_sharded_monitor_depth(self) -> None:
+        """
+        Monitored queue depth reports the backlog of worker queues.
+        """
+        engine: EventEngine = EventEngine(workers=2, monitor=True)
+
+        for i in range(10):
+            engine._route(Event("eTest", i))
+
+        engine._process(engine._shard_queues[0].get())
+
+        depth: int = engine.get_monitor_stats()["events"]["eTest"]["depth_last"]
+        self.assertEqual(depth, 9)
+
+    def test_register_during_resolve(self) -> None:
+        """
+        A handler registered while the dispatch table is being resolved is not lost.
+        """
+        engine: EventEngine = EventEngine()
+        received: List[str] = []
+        threads: List[Thread] = []
+
+        class RacingDict(dict):
+            """
+            Registers a handler from another thread while being iterated.
+            """
+
+            def items(self):
+                """"""
+                thread: Thread = Thread(
+                    target=engine.register,
+                    args=("eTest", lambda event: received.append("exact"))
+                )
+                thread.start()
+                thread.join(0.2)
+                threads.append(thread)
+                return super().items()
+
+        prefix_handlers: Dict[str, list] = RacingDict()
+        prefix_handlers["eTest"] = [lambda event: received.append("prefix")]
+        engine._prefix_handlers = prefix_handlers
+
+        engine._process(Event("eTest"))
+        threads[0].join()
+        engine._prefix_handlers = dict(prefix_handlers)
+
+        received.clear()
+        engine._process(Event("eTest"))
+        self.assertEqual(received, ["exact", "prefix"])
+
+
+class AsyncEventEngineTest(unittest.TestCase):
+    """"""
+
+    def test_put_after_stop(self) -> None:
+        """
+        Events put before start are kept, events put after stop are dropped.
+        """
+        engine: AsyncEventEngine = AsyncEventEngine()
+        received: List[int] = []
+        engine.register("eTest", lambda event: received.append(event.data))
+
+        engine.put(Event("eTest", 1))
+        engine.start()
+        for _ in range(100):
+            if received:
+                break
+            sleep(0.01)
+        engine.stop()
+        self.assertEqual(received, [1])
+
+        for i in range(100):
+            engine.put(Event("eTest", i))
+        self.assertEqual(engine._backlog, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
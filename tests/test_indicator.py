@@ -0,0 +1,164 @@
+"""
+Equivalence of incremental indicators with talib over the complete bar series.
+"""
+
+import unittest
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import numpy as np
+import talib
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.indicator import (
+    Indicator,
+    SmaIndicator,
+    EmaIndicator,
+    AtrIndicator,
+    RsiIndicator,
+    MacdIndicator,
+    BollIndicator,
+    DonchianIndicator
+)
+from vnpy.trader.object import BarData
+from vnpy.trader.utility import ArrayManager, RingArrayManager
+
+
+def generate_bars(count: int, seed: int = 7) -> List[BarData]:
+    """
+    Generate random walk bars with a flat segment.
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+
+    close: np.ndarray = 4000 + np.cumsum(rng.normal(0, 5, count))
+    close[100:130] = close[99]
+    high: np.ndarray = close + rng.random(count) * 5
+    low: np.ndarray = close - rng.random(count) * 5
+    open_: np.ndarray = close + rng.normal(0, 1, count)
+
+    start: datetime = datetime(2024, 1, 2)
+    return [
+        BarData(
+            gateway_name="DB",
+            symbol="rb2405",
+            exchange=Exchange.SHFE,
+            datetime=start + timedelta(minutes=i),
+            interval=Interval.MINUTE,
+            volume=1,
+            open_price=open_[i],
+            high_price=high[i],
+            low_price=low[i],
+            close_price=close[i]
+        )
+        for i in range(count)
+    ]
+
+
+class IndicatorTest(unittest.TestCase):
+    """"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """"""
+        cls.bars: List[BarData] = generate_bars(5000)
+        cls.close: np.ndarray = np.array([bar.close_price for bar in cls.bars])
+        cls.high: np.ndarray = np.array([bar.high_price for bar in cls.bars])
+        cls.low: np.ndarray = np.array([bar.low_price for bar in cls.bars])
+
+    def run_indicators(self, manager: ArrayManager, indicators: Dict[str, Indicator]) -> Dict[str, np.ndarray]:
+        """
+        Update bars into manager with indicators registered, and collect
+        indicator value after every bar.
+        """
+        for name, indicator in indicators.items():
+            manager.register_indicator(name, indicator)
+
+        values: Dict[str, list] = {name: [] for name in indicators}
+
+        for bar in self.bars:
+            manager.update_bar(bar)
+            for name, indicator in indicators.items():
+                values[name].append(indicator.value)
+
+        return {name: np.array(value, dtype=float) for name, value in values.items()}
+
+    def assert_equivalent(self, value: np.ndarray, expected: np.ndarray) -> None:
+        """"""
+        np.testing.assert_array_equal(np.isnan(value), np.isnan(expected))
+        np.testing.assert_allclose(value, expected, rtol=0, atol=1e-8)
+
+    def test_talib_equivalence(self) -> None:
+        """"""
+        c, h, lo = self.close, self.high, self.low
+        mid: np.ndarray = talib.SMA(c, 20)
+        std: np.ndarray = talib.STDDEV(c, 20, 1)
+
+        expected: Dict[str, np.ndarray] = {
+            "sma": talib.SMA(c, 20),
+            "ema": talib.EMA(c, 20),
+            "atr": talib.ATR(h, lo, c, 14),
+            "atr1": talib.ATR(h, lo, c, 1),
+            "rsi": talib.RSI(c, 14),
+            "rsi2": talib.RSI(c, 2),
+            "macd": np.array(talib.MACD(c, 12, 26, 9)).T,
+            "boll": np.array([mid + std * 2, mid - std * 2]).T,
+            "donchian": np.array([talib.MAX(h, 20), talib.MIN(lo, 20)]).T,
+        }
+
+        for manager_class in (ArrayManager, RingArrayManager):
+            indicators: Dict[str, Indicator] = {
+                "sma": SmaIndicator(20),
+                "ema": EmaIndicator(20),
+                "atr": AtrIndicator(14),
+                "atr1": AtrIndicator(1),
+                "rsi": RsiIndicator(14),
+                "rsi2": RsiIndicator(2),
+                "macd": MacdIndicator(12, 26, 9),
+                "boll": BollIndicator(20, 2),
+                "donchian": DonchianIndicator(20),
+            }
+            values: Dict[str, np.ndarray] = self.run_indicators(manager_class(100), indicators)
+
+            for name, value in values.items():
+                with self.subTest(manager=manager_class.__name__, indicator=name):
+                    self.assert_equivalent(value, expected[name])
+
+    def test_windowed_sma(self) -> None:
+        """
+        Non-recursive indicators equal ArrayManager's talib results.
+        """
+        manager: ArrayManager = ArrayManager(100)
+        indicator: SmaIndicator = manager.register_indicator("sma", SmaIndicator(20))
+
+        for bar in self.bars:
+            manager.update_bar(bar)
+
+        self.assertAlmostEqual(indicator.value, manager.sma(20), places=8)
+
+    def test_cached_read_only(self) -> None:
+        """
+        Cached indicator arrays cannot be modified by a caller.
+        """
+        manager: ArrayManager = ArrayManager(100)
+        for bar in self.bars[:100]:
+            manager.update_bar(bar)
+
+        sma: np.ndarray = manager.sma(20, array=True)
+        with self.assertRaises(ValueError):
+            sma[-1] = 0
+
+        macd, signal, hist = manager.macd(12, 26, 9, array=True)
+        with self.assertRaises(ValueError):
+            hist[:] = 0
+
+        self.assertIs(manager.sma(20, array=True), sma)
+        self.assertEqual(manager.sma(20), sma[-1])
+
+    def test_abstract(self) -> None:
+        """"""
+        with self.assertRaises(TypeError):
+            Indicator()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Offset lookups of archived journal records through JournalIndex.
+"""
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List
+
+from vnpy.trader.constant import Exchange, Status
+from vnpy.trader.journal import JournalIndex, JournalWriter
+from vnpy.trader.object import OrderData
+
+
+class JournalIndexTest(unittest.TestCase):
+    """"""
+
+    def test_archive_lookup(self) -> None:
+        """
+        Records written by JournalWriter are read back by offsets kept in JournalIndex.
+        """
+        with TemporaryDirectory() as folder:
+            path: Path = Path(folder).joinpath("archive.vtj")
+            writer: JournalWriter = JournalWriter(path)
+            index: JournalIndex = JournalIndex(path.with_suffix(".idx"))
+            index.commit_size = 7
+
+            orders: List[OrderData] = []
+            for i in range(20):
+                order: OrderData = OrderData(
+                    symbol="rb2505",
+                    exchange=Exchange.SHFE,
+                    orderid=str(i),
+                    status=Status.ALLTRADED,
+                    gateway_name="TEST"
+                )
+                orders.append(order)
+                index.set("orders", order.vt_orderid, writer.write(order))
+
+            # Archiving the same id again replaces its offset
+            orders[3].status = Status.CANCELLED
+            index.set("orders", orders[3].vt_orderid, writer.write(orders[3]))
+
+            self.assertEqual(writer.read(index.get("orders", "TEST.3")), orders[3])
+            self.assertEqual(writer.read(index.get("orders", "TEST.19")), orders[19])
+            self.assertIsNone(index.get("orders", "TEST.20"))
+            self.assertIsNone(index.get("trades", "TEST.1"))
+
+            archived: List[OrderData] = [writer.read(offset) for offset in index.get_all("orders")]
+            self.assertEqual(archived, orders[:3] + orders[4:] + orders[3:4])
+
+            index.close()
+            writer.close()
+
+            # Index is kept on disk
+            index = JournalIndex(path.with_suffix(".idx"))
+            self.assertEqual(len(index.get_all("orders")), 20)
+            index.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+History eviction of LocalOrderManager.
+"""
+
+import unittest
+from typing import List
+
+from vnpy.event import EventEngine
+from vnpy.trader.constant import Exchange, Status
+from vnpy.trader.gateway import BaseGateway, LocalOrderManager
+from vnpy.trader.object import OrderData
+
+
+class OrderGateway(BaseGateway):
+    """
+    Gateway recording pushed orders.
+    """
+
+    default_name: str = "TEST"
+
+    def __init__(self) -> None:
+        """"""
+        super().__init__(EventEngine(), "TEST")
+        self.orders: List[OrderData] = []
+
+    def on_order(self, order: OrderData) -> None:
+        """"""
+        self.orders.append(order)
+
+    def connect(self, setting: dict) -> None:
+        """"""
+        pass
+
+    def close(self) -> None:
+        """"""
+        pass
+
+    def subscribe(self, req) -> None:
+        """"""
+        pass
+
+    def send_order(self, req) -> str:
+        """"""
+        return ""
+
+    def cancel_order(self, req) -> None:
+        """"""
+        pass
+
+    def query_account(self) -> None:
+        """"""
+        pass
+
+    def query_position(self) -> None:
+        """"""
+        pass
+
+
+class LocalOrderManagerTest(unittest.TestCase):
+    """"""
+
+    def finish_orders(self, manager: LocalOrderManager, count: int) -> List[str]:
+        """
+        Send and finish count orders, return their sys orderids.
+        """
+        sys_orderids: List[str] = []
+
+        for i in range(count):
+            local_orderid: str = manager.new_local_orderid()
+            sys_orderid: str = f"sys{i}"
+            manager.update_orderid_map(local_orderid, sys_orderid)
+            sys_orderids.append(sys_orderid)
+
+            for status in (Status.NOTTRADED, Status.ALLTRADED):
+                manager.on_order(
+                    OrderData(
+                        symbol="rb2505",
+                        exchange=Exchange.SHFE,
+                        orderid=local_orderid,
+                        volume=1,
+                        status=status,
+                        gateway_name="TEST"
+                    )
+                )
+
+        return sys_orderids
+
+    def test_late_push_of_removed_order(self) -> None:
+        """
+        Late push data of a removed order keeps its original local orderid.
+        """
+        manager: LocalOrderManager = LocalOrderManager(OrderGateway(), history_size=2)
+        sys_orderids: List[str] = self.finish_orders(manager, 5)
+
+        self.assertEqual(list(manager.orders), ["00000004", "00000005"])
+        self.assertIsNone(manager.get_order_with_sys_orderid(sys_orderids[0]))
+        self.assertEqual(manager.get_local_orderid(sys_orderids[0]), "00000001")
+        self.assertEqual(manager.order_count, 5)
+
+    def test_orderid_map_size(self) -> None:
+        """
+        Orderid maps are removed only after exceeding orderid_map_size.
+        """
+        manager: LocalOrderManager = LocalOrderManager(OrderGateway(), history_size=2, orderid_map_size=2)
+        self.finish_orders(manager, 6)
+
+        self.assertEqual(list(manager.orders), ["00000005", "00000006"])
+        self.assertEqual(list(manager.removed_orderids), ["00000003", "00000004"])
+        self.assertEqual(
+            sorted(manager.local_sys_orderid_map),
+            ["00000003", "00000004", "00000005", "00000006"]
+        )
+        self.assertEqual(sorted(manager.sys_local_orderid_map), ["sys2", "sys3", "sys4", "sys5"])
+
+    def test_no_history_limit(self) -> None:
+        """
+        All orders are kept without history size.
+        """
+        manager: LocalOrderManager = LocalOrderManager(OrderGateway())
+        self.finish_orders(manager, 5)
+
+        self.assertEqual(len(manager.orders), 5)
+        self.assertEqual(len(manager.sys_local_orderid_map), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
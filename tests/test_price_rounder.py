@@ -0,0 +1,90 @@
+"""
+Property test of PriceRounder against the Decimal reference implementation.
+"""
+
+import unittest
+from decimal import Decimal
+from math import nextafter, inf
+from typing import Callable, List
+
+import numpy as np
+
+from vnpy.trader.utility import (
+    PriceRounder,
+    decimal_round_to,
+    decimal_floor_to,
+    decimal_ceil_to
+)
+
+
+PRICETICKS: List[float] = [
+    1, 5, 10, 0.5, 0.2, 0.1, 0.05, 0.02, 0.01, 0.005, 0.001, 0.0001, 0.00001, 2.5, 0.25, 0.125, 1e-8
+]
+
+
+def generate_values(pricetick: float, count: int, rng: np.random.Generator) -> List[float]:
+    """
+    Generate random prices, prices on the tick grid and their float
+    neighbours, and prices on the half tick.
+    """
+    ticks: np.ndarray = rng.integers(-10 ** 6, 10 ** 6, count)
+    target: Decimal = Decimal(str(pricetick))
+
+    values: List[float] = list(rng.uniform(-1, 1, count) * pricetick * 10 ** 6)
+
+    for n in ticks.tolist():
+        grid: float = float(n * target)
+        half: float = float((n + Decimal("0.5")) * target)
+
+        values.extend([
+            grid,
+            nextafter(grid, inf),
+            nextafter(grid, -inf),
+            half,
+            nextafter(half, inf),
+            nextafter(half, -inf),
+        ])
+
+    values.extend([0.0, -0.0, pricetick, -pricetick])
+    return values
+
+
+class PriceRounderTest(unittest.TestCase):
+    """"""
+
+    def check(self, name: str, reference: Callable[[float, float], float]) -> None:
+        """
+        Compare scalar and array method with reference implementation.
+        """
+        rng: np.random.Generator = np.random.default_rng(17)
+
+        for pricetick in PRICETICKS:
+            rounder: PriceRounder = PriceRounder(pricetick)
+            scalar: Callable[[float], float] = getattr(rounder, f"{name}_to")
+            vector: Callable[[np.ndarray], np.ndarray] = getattr(rounder, f"{name}_array")
+
+            values: List[float] = generate_values(pricetick, 2000, rng)
+            expected: List[float] = [reference(value, pricetick) for value in values]
+
+            with self.subTest(name=name, pricetick=pricetick):
+                result: List[float] = [scalar(value) for value in values]
+                self.assertEqual(result, expected)
+
+                array: np.ndarray = vector(np.array(values))
+                self.assertEqual(array.tolist(), expected)
+
+    def test_round(self) -> None:
+        """"""
+        self.check("round", decimal_round_to)
+
+    def test_floor(self) -> None:
+        """"""
+        self.check("floor", decimal_floor_to)
+
+    def test_ceil(self) -> None:
+        """"""
+        self.check("ceil", decimal_ceil_to)
+
+
+if __name__ == "__main__":
+    unittest.main()
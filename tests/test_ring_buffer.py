@@ -0,0 +1,241 @@
+"""
+Capacity and overflow policies of RingBuffer.
+"""
+
+import unittest
+from queue import Empty
+from threading import Thread
+from time import sleep
+from typing import List
+
+from vnpy.event import Event, EventEngine, RingBuffer, OverflowPolicy
+from vnpy.trader.constant import Exchange
+from vnpy.trader.event import EVENT_TICK
+from vnpy.trader.gateway import BaseGateway
+from vnpy.trader.object import TickData
+
+
+def fill(buffer: RingBuffer, count: int) -> None:
+    """
+    Put count integers into buffer from a producer thread bound to it.
+    """
+    def run() -> None:
+        """"""
+        buffer.bind_producer()
+        for i in range(count):
+            buffer.put(i)
+
+    thread: Thread = Thread(target=run)
+    thread.start()
+    thread.join()
+
+
+def drain_all(buffer: RingBuffer) -> List[int]:
+    """
+    Get items one by one until the buffer is empty.
+    """
+    items: List[int] = []
+    while True:
+        try:
+            items.append(buffer.get(block=False))
+        except Empty:
+            return items
+
+
+class PushGateway(BaseGateway):
+    """
+    Gateway only used to push ticks.
+    """
+
+    default_name: str = "TEST"
+
+    def connect(self, setting: dict) -> None:
+        """"""
+        pass
+
+    def close(self) -> None:
+        """"""
+        pass
+
+    def subscribe(self, req) -> None:
+        """"""
+        pass
+
+    def send_order(self, req) -> str:
+        """"""
+        return ""
+
+    def cancel_order(self, req) -> None:
+        """"""
+        pass
+
+    def query_account(self) -> None:
+        """"""
+        pass
+
+    def query_position(self) -> None:
+        """"""
+        pass
+
+
+class RingBufferTest(unittest.TestCase):
+    """"""
+
+    def test_capacity(self) -> None:
+        """
+        Items of the bound producer are kept in the ring up to capacity.
+        """
+        buffer: RingBuffer = RingBuffer(8, OverflowPolicy.DROP_OLDEST)
+        fill(buffer, 8)
+
+        self.assertEqual(buffer.capacity, 8)
+        self.assertEqual(buffer.qsize(), 8)
+        self.assertEqual(buffer.drain(), list(range(8)))
+        self.assertTrue(buffer.empty())
+
+        with self.assertRaises(ValueError):
+            RingBuffer(0)
+
+    def test_block(self) -> None:
+        """
+        A full ring blocks the producer until the consumer frees a slot.
+        """
+        buffer: RingBuffer = RingBuffer(4, OverflowPolicy.BLOCK)
+        thread: Thread = Thread(target=fill, args=(buffer, 100))
+        thread.start()
+
+        received: List[int] = []
+        while len(received) < 100:
+            sleep(0.001)
+            self.assertLessEqual(buffer.qsize(), 4)
+            received.extend(buffer.drain())
+
+        thread.join()
+        self.assertEqual(received, list(range(100)))
+
+    def test_drop_oldest(self) -> None:
+        """
+        A full ring overwrites the oldest items and counts them as dropped.
+        """
+        buffer: RingBuffer = RingBuffer(4, OverflowPolicy.DROP_OLDEST)
+        fill(buffer, 10)
+
+        self.assertEqual(drain_all(buffer), [6, 7, 8, 9])
+        self.assertEqual(buffer.dropped, 6)
+
+        fill(buffer, 10)
+        self.assertEqual(buffer.drain(), [6, 7, 8, 9])
+        self.assertEqual(buffer.dropped, 12)
+
+    def test_coalesce(self) -> None:
+        """
+        Items beyond capacity are merged by key after the ring, in order.
+        """
+        buffer: RingBuffer = RingBuffer(4, OverflowPolicy.COALESCE, key_func=lambda i: i % 3)
+        fill(buffer, 10)
+
+        # 0-3 in the ring, then 4-9 merged into keys 1, 2, 0 keeping the latest
+        self.assertEqual(drain_all(buffer), [0, 1, 2, 3, 7, 8, 9])
+        self.assertEqual(buffer.coalesced, 3)
+
+        fill(buffer, 10)
+        self.assertEqual(buffer.drain(), [0, 1, 2, 3, 7, 8, 9])
+
+    def test_unbound(self) -> None:
+        """
+        Puts from threads other than the producer bypass capacity.
+        """
+        buffer: RingBuffer = RingBuffer(4, OverflowPolicy.DROP_OLDEST)
+        for i in range(10):
+            buffer.put(i)
+
+        self.assertEqual(buffer.drain(), list(range(10)))
+        self.assertEqual(buffer.dropped, 0)
+
+    def test_bind_owner(self) -> None:
+        """
+        An owner keeps the ring against other owners and can move it between threads.
+        """
+        buffer: RingBuffer = RingBuffer(4)
+        first: object = object()
+        second: object = object()
+
+        self.assertTrue(buffer.bind_producer(1, owner=first))
+        self.assertFalse(buffer.bind_producer(2, owner=second))
+        self.assertTrue(buffer.bind_producer(3, owner=first))
+        self.assertTrue(buffer.bind_producer(4))
+
+    def test_gateway_bind(self) -> None:
+        """
+        Ticks pushed by a gateway go through the ring without explicit binding.
+        """
+        buffer: RingBuffer = RingBuffer(4, OverflowPolicy.DROP_OLDEST)
+        engine: EventEngine = EventEngine(queue=buffer)
+        gateway: PushGateway = PushGateway(engine, "TEST")
+
+        def run() -> None:
+            """"""
+            for i in range(10):
+                tick: TickData = TickData(
+                    symbol=str(i),
+                    exchange=Exchange.SSE,
+                    datetime=None,
+                    gateway_name="TEST"
+                )
+                gateway.on_tick(tick)
+
+        thread: Thread = Thread(target=run)
+        thread.start()
+        thread.join()
+
+        events: List[Event] = buffer.drain()
+        self.assertEqual(len(events), 4)
+        self.assertEqual(events[-1].type, EVENT_TICK + "9.SSE")
+        self.assertEqual(buffer.dropped, 16)
+
+    def test_coalesce_drop_oldest(self) -> None:
+        """
+        A coalesced event overwritten in the ring does not starve its symbol.
+        """
+        buffer: RingBuffer = RingBuffer(4, OverflowPolicy.DROP_OLDEST)
+        engine: EventEngine = EventEngine(queue=buffer, coalesce_types=[EVENT_TICK])
+
+        received: List[str] = []
+        engine.register_prefix(EVENT_TICK, lambda event: received.append(event.data.vt_symbol))
+
+        symbols: List[str] = [f"s{i}" for i in range(10)]
+
+        def push(names: List[str]) -> None:
+            """
+            Push ticks from the bound producer and process what is queued.
+            """
+            def run() -> None:
+                """"""
+                engine.bind_producer()
+                for name in names:
+                    tick: TickData = TickData(
+                        symbol=name,
+                        exchange=Exchange.SSE,
+                        datetime=None,
+                        gateway_name="TEST"
+                    )
+                    engine.put(Event(EVENT_TICK, tick))
+
+            thread: Thread = Thread(target=run)
+            thread.start()
+            thread.join()
+
+            for event in buffer.drain():
+                engine._process(event)
+
+        push(symbols)
+        self.assertEqual(received, [f"{name}.SSE" for name in symbols[6:]])
+
+        for name in symbols:
+            received.clear()
+            push([name])
+            self.assertEqual(received, [f"{name}.SSE"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Versioned snapshots of SnapshotView.
+"""
+
+import unittest
+from threading import Thread
+from typing import Any, Dict, List, Tuple
+
+from vnpy.trader.engine import SnapshotView
+
+
+class ChangingDict(dict):
+    """
+    Raises like a dict changed by another thread during the first copies.
+    """
+
+    def __init__(self, failures: int) -> None:
+        """"""
+        super().__init__()
+        self.failures: int = failures
+
+    def values(self):
+        """"""
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("dictionary changed size during iteration")
+        return super().values()
+
+
+class SnapshotViewTest(unittest.TestCase):
+    """"""
+
+    def test_snapshot_cached(self) -> None:
+        """
+        Snapshot is rebuilt only after the version changes.
+        """
+        data: Dict[str, int] = {}
+        view: SnapshotView = SnapshotView(data)
+
+        data["a"] = 1
+        view.changed("a")
+        first: Tuple[int, Tuple[Any, ...]] = view.get_snapshot()
+        self.assertEqual(first, (1, (1,)))
+        self.assertIs(view.get_snapshot(), first)
+
+        data["b"] = 2
+        view.changed("b")
+        self.assertEqual(view.get_snapshot(), (2, (1, 2)))
+
+    def test_snapshot_retry(self) -> None:
+        """
+        Copy is retried when the dict changes during iteration.
+        """
+        data: ChangingDict = ChangingDict(2)
+        view: SnapshotView = SnapshotView(data)
+
+        data["a"] = 1
+        view.changed("a")
+        self.assertEqual(view.get_snapshot(), (1, (1,)))
+
+    def test_concurrent_readers(self) -> None:
+        """
+        Every snapshot returned to concurrent readers matches its version.
+        """
+        data: Dict[str, int] = {}
+        view: SnapshotView = SnapshotView(data)
+        results: List[Tuple[int, Tuple[Any, ...]]] = []
+        running: List[bool] = [True]
+
+        def read() -> None:
+            """"""
+            while running[0]:
+                results.append(view.get_snapshot())
+
+        threads: List[Thread] = [Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+
+        # Each update adds one key, so version equals the number of values
+        for i in range(2000):
+            data[str(i)] = i
+            view.changed(str(i))
+
+        running[0] = False
+        for thread in threads:
+            thread.join()
+
+        for version, values in results:
+            self.assertGreaterEqual(len(values), version)
+            self.assertEqual(values[:version], tuple(range(version)))
+
+
+if __name__ == "__main__":
+    unittest.main()
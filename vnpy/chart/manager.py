@@ -2,7 +2,7 @@ from typing import Dict, List, Tuple
 from datetime import datetime
 from _collections_abc import dict_keys
 
-from vnpy.trader.object import BarData
+from vnpy.trader.object import BarData, BarSequence
 
 from .base import to_int
 
@@ -19,9 +19,9 @@ class BarManager:
         self._price_ranges: Dict[Tuple[int, int], Tuple[float, float]] = {}
         self._volume_ranges: Dict[Tuple[int, int], Tuple[float, float]] = {}
 
-    def update_history(self, history: List[BarData]) -> None:
+    def update_history(self, history: BarSequence) -> None:
         """
-        Update a list of bar data.
+        Update a list of bar data, or a BarBatch.
         """
         # Put all new bars into dict
         for bar in history:
@@ -1 +1,3 @@
-from .engine import Event, EventEngine, EVENT_TIMER
+from .engine import Event, EventEngine, EVENT_TIMER, EVENT_MONITOR
+from .buffer import EventQueue, RingBuffer, OverflowPolicy
+from .async_engine import AsyncEventEngine
@@ -0,0 +1,237 @@
+"""
+Asyncio based event engine of VeighNa framework.
+"""
+
+import asyncio
+import traceback
+from asyncio import AbstractEventLoop, Queue, Task
+from inspect import isawaitable
+from threading import Lock, Thread, get_ident
+from typing import Any, Dict, List, Optional, Tuple
+
+from .engine import Event, EventEngine, HandlerType, EVENT_TIMER
+
+
+class AsyncEventEngine(EventEngine):
+    """
+    基于asyncio事件循环的事件引擎，与EventEngine保持相同的register/put/定时器接口。
+
+    处理器既可以是普通函数，也可以是协程函数，协程处理器会在事件循环中被依次等待，
+    因此同一事件的处理器和先后到达的事件都保持顺序执行。
+
+    put是线程安全的：在事件循环线程内调用时直接写入队列，在其他线程中调用时
+    通过call_soon_threadsafe转交给事件循环，便于原有的线程式接口继续使用。
+    """
+
+    def __init__(self, interval: float = 1, loop: AbstractEventLoop = None) -> None:
+        """
+        :param interval: 定时器事件的时间间隔，单位为秒，默认为 1 秒。
+        :param loop: 运行引擎的事件循环，默认为None，即在启动时创建新的事件循环并在后台线程中运行。
+        """
+        super().__init__(interval)
+
+        # 线程、队列和定时器由事件循环管理，替换基类中的对应实现
+        self._thread: Optional[Thread] = None
+        self._timers: Dict[str, float] = {EVENT_TIMER: interval}
+
+        self._loop: Optional[AbstractEventLoop] = loop
+        self._own_loop: bool = loop is None
+        self._loop_thread_id: int = 0
+
+        self._queue: Optional[Queue] = None
+        self._backlog: List[Event] = []
+        self._backlog_lock: Lock = Lock()
+        self._stopped: bool = False
+
+        self._timer_tasks: Dict[str, Task] = {}
+        self._task: Optional[Task] = None
+
+    @property
+    def loop(self) -> Optional[AbstractEventLoop]:
+        """
+        引擎所在的事件循环，可用于在其上调度其他协程。
+        """
+        return self._loop
+
+    def start(self) -> None:
+        """
+        启动事件引擎。
+        """
+        if self._active:
+            return
+        self._active = True
+        self._stopped = False
+
+        if self._own_loop:
+            self._loop = asyncio.new_event_loop()
+            self._thread = Thread(target=self._run_loop)
+            self._thread.start()
+
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop)
+
+    def stop(self) -> None:
+        """
+        停止事件引擎。
+        """
+        if not self._active:
+            return
+        self._active = False
+        self._stopped = True
+
+        future = asyncio.run_coroutine_threadsafe(self._stop(), self._loop)
+
+        if self._own_loop:
+            future.result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def put(self, event: Event) -> None:
+        """
+        将事件对象放入事件队列，可以在任意线程中调用。
+
+        启动前放入的事件会在启动后处理，停止后放入的事件直接丢弃。
+
+        :param event: 要放入队列的事件对象。
+        """
+        if self._queue is None:
+            with self._backlog_lock:
+                # 加锁后再次检查，避免与_start中转移积压事件的过程交错
+                if self._queue is None:
+                    if not self._stopped:
+                        self._backlog.append(event)
+                    return
+
+        if get_ident() == self._loop_thread_id:
+            self._queue.put_nowait(event)
+        else:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    def add_timer(self, name: str, interval: float) -> str:
+        """
+        添加一个命名定时器，返回其事件类型（EVENT_TIMER + "." + name）。
+
+        :param name: 定时器名称。
+        :param interval: 定时器事件的时间间隔，单位为秒。
+        """
+        type: str = f"{EVENT_TIMER}.{name}"
+        self._timers[type] = interval
+
+        if self._queue:
+            self._loop.call_soon_threadsafe(self._start_timer, type, interval)
+
+        return type
+
+    def remove_timer(self, name: str) -> None:
+        """
+        移除命名定时器。
+
+        :param name: 定时器名称。
+        """
+        type: str = f"{EVENT_TIMER}.{name}"
+        self._timers.pop(type, None)
+
+        if self._loop and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._cancel_timer, type)
+
+    def _run_loop(self) -> None:
+        """
+        在后台线程中运行引擎自有的事件循环。
+        """
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def _start(self) -> None:
+        """
+        在事件循环中创建队列和任务。
+        """
+        self._loop_thread_id = get_ident()
+        queue: Queue = Queue()
+
+        # 在锁内转移积压事件后再发布队列，之后的put都直接写入队列
+        with self._backlog_lock:
+            backlog: List[Event] = self._backlog
+            self._backlog = []
+
+            for event in backlog:
+                queue.put_nowait(event)
+            self._queue = queue
+
+        self._task = self._loop.create_task(self._run())
+
+        for type, interval in list(self._timers.items()):
+            self._start_timer(type, interval)
+
+    async def _stop(self) -> None:
+        """
+        在事件循环中取消所有任务。
+        """
+        for type in list(self._timer_tasks):
+            self._cancel_timer(type)
+
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        self._queue = None
+
+    async def _run(self) -> None:
+        """
+        从队列中获取事件并处理它。
+        """
+        while self._active:
+            event: Event = await self._queue.get()
+            await self._process_async(event)
+
+    async def _process_async(self, event: Event) -> None:
+        """
+        依次调用事件对应的处理器，协程处理器的结果会被等待。
+        """
+        handlers: Tuple[HandlerType, ...] = self._dispatch_table.get(event.type, None)
+        if handlers is None:
+            handlers = self._resolve_handlers(event.type)
+
+        for handler in handlers:
+            try:
+                result: Any = handler(event)
+                if isawaitable(result):
+                    await result
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                traceback.print_exc()
+
+    def _start_timer(self, type: str, interval: float) -> None:
+        """
+        启动定时器任务。
+        """
+        self._cancel_timer(type)
+        self._timer_tasks[type] = self._loop.create_task(self._run_timer(type, interval))
+
+    def _cancel_timer(self, type: str) -> None:
+        """
+        取消定时器任务。
+        """
+        task: Optional[Task] = self._timer_tasks.pop(type, None)
+        if task:
+            task.cancel()
+
+    async def _run_timer(self, type: str, interval: float) -> None:
+        """
+        按事件循环的单调时钟排程，生成定时器事件。
+        """
+        deadline: float = self._loop.time() + interval
+
+        while self._active:
+            await asyncio.sleep(max(deadline - self._loop.time(), 0))
+            self.put(Event(type))
+
+            # 按绝对时间推进，落后超过一个周期时跳过错过的触发
+            now: float = self._loop.time()
+            deadline += interval
+            if deadline <= now:
+                deadline = now + interval
@@ -0,0 +1,367 @@
+"""
+Queue backends used by the event engine.
+"""
+
+from collections import deque
+from enum import Enum
+from queue import Empty, Queue
+from threading import Event as ThreadEvent, Lock, get_ident
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class OverflowPolicy(Enum):
+    """
+    环形缓冲区写满时的处理策略。
+    """
+
+    BLOCK = "block"                 # 阻塞生产者，直到消费者腾出空间
+    DROP_OLDEST = "drop_oldest"     # 覆盖最旧的未处理数据
+    COALESCE = "coalesce"           # 暂存到溢出区，相同键值的数据只保留最新一条
+
+
+class EventQueue(Queue):
+    """
+    事件引擎默认使用的队列，在标准库Queue的基础上增加了批量取出功能。
+    """
+
+    def drain(self) -> List[Any]:
+        """
+        在一次加锁中取出队列中当前所有的待处理数据。
+        """
+        with self.mutex:
+            items: List[Any] = list(self.queue)
+            self.queue.clear()
+            self.not_full.notify_all()
+        return items
+
+
+_EMPTY: object = object()
+
+
+class RingBuffer:
+    """
+    预分配定长存储的单生产者/单消费者环形缓冲区。
+
+    写指针只由生产者线程修改，读指针只由消费者线程修改，因此在未写满时
+    put和get都不需要加锁，也不会产生额外的内存分配。只有在缓冲区写满时
+    才会根据溢出策略进入较慢的处理路径。
+
+    主生产者（通常为接口的行情回调线程）通过bind_producer绑定，BaseGateway在
+    推送第一条行情时会自动完成绑定。只有主生产者写入的数据进入环形区，受容量和
+    溢出策略控制。其他线程（如定时器、日志）写入的数据进入一个不受容量限制的
+    旁路队列，保证多线程写入时的正确性。get和drain只能由单个消费者线程调用。
+    """
+
+    def __init__(
+        self,
+        capacity: int = 65536,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        key_func: Callable[[Any], Optional[Hashable]] = None
+    ) -> None:
+        """
+        :param capacity: 缓冲区容量。
+        :param policy: 写满时的溢出策略，默认为阻塞。
+        :param key_func: COALESCE策略下用于合并的键值函数，返回None的数据不会被合并。
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self._capacity: int = capacity
+        self._policy: OverflowPolicy = policy
+        self._key_func: Callable[[Any], Optional[Hashable]] = key_func
+
+        self._items: List[Any] = [None] * capacity
+        self._seqs: List[int] = [-1] * capacity
+
+        self._head: int = 0         # 读指针，只由消费者修改
+        self._tail: int = 0         # 写指针，只由生产者修改
+        self._producer: int = 0     # 主生产者线程标识
+        self._owner: Hashable = None
+        self._bind_lock: Lock = Lock()
+
+        # 其他生产者线程使用的旁路队列
+        self._side: deque = deque()
+
+        self._not_empty: ThreadEvent = ThreadEvent()
+        self._not_full: ThreadEvent = ThreadEvent()
+
+        # COALESCE策略使用的溢出区
+        self._overflow: Dict[Hashable, Any] = {}
+        self._overflow_lock: Lock = Lock()
+        self._pending: deque = deque()
+
+        # 被覆盖或被合并替换的数据的回调函数
+        self._drop_callbacks: List[Callable[[Any], None]] = []
+
+        self.dropped: int = 0
+        self.coalesced: int = 0
+
+    @property
+    def capacity(self) -> int:
+        """
+        缓冲区容量。
+        """
+        return self._capacity
+
+    def bind_producer(self, ident: int = None, owner: Hashable = None) -> bool:
+        """
+        将线程绑定为主生产者，默认为调用线程，返回该线程是否为主生产者。
+
+        未指定owner时直接绑定，调用方需保证之前的主生产者已经不再写入数据。
+        指定owner（如接口对象）时，只有尚未绑定或已由同一owner绑定时才会绑定：
+        多个接口同时推送时只有第一个接口的线程进入环形区，同一接口更换回调线程
+        （如断线重连）后绑定随之转移。
+        """
+        if ident is None:
+            ident = get_ident()
+
+        with self._bind_lock:
+            if owner is None or not self._producer or owner is self._owner:
+                self._producer = ident
+                self._owner = owner
+
+        return self._producer == ident
+
+    def register_drop_callback(self, callback: Callable[[Any], None]) -> None:
+        """
+        注册回调函数，在未处理的数据被DROP_OLDEST策略覆盖或被COALESCE策略替换时，
+        由生产者线程以该数据为参数调用。
+        """
+        if callback not in self._drop_callbacks:
+            self._drop_callbacks.append(callback)
+
+    def qsize(self) -> int:
+        """
+        当前待处理数据的数量（近似值）。
+        """
+        size: int = min(self._tail - self._head, self._capacity)
+        return size + len(self._overflow) + len(self._pending) + len(self._side)
+
+    def empty(self) -> bool:
+        """
+        缓冲区是否为空（近似值）。
+        """
+        return not self.qsize()
+
+    def put(self, item: Any, block: bool = True, timeout: float = None) -> None:
+        """
+        由生产者线程调用，写入一条数据。
+
+        block和timeout参数仅为兼容Queue接口而保留，写满时的行为由溢出策略决定。
+        """
+        if get_ident() != self._producer:
+            self._side.append(item)
+
+            if not self._not_empty.is_set():
+                self._not_empty.set()
+            return
+
+        tail: int = self._tail
+        full: bool = tail - self._head >= self._capacity
+
+        if full or self._overflow:
+            if self._policy == OverflowPolicy.COALESCE:
+                self._put_overflow(item)
+                return
+            elif self._policy == OverflowPolicy.BLOCK:
+                self._wait_not_full()
+            # DROP_OLDEST策略下直接覆盖最旧的槽位，由消费者检测并跳过
+
+        index: int = tail % self._capacity
+
+        if self._policy == OverflowPolicy.DROP_OLDEST:
+            dropped: Any = self._items[index]
+
+            self._seqs[index] = -1
+            self._items[index] = item
+            self._seqs[index] = tail
+
+            if full:
+                for callback in self._drop_callbacks:
+                    callback(dropped)
+        else:
+            self._items[index] = item
+
+        self._tail = tail + 1
+
+        if not self._not_empty.is_set():
+            self._not_empty.set()
+
+    def get(self, block: bool = True, timeout: float = None) -> Any:
+        """
+        由消费者线程调用，取出一条数据，缓冲区为空时抛出queue.Empty。
+        """
+        item: Any = self._pop()
+
+        while item is _EMPTY:
+            if not block:
+                raise Empty
+
+            self._not_empty.clear()
+
+            item = self._pop()
+            if item is not _EMPTY:
+                break
+
+            if not self._not_empty.wait(timeout):
+                raise Empty
+
+            item = self._pop()
+
+        return item
+
+    def get_nowait(self) -> Any:
+        """
+        非阻塞地取出一条数据。
+        """
+        return self.get(block=False)
+
+    def drain(self) -> List[Any]:
+        """
+        由消费者线程调用，取出当前所有的待处理数据。
+        """
+        items: List[Any] = []
+
+        while self._side:
+            items.append(self._side.popleft())
+
+        if self._pending:
+            items.extend(self._pending)
+            self._pending.clear()
+
+        if self._policy == OverflowPolicy.DROP_OLDEST:
+            item: Any = self._pop()
+            while item is not _EMPTY:
+                items.append(item)
+                item = self._pop()
+            return items
+
+        head: int = self._head
+        tail: int = self._tail
+
+        if tail > head:
+            start: int = head % self._capacity
+            end: int = tail % self._capacity
+            buffer: List[Any] = self._items
+
+            if start < end:
+                items.extend(buffer[start:end])
+                buffer[start:end] = [None] * (end - start)
+            else:
+                items.extend(buffer[start:])
+                items.extend(buffer[:end])
+                buffer[start:] = [None] * (self._capacity - start)
+                buffer[:end] = [None] * end
+
+            self._head = tail
+            if not self._not_full.is_set():
+                self._not_full.set()
+
+        # 只有环形区已经取空时，溢出区中的数据才能保证顺序
+        if self._overflow and self._head == self._tail:
+            with self._overflow_lock:
+                items.extend(self._overflow.values())
+                self._overflow.clear()
+
+        return items
+
+    def _pop(self) -> Any:
+        """
+        取出一条数据，为空时返回_EMPTY。
+        """
+        if self._side:
+            return self._side.popleft()
+
+        if self._pending:
+            return self._pending.popleft()
+
+        head: int = self._head
+
+        if head == self._tail:
+            if self._overflow:
+                with self._overflow_lock:
+                    self._pending.extend(self._overflow.values())
+                    self._overflow.clear()
+                return self._pending.popleft()
+            return _EMPTY
+
+        if self._policy == OverflowPolicy.DROP_OLDEST:
+            return self._pop_lapped(head)
+
+        index: int = head % self._capacity
+        item: Any = self._items[index]
+        self._items[index] = None
+
+        self._head = head + 1
+
+        if not self._not_full.is_set():
+            self._not_full.set()
+
+        return item
+
+    def _pop_lapped(self, head: int) -> Any:
+        """
+        DROP_OLDEST策略下取出数据，跳过已经被生产者覆盖的槽位。
+        """
+        capacity: int = self._capacity
+
+        while True:
+            tail: int = self._tail
+            if head >= tail:
+                self._head = head
+                return _EMPTY
+
+            if tail - head > capacity:
+                self.dropped += tail - capacity - head
+                head = tail - capacity
+
+            index: int = head % capacity
+            seq: int = self._seqs[index]
+            item: Any = self._items[index]
+
+            # 读取过程中槽位未被改写，数据有效
+            if seq == head and self._seqs[index] == head:
+                self._head = head + 1
+                return item
+
+            # 槽位正在或已经被覆盖，丢弃后读取下一条
+            self.dropped += 1
+            head += 1
+
+    def _put_overflow(self, item: Any) -> None:
+        """
+        COALESCE策略下将数据写入溢出区。
+        """
+        key: Optional[Hashable] = None
+        if self._key_func:
+            key = self._key_func(item)
+
+        replaced: Any = _EMPTY
+
+        with self._overflow_lock:
+            if key is None:
+                key = object()
+            elif key in self._overflow:
+                self.coalesced += 1
+                replaced = self._overflow[key]
+
+            self._overflow[key] = item
+
+        if replaced is not _EMPTY:
+            for callback in self._drop_callbacks:
+                callback(replaced)
+
+        if not self._not_empty.is_set():
+            self._not_empty.set()
+
+    def _wait_not_full(self) -> None:
+        """
+        BLOCK策略下等待消费者腾出空间。
+        """
+        while self._tail - self._head >= self._capacity:
+            self._not_full.clear()
+
+            if self._tail - self._head < self._capacity:
+                break
+
+            self._not_full.wait(0.1)
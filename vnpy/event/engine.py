@@ -3,12 +3,16 @@ Event-driven framework of VeighNa framework.
 """
 
 from collections import defaultdict
-from queue import Empty, Queue
-from threading import Thread
-from time import sleep
-from typing import Any, Callable, List
+from queue import Empty
+from threading import Event as ThreadEvent, Lock, Thread
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .buffer import EventQueue
+from .monitor import EventMonitor
 
 EVENT_TIMER = "eTimer"
+EVENT_MONITOR = "eMonitor"
 
 
 class Event:
@@ -31,26 +35,117 @@ class Event:
 HandlerType: callable = Callable[[Event], None]
 
 
+def default_shard_key(event: Event) -> Any:
+    """
+    分片模式下默认的路由键：事件数据的vt_symbol，没有该属性时返回None。
+    """
+    return getattr(event.data, "vt_symbol", None)
+
+
 class EventEngine:
     """
     事件引擎根据事件类型将事件对象分发给已注册的处理器。
 
-    它还每隔指定的时间间隔生成一个定时器事件，可用于定时目的。
+    它还每隔指定的时间间隔生成一个定时器事件，可用于定时目的。定时器基于单调时钟
+    按绝对时间排程，支持小于1秒的浮点数间隔，不会因为处理耗时而累积漂移。除默认的
+    EVENT_TIMER外，还可以通过add_timer添加多个不同频率的命名定时器。
+
+    事件队列可以替换为其他实现，只需提供以下接口：
+        * put(event)：写入事件
+        * get(block, timeout)：取出事件，超时抛出queue.Empty
+        * drain()：取出当前所有待处理事件
+        * qsize()：待处理事件数量
+
+    对于指定合并的事件类型（按前缀匹配，如"eTick."），如果队列中已有同一类型、
+    同一vt_symbol的事件尚未处理，新事件的数据会直接替换掉排队中事件的数据，
+    而不再重复排队，从而在处理速度跟不上时跳过过期的行情。
+
+    分片模式下，事件由多个工作线程并行处理：事件按路由键（默认为vt_symbol）
+    固定分配到某个工作线程，保证同一合约的事件按顺序处理，不同合约互不阻塞。
+    没有路由键的事件（如定时器、日志）统一由第一个工作线程处理，每个处理器
+    仍然只会收到一次。此时处理器函数需要自行保证线程安全。
+
+    除按事件类型精确注册外，还可以按前缀注册处理器（如"eTick."匹配所有合约的
+    行情事件）。每种事件类型对应的处理器列表在首次分发时解析并缓存，只有在
+    注册或注销处理器时才会重建。
+
+    启用监控后，引擎会统计每个处理器的调用次数和耗时分布，以及每类事件的
+    排队延时和队列深度，并每隔一定数量的定时器事件推送一次EVENT_MONITOR事件。
     """
 
-    def __init__(self, interval: int = 1) -> None:
+    # 分发表缓存的最大事件类型数量
+    dispatch_table_size: int = 10000
+
+    def __init__(
+        self,
+        interval: float = 1,
+        batch: bool = False,
+        queue: Any = None,
+        coalesce_types: Iterable[str] = None,
+        workers: int = 0,
+        shard_key: Callable[[Event], Any] = default_shard_key,
+        monitor: bool = False,
+        monitor_interval: int = 10
+    ) -> None:
         """
         如果未指定时间间隔，默认每秒生成一次定时器事件。
 
-        :param interval: 定时器事件的时间间隔，默认为 1 秒。
+        :param interval: 定时器事件的时间间隔，单位为秒，支持浮点数，默认为 1 秒。
+        :param batch: 是否启用批量处理模式，启用后每次唤醒时一次性取出队列中所有待处理事件，默认为 False。
+        :param queue: 事件队列，默认为EventQueue，单生产者场景可以使用RingBuffer，接口推送行情时自动绑定主生产者。
+        :param coalesce_types: 需要按vt_symbol合并的事件类型前缀，事件数据必须包含vt_symbol属性，默认不合并。
+        :param workers: 分片处理的工作线程数量，默认为 0，即在事件线程中直接处理。
+        :param shard_key: 分片模式下的路由键函数，返回None的事件由第一个工作线程处理。
+        :param monitor: 是否启用运行监控统计，默认为 False。
+        :param monitor_interval: 推送监控事件间隔的定时器事件数量，默认为 10。
         """
-        self._interval: int = interval
-        self._queue: Queue = Queue()
+        self._interval: float = interval
+        if queue is None:
+            queue = EventQueue()
+        self._queue: Any = queue
         self._active: bool = False
-        self._thread: Thread = Thread(target=self._run)
+        self._batch: bool = batch
+        if batch:
+            self._thread: Thread = Thread(target=self._run_batch)
+        else:
+            self._thread: Thread = Thread(target=self._run)
         self._timer: Thread = Thread(target=self._run_timer)
+        self._timer_wakeup: ThreadEvent = ThreadEvent()
+        self._timers: Dict[str, List[float]] = {EVENT_TIMER: [interval, 0]}
         self._handlers: defaultdict = defaultdict(list)
         self._general_handlers: List = []
+        self._prefix_handlers: Dict[str, List[HandlerType]] = {}
+        self._dispatch_table: Dict[str, Tuple[HandlerType, ...]] = {}
+        self._handlers_lock: Lock = Lock()
+
+        self._coalesce_types: Tuple[str, ...] = tuple(coalesce_types) if coalesce_types else ()
+        self._coalesce_events: Dict[Tuple[str, str], Event] = {}
+        self._coalesce_counts: Dict[str, int] = defaultdict(int)
+        self._coalesce_lock: Lock = Lock()
+
+        # 排队中的合并事件被队列丢弃时同样需要释放其合并键
+        if self._coalesce_types and hasattr(queue, "register_drop_callback"):
+            queue.register_drop_callback(self._release_coalesce)
+
+        self._workers: int = workers
+        self._shard_key: Callable[[Event], Any] = shard_key
+        self._shard_queues: List[EventQueue] = [EventQueue() for _ in range(workers)]
+        self._shard_threads: List[Thread] = [
+            Thread(target=self._run_shard, args=(shard_queue,))
+            for shard_queue in self._shard_queues
+        ]
+
+        if workers:
+            self._dispatch: HandlerType = self._route
+        else:
+            self._dispatch: HandlerType = self._process
+
+        self._monitor: Optional[EventMonitor] = None
+        self._monitor_interval: int = monitor_interval
+        self._monitor_count: int = 0
+        if monitor:
+            self._monitor = EventMonitor()
+            self.register(EVENT_TIMER, self._publish_monitor)
 
     def _run(self) -> None:
         """
@@ -59,36 +154,218 @@ class EventEngine:
         while self._active:
             try:
                 event: Event = self._queue.get(block=True, timeout=1)
-                self._process(event)
+                self._dispatch(event)
             except Empty:
                 pass
 
+    def _run_batch(self) -> None:
+        """
+        批量模式：阻塞等待第一个事件，然后一次性取出队列中剩余的所有事件，并按顺序依次处理。
+        """
+        queue: Any = self._queue
+
+        while self._active:
+            try:
+                event: Event = queue.get(block=True, timeout=1)
+            except Empty:
+                continue
+
+            events: List[Event] = queue.drain()
+
+            self._dispatch(event)
+            for event in events:
+                self._dispatch(event)
+
+    def _route(self, event: Event) -> None:
+        """
+        分片模式：根据路由键将事件分配给对应的工作线程。
+        """
+        key: Any = self._shard_key(event)
+
+        if key is None:
+            index: int = 0
+        else:
+            index: int = hash(key) % self._workers
+
+        self._shard_queues[index].put(event)
+
+    def _run_shard(self, queue: EventQueue) -> None:
+        """
+        分片模式：工作线程从自己的队列中获取事件并处理。
+        """
+        while self._active:
+            try:
+                event: Event = queue.get(block=True, timeout=1)
+            except Empty:
+                continue
+
+            self._process(event)
+
     def _process(self, event: Event) -> None:
         """
         首先将事件分发给已注册监听该类型的处理器。
 
         然后将事件分发给所有类型的通用处理器。
         """
-        if event.type in self._handlers:
-            [handler(event) for handler in self._handlers[event.type]]
+        if self._coalesce_types:
+            self._release_coalesce(event)
+
+        handlers: Tuple[HandlerType, ...] = self._dispatch_table.get(event.type, None)
+        if handlers is None:
+            handlers = self._resolve_handlers(event.type)
+
+        if self._monitor:
+            self._process_monitored(event, handlers)
+            return
+
+        for handler in handlers:
+            handler(event)
+
+    def _release_coalesce(self, event: Event) -> None:
+        """
+        事件即将被处理或已被队列丢弃，释放其合并键，此后到达的同类事件需要重新排队。
+        """
+        if not event.type.startswith(self._coalesce_types):
+            return
+
+        key: Tuple[str, str] = (event.type, event.data.vt_symbol)
+
+        with self._coalesce_lock:
+            # 合并键可能已经属于之后重新排队的事件
+            if self._coalesce_events.get(key, None) is event:
+                del self._coalesce_events[key]
+
+    def _resolve_handlers(self, type: str) -> Tuple[HandlerType, ...]:
+        """
+        解析事件类型对应的全部处理器并写入分发表缓存。
+
+        顺序依次为：精确匹配的处理器、前缀匹配的处理器、通用处理器。
+        """
+        # 与注册和注销互斥，避免解析结果写入注册后新建的分发表
+        with self._handlers_lock:
+            handlers: List[HandlerType] = list(self._handlers.get(type, []))
+
+            for prefix, prefix_handlers in list(self._prefix_handlers.items()):
+                if type.startswith(prefix):
+                    handlers.extend(prefix_handlers)
+
+            handlers.extend(self._general_handlers)
+
+            # 委托等事件类型带有唯一后缀，缓存数量超出上限时清空重建
+            if len(self._dispatch_table) >= self.dispatch_table_size:
+                self._dispatch_table = {}
+
+            result: Tuple[HandlerType, ...] = tuple(handlers)
+            self._dispatch_table[type] = result
+
+        return result
+
+    def _process_monitored(self, event: Event, handlers: Tuple[HandlerType, ...]) -> None:
+        """
+        监控模式：分发事件的同时记录排队延时、队列深度和每个处理器的耗时。
+        """
+        monitor: EventMonitor = self._monitor
+        start: float = perf_counter()
+
+        # 按类型前缀（如"eTick."）汇总，避免为每个合约或委托单独统计
+        type: str = event.type
+        type = type[:type.find(".") + 1] or type
 
-        if self._general_handlers:
-            [handler(event) for handler in self._general_handlers]
+        put_time: float = getattr(event, "put_time", start)
+        monitor.record_event(type, start - put_time, self.get_queue_size())
+
+        for handler in handlers:
+            handler_start: float = perf_counter()
+            handler(event)
+            monitor.record_handler(handler, perf_counter() - handler_start)
+
+    def _publish_monitor(self, event: Event) -> None:
+        """
+        每隔指定数量的定时器事件推送一次监控统计数据。
+        """
+        self._monitor_count += 1
+        if self._monitor_count < self._monitor_interval:
+            return
+        self._monitor_count = 0
+
+        self.put(Event(EVENT_MONITOR, self._monitor.get_stats()))
+
+    def get_queue_size(self) -> int:
+        """
+        获取待处理事件的数量，分片模式下包括各工作线程队列中的事件。
+        """
+        size: int = self._queue.qsize()
+        for queue in self._shard_queues:
+            size += queue.qsize()
+        return size
+
+    def get_monitor_stats(self) -> Dict[str, Any]:
+        """
+        获取当前的监控统计数据，未启用监控时返回空字典。
+        """
+        if not self._monitor:
+            return {}
+        return self._monitor.get_stats()
 
     def _run_timer(self) -> None:
         """
-        每隔指定的时间间隔休眠并生成一个定时器事件。
+        按单调时钟排程，在每个定时器到期时生成对应的定时器事件。
         """
+        start: float = monotonic()
+        for timer in list(self._timers.values()):
+            timer[1] = start + timer[0]
+
         while self._active:
-            sleep(self._interval)
-            event: Event = Event(EVENT_TIMER)
-            self.put(event)
+            now: float = monotonic()
+            next_time: float = now + 1
+
+            for type, timer in list(self._timers.items()):
+                interval, deadline = timer
+
+                # 新添加的定时器从当前时间开始排程
+                if not deadline:
+                    deadline = now + interval
+                elif now >= deadline:
+                    self.put(Event(type))
+
+                    # 按绝对时间推进，落后超过一个周期时跳过错过的触发
+                    deadline += interval
+                    if deadline <= now:
+                        deadline = now + interval
+
+                timer[1] = deadline
+                next_time = min(next_time, deadline)
+
+            self._timer_wakeup.wait(max(next_time - monotonic(), 0))
+            self._timer_wakeup.clear()
+
+    def add_timer(self, name: str, interval: float) -> str:
+        """
+        添加一个命名定时器，返回其事件类型（EVENT_TIMER + "." + name）。
+
+        :param name: 定时器名称。
+        :param interval: 定时器事件的时间间隔，单位为秒。
+        """
+        type: str = f"{EVENT_TIMER}.{name}"
+        self._timers[type] = [interval, 0]
+        self._timer_wakeup.set()
+        return type
+
+    def remove_timer(self, name: str) -> None:
+        """
+        移除命名定时器。
+
+        :param name: 定时器名称。
+        """
+        self._timers.pop(f"{EVENT_TIMER}.{name}", None)
 
     def start(self) -> None:
         """
         启动事件引擎以处理事件并生成定时器事件。
         """
         self._active = True
+        for thread in self._shard_threads:
+            thread.start()
         self._thread.start()
         self._timer.start()
 
@@ -97,8 +374,11 @@ class EventEngine:
         停止事件引擎。
         """
         self._active = False
+        self._timer_wakeup.set()
         self._timer.join()
         self._thread.join()
+        for thread in self._shard_threads:
+            thread.join()
 
     def put(self, event: Event) -> None:
         """
@@ -106,8 +386,42 @@ class EventEngine:
 
         :param event: 要放入队列的事件对象。
         """
+        if self._monitor:
+            event.put_time = perf_counter()
+
+        if self._coalesce_types and event.type.startswith(self._coalesce_types):
+            key: Tuple[str, str] = (event.type, event.data.vt_symbol)
+
+            with self._coalesce_lock:
+                queued: Event = self._coalesce_events.get(key, None)
+
+                # 队列中已有未处理的同类事件，直接替换其数据
+                if queued:
+                    queued.data = event.data
+                    self._coalesce_counts[event.type] += 1
+                    return
+
+                self._coalesce_events[key] = event
+
         self._queue.put(event)
 
+    def bind_producer(self, owner: Any = None) -> bool:
+        """
+        将调用线程绑定为事件队列的主生产者，通常由接口的行情回调线程调用，返回是否绑定成功。
+
+        仅在事件队列提供bind_producer（如RingBuffer）时生效，owner的含义见RingBuffer.bind_producer。
+        """
+        bind: Optional[Callable[..., bool]] = getattr(self._queue, "bind_producer", None)
+        if not bind:
+            return False
+        return bind(owner=owner)
+
+    def get_coalesce_counts(self) -> Dict[str, int]:
+        """
+        获取各事件类型被合并的事件数量。
+        """
+        return dict(self._coalesce_counts)
+
     def register(self, type: str, handler: HandlerType) -> None:
         """
         为特定事件类型注册一个新的处理器函数。每个函数只能为每个事件类型注册一次。
@@ -115,9 +429,11 @@ class EventEngine:
         :param type: 事件类型。
         :param handler: 处理器函数。
         """
-        handler_list: list = self._handlers[type]
-        if handler not in handler_list:
-            handler_list.append(handler)
+        with self._handlers_lock:
+            handler_list: list = self._handlers[type]
+            if handler not in handler_list:
+                handler_list.append(handler)
+                self._dispatch_table = {}
 
     def unregister(self, type: str, handler: HandlerType) -> None:
         """
@@ -126,13 +442,47 @@ class EventEngine:
         :param type: 事件类型。
         :param handler: 处理器函数。
         """
-        handler_list: list = self._handlers[type]
+        with self._handlers_lock:
+            handler_list: list = self._handlers[type]
+
+            if handler in handler_list:
+                handler_list.remove(handler)
+
+            if not handler_list:
+                self._handlers.pop(type)
+
+            self._dispatch_table = {}
+
+    def register_prefix(self, prefix: str, handler: HandlerType) -> None:
+        """
+        为所有以指定前缀开头的事件类型注册处理器函数，如"eTick."。
+
+        :param prefix: 事件类型前缀。
+        :param handler: 处理器函数。
+        """
+        with self._handlers_lock:
+            handler_list: list = self._prefix_handlers.setdefault(prefix, [])
+            if handler not in handler_list:
+                handler_list.append(handler)
+                self._dispatch_table = {}
+
+    def unregister_prefix(self, prefix: str, handler: HandlerType) -> None:
+        """
+        注销按前缀注册的处理器函数。
+
+        :param prefix: 事件类型前缀。
+        :param handler: 处理器函数。
+        """
+        with self._handlers_lock:
+            handler_list: list = self._prefix_handlers.get(prefix, [])
+
+            if handler in handler_list:
+                handler_list.remove(handler)
 
-        if handler in handler_list:
-            handler_list.remove(handler)
+            if not handler_list:
+                self._prefix_handlers.pop(prefix, None)
 
-        if not handler_list:
-            self._handlers.pop(type)
+            self._dispatch_table = {}
 
     def register_general(self, handler: HandlerType) -> None:
         """
@@ -140,8 +490,10 @@ class EventEngine:
 
         :param handler: 处理器函数。
         """
-        if handler not in self._general_handlers:
-            self._general_handlers.append(handler)
+        with self._handlers_lock:
+            if handler not in self._general_handlers:
+                self._general_handlers.append(handler)
+                self._dispatch_table = {}
 
     def unregister_general(self, handler: HandlerType) -> None:
         """
@@ -149,5 +501,7 @@ class EventEngine:
 
         :param handler: 处理器函数。
         """
-        if handler in self._general_handlers:
-            self._general_handlers.remove(handler)
+        with self._handlers_lock:
+            if handler in self._general_handlers:
+                self._general_handlers.remove(handler)
+                self._dispatch_table = {}
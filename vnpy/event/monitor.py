@@ -0,0 +1,136 @@
+"""
+Runtime statistics of the event engine.
+"""
+
+from threading import Lock
+from typing import Any, Callable, Dict, List
+
+
+class LatencyHistogram:
+    """
+    以2的幂次微秒为桶边界的延时直方图，记录开销为常数时间。
+    """
+
+    bucket_count: int = 32
+
+    def __init__(self) -> None:
+        """"""
+        self.buckets: List[int] = [0] * self.bucket_count
+        self.count: int = 0
+        self.total: float = 0
+        self.max: float = 0
+
+    def record(self, seconds: float) -> None:
+        """
+        记录一次延时，单位为秒。
+        """
+        index: int = min(int(seconds * 1_000_000).bit_length(), self.bucket_count - 1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent: float) -> float:
+        """
+        返回分位数对应桶的上边界，单位为秒。
+        """
+        if not self.count:
+            return 0
+
+        target: float = self.count * percent / 100
+        accumulated: int = 0
+
+        for index, number in enumerate(self.buckets):
+            accumulated += number
+            if accumulated >= target:
+                return min((1 << index) / 1_000_000, self.max)
+
+        return self.max
+
+    def to_dict(self) -> Dict[str, float]:
+        """
+        输出统计结果。
+        """
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max
+        }
+
+
+class EventMonitor:
+    """
+    统计事件引擎中每个处理器的调用次数和耗时，以及每种事件类型的队列深度和排队延时。
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.handler_latency: Dict[Callable, LatencyHistogram] = {}
+        self.event_delay: Dict[str, LatencyHistogram] = {}
+        self.queue_depth: Dict[str, Dict[str, int]] = {}
+
+        self.lock: Lock = Lock()
+
+    def record_event(self, type: str, delay: float, depth: int) -> None:
+        """
+        记录事件从放入队列到开始处理的延时，以及此时的队列深度。
+        """
+        with self.lock:
+            histogram: LatencyHistogram = self.event_delay.get(type, None)
+            if not histogram:
+                histogram = LatencyHistogram()
+                self.event_delay[type] = histogram
+                self.queue_depth[type] = {"last": 0, "max": 0}
+            histogram.record(delay)
+
+            depth_data: Dict[str, int] = self.queue_depth[type]
+            depth_data["last"] = depth
+            if depth > depth_data["max"]:
+                depth_data["max"] = depth
+
+    def record_handler(self, handler: Callable, latency: float) -> None:
+        """
+        记录处理器的一次调用耗时。
+        """
+        with self.lock:
+            histogram: LatencyHistogram = self.handler_latency.get(handler, None)
+            if not histogram:
+                histogram = LatencyHistogram()
+                self.handler_latency[handler] = histogram
+            histogram.record(latency)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        生成当前统计数据的快照。
+        """
+        with self.lock:
+            handlers: Dict[str, dict] = {}
+            for handler, histogram in self.handler_latency.items():
+                name: str = get_handler_name(handler)
+                if name in handlers:
+                    name = f"{name}#{id(handler)}"
+                handlers[name] = histogram.to_dict()
+
+            events: Dict[str, dict] = {}
+            for type, histogram in self.event_delay.items():
+                data: dict = histogram.to_dict()
+                data["depth_last"] = self.queue_depth[type]["last"]
+                data["depth_max"] = self.queue_depth[type]["max"]
+                events[type] = data
+
+        return {"handlers": handlers, "events": events}
+
+
+def get_handler_name(handler: Callable) -> str:
+    """
+    获取处理器的可读名称。
+    """
+    name: str = getattr(handler, "__qualname__", "") or repr(handler)
+    module: str = getattr(handler, "__module__", "") or ""
+
+    if module:
+        return f"{module}.{name}"
+    return name
@@ -151,8 +151,18 @@ class Interval(Enum):
     """
     Interval of bar data.
     """
+    SECOND = "1s"
     MINUTE = "1m"
     HOUR = "1h"
     DAILY = "d"
     WEEKLY = "w"
     TICK = "tick"
+
+
+class BarType(Enum):
+    """
+    Type of bar generated from tick data.
+    """
+    TIME = "time"
+    VOLUME = "volume"
+    RANGE = "range"
@@ -1,5 +1,4 @@
-from copy import copy
-from typing import Dict, List, Set, TYPE_CHECKING
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 
 from .object import (
     ContractData,
@@ -14,6 +13,22 @@ if TYPE_CHECKING:
     from .engine import MainEngine
 
 
+CLOSE_OFFSETS: Set[Offset] = {Offset.CLOSE, Offset.CLOSETODAY, Offset.CLOSEYESTERDAY}
+CLOSE_YD_EXCHANGES: Set[Exchange] = {Exchange.SHFE, Exchange.INE}
+
+# Key prefix of requests frozen temporarily during basket conversion
+BASKET_PREFIX: str = "basket."
+
+
+def copy_request(req: OrderRequest) -> OrderRequest:
+    """
+    Shallow copy of order request, about 2.5 times faster than copy.copy.
+    """
+    new_req: OrderRequest = OrderRequest.__new__(OrderRequest)
+    new_req.__dict__.update(req.__dict__)
+    return new_req
+
+
 class OffsetConverter:
     """"""
 
@@ -21,39 +36,54 @@ class OffsetConverter:
         """"""
         self.holdings: Dict[str, "PositionHolding"] = {}
 
+        # Cached convert policy of each contract, None for no convert required
+        self.policies: Dict[str, Optional["PositionHolding"]] = {}
+
         self.get_contract = main_engine.get_contract
 
+    def update_contract(self, contract: ContractData) -> None:
+        """
+        Refresh cached convert policy when contract data is updated.
+        """
+        self.policies.pop(contract.vt_symbol, None)
+
+    def get_convert_holding(self, vt_symbol: str) -> Optional["PositionHolding"]:
+        """
+        Get position holding of contract requiring offset convert, or None.
+        """
+        if vt_symbol in self.policies:
+            return self.policies[vt_symbol]
+
+        holding: Optional[PositionHolding] = None
+        if self.is_convert_required(vt_symbol):
+            holding = self.get_position_holding(vt_symbol)
+
+        self.policies[vt_symbol] = holding
+        return holding
+
     def update_position(self, position: PositionData) -> None:
         """"""
-        if not self.is_convert_required(position.vt_symbol):
-            return
-
-        holding: PositionHolding = self.get_position_holding(position.vt_symbol)
-        holding.update_position(position)
+        holding: Optional[PositionHolding] = self.get_convert_holding(position.vt_symbol)
+        if holding:
+            holding.update_position(position)
 
     def update_trade(self, trade: TradeData) -> None:
         """"""
-        if not self.is_convert_required(trade.vt_symbol):
-            return
-
-        holding: PositionHolding = self.get_position_holding(trade.vt_symbol)
-        holding.update_trade(trade)
+        holding: Optional[PositionHolding] = self.get_convert_holding(trade.vt_symbol)
+        if holding:
+            holding.update_trade(trade)
 
     def update_order(self, order: OrderData) -> None:
         """"""
-        if not self.is_convert_required(order.vt_symbol):
-            return
-
-        holding: PositionHolding = self.get_position_holding(order.vt_symbol)
-        holding.update_order(order)
+        holding: Optional[PositionHolding] = self.get_convert_holding(order.vt_symbol)
+        if holding:
+            holding.update_order(order)
 
     def update_order_request(self, req: OrderRequest, vt_orderid: str) -> None:
         """"""
-        if not self.is_convert_required(req.vt_symbol):
-            return
-
-        holding: PositionHolding = self.get_position_holding(req.vt_symbol)
-        holding.update_order_request(req, vt_orderid)
+        holding: Optional[PositionHolding] = self.get_convert_holding(req.vt_symbol)
+        if holding:
+            holding.update_order_request(req, vt_orderid)
 
     def get_position_holding(self, vt_symbol: str) -> "PositionHolding":
         """"""
@@ -71,19 +101,57 @@ class OffsetConverter:
         net: bool = False
     ) -> List[OrderRequest]:
         """"""
-        if not self.is_convert_required(req.vt_symbol):
+        holding: Optional[PositionHolding] = self.get_convert_holding(req.vt_symbol)
+        if not holding:
             return [req]
 
-        holding: PositionHolding = self.get_position_holding(req.vt_symbol)
+        return holding.convert_order_request(req, lock, net)
 
-        if lock:
-            return holding.convert_order_request_lock(req)
-        elif net:
-            return holding.convert_order_request_net(req)
-        elif req.exchange in {Exchange.SHFE, Exchange.INE}:
-            return holding.convert_order_request_shfe(req)
-        else:
-            return [req]
+    def convert_order_requests(
+        self,
+        reqs: List[OrderRequest],
+        lock: bool,
+        net: bool = False
+    ) -> List[List[OrderRequest]]:
+        """
+        Convert a basket of order requests, return converted requests of each one.
+
+        Convert policy of each symbol is resolved from cache. Close
+        volume converted for earlier requests is frozen until the whole basket
+        is converted, so that requests of the same symbol do not close the
+        same position twice.
+        """
+        converted_legs: Dict[str, List[OrderRequest]] = {}
+        frozen_data: Dict[str, Tuple[tuple, List[str]]] = {}
+        results: List[List[OrderRequest]] = []
+
+        for req in reqs:
+            vt_symbol: str = req.vt_symbol
+
+            holding: Optional[PositionHolding] = self.get_convert_holding(vt_symbol)
+            if not holding:
+                results.append([req])
+                continue
+
+            # Freeze close volume of previous request of same symbol
+            previous: Optional[List[OrderRequest]] = converted_legs.get(vt_symbol, None)
+            if previous:
+                if vt_symbol not in frozen_data:
+                    frozen_data[vt_symbol] = (holding.get_frozen_data(), [])
+                keys: List[str] = holding.freeze_order_requests(previous)
+                frozen_data[vt_symbol][1].extend(keys)
+
+            converted: List[OrderRequest] = holding.convert_order_request(req, lock, net)
+            converted_legs[vt_symbol] = converted
+            results.append(converted)
+
+        # Restore frozen volume after the whole basket is converted
+        for vt_symbol, (data, keys) in frozen_data.items():
+            holding = self.holdings[vt_symbol]
+            holding.unfreeze_order_requests(keys)
+            holding.set_frozen_data(data)
+
+        return results
 
     def is_convert_required(self, vt_symbol: str) -> bool:
         """
@@ -100,6 +168,135 @@ class OffsetConverter:
             return True
 
 
+class FrozenVolume:
+    """
+    Frozen volume of one position direction, updated incrementally.
+
+    Close orders freeze today position first, and the part exceeding today
+    position is frozen on yesterday position. This is applied to orders in
+    sequence, so a close today order before the last close order can push
+    it into yesterday position, but one after it can not. Only the close
+    today volume after the last close order is tracked to keep the result
+    same as calculating all orders in sequence.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.orders: Dict[str, Tuple[Offset, float, int]] = {}
+        self.count: int = 0
+
+        self.td_total: float = 0        # close today and close orders
+        self.yd_total: float = 0        # close yesterday orders
+
+        self.last_close: int = -1       # sequence of last close order
+        self.td_after: float = 0        # close today volume after last close order
+
+    def clear(self) -> None:
+        """"""
+        self.orders.clear()
+        self.td_total = 0
+        self.yd_total = 0
+        self.last_close = -1
+        self.td_after = 0
+
+    def update(self, vt_orderid: str, offset: Offset, frozen: float) -> None:
+        """
+        Add new order or update frozen volume of existing order.
+        """
+        old: Optional[Tuple[Offset, float, int]] = self.orders.get(vt_orderid, None)
+
+        if not old:
+            seq: int = self.count
+            self.count += 1
+            self.orders[vt_orderid] = (offset, frozen, seq)
+
+            if offset == Offset.CLOSE:
+                self.td_total += frozen
+                self.last_close = seq
+                self.td_after = 0
+            elif offset == Offset.CLOSETODAY:
+                self.td_total += frozen
+                self.td_after += frozen
+            else:
+                self.yd_total += frozen
+            return
+
+        old_offset, old_frozen, seq = old
+        self.orders[vt_orderid] = (offset, frozen, seq)
+
+        if offset != old_offset:
+            self.rebuild()
+            return
+
+        change: float = frozen - old_frozen
+        if offset == Offset.CLOSE:
+            self.td_total += change
+        elif offset == Offset.CLOSETODAY:
+            self.td_total += change
+            if seq > self.last_close:
+                self.td_after += change
+        else:
+            self.yd_total += change
+
+    def remove(self, vt_orderid: str) -> None:
+        """"""
+        offset, frozen, seq = self.orders.pop(vt_orderid)
+
+        if not self.orders:
+            self.clear()
+        elif offset == Offset.CLOSE:
+            self.td_total -= frozen
+            if seq == self.last_close:
+                self.find_last_close()
+        elif offset == Offset.CLOSETODAY:
+            self.td_total -= frozen
+            if seq > self.last_close:
+                self.td_after -= frozen
+        else:
+            self.yd_total -= frozen
+
+    def find_last_close(self) -> None:
+        """
+        Search backwards for last close order and close today volume after it.
+        """
+        self.last_close = -1
+        self.td_after = 0
+
+        for offset, frozen, seq in reversed(self.orders.values()):
+            if offset == Offset.CLOSE:
+                self.last_close = seq
+                break
+            elif offset == Offset.CLOSETODAY:
+                self.td_after += frozen
+
+    def rebuild(self) -> None:
+        """"""
+        self.td_total = 0
+        self.yd_total = 0
+
+        for offset, frozen, _seq in self.orders.values():
+            if offset == Offset.CLOSEYESTERDAY:
+                self.yd_total += frozen
+            else:
+                self.td_total += frozen
+
+        self.find_last_close()
+
+    def get_frozen(self, td_volume: float) -> Tuple[float, float]:
+        """
+        Get today and yesterday frozen volume, before limited by position volume.
+        """
+        if self.last_close < 0:
+            return self.td_total, self.yd_total
+
+        # Volume of orders up to the last close order, the excess over today
+        # position is frozen on yesterday position
+        before: float = self.td_total - self.td_after
+        td_frozen: float = min(before, td_volume) + self.td_after
+        yd_frozen: float = self.yd_total + max(0, before - td_volume)
+        return td_frozen, yd_frozen
+
+
 class PositionHolding:
     """"""
 
@@ -108,6 +305,9 @@ class PositionHolding:
         self.vt_symbol: str = contract.vt_symbol
         self.exchange: Exchange = contract.exchange
 
+        # SHFE and INE require close today and close yesterday separately
+        self.close_yd: bool = self.exchange in CLOSE_YD_EXCHANGES
+
         self.active_orders: Dict[str, OrderData] = {}
 
         self.long_pos: float = 0
@@ -126,6 +326,10 @@ class PositionHolding:
         self.short_yd_frozen: float = 0
         self.short_td_frozen: float = 0
 
+        # Close orders freezing long position are short orders, and vice versa
+        self.long_frozen_volume: FrozenVolume = FrozenVolume()
+        self.short_frozen_volume: FrozenVolume = FrozenVolume()
+
     def update_position(self, position: PositionData) -> None:
         """"""
         if position.direction == Direction.LONG:
@@ -139,13 +343,38 @@ class PositionHolding:
 
     def update_order(self, order: OrderData) -> None:
         """"""
+        vt_orderid: str = order.vt_orderid
+        existing: bool = vt_orderid in self.active_orders
+
         if order.is_active():
-            self.active_orders[order.vt_orderid] = order
+            self.active_orders[vt_orderid] = order
         else:
-            if order.vt_orderid in self.active_orders:
-                self.active_orders.pop(order.vt_orderid)
+            if vt_orderid in self.active_orders:
+                self.active_orders.pop(vt_orderid)
+
+        # Only adjust contribution of the changed order
+        old_volume: Optional[FrozenVolume] = None
+        if vt_orderid in self.long_frozen_volume.orders:
+            old_volume = self.long_frozen_volume
+        elif vt_orderid in self.short_frozen_volume.orders:
+            old_volume = self.short_frozen_volume
 
-        self.calculate_frozen()
+        new_volume: Optional[FrozenVolume] = None
+        if order.is_active() and order.offset in CLOSE_OFFSETS:
+            new_volume = self.get_frozen_volume(order.direction)
+
+        if new_volume:
+            # Position of order in sequence is lost when an existing order
+            # changes direction or turns into close order
+            if old_volume is not new_volume and existing:
+                self.calculate_frozen()
+                return
+
+            new_volume.update(vt_orderid, order.offset, order.volume - order.traded)
+        elif old_volume:
+            old_volume.remove(vt_orderid)
+
+        self.sum_frozen_volume()
 
     def update_order_request(self, req: OrderRequest, vt_orderid: str) -> None:
         """"""
@@ -164,7 +393,7 @@ class PositionHolding:
             elif trade.offset == Offset.CLOSEYESTERDAY:
                 self.short_yd -= trade.volume
             elif trade.offset == Offset.CLOSE:
-                if trade.exchange in {Exchange.SHFE, Exchange.INE}:
+                if self.close_yd:
                     self.short_yd -= trade.volume
                 else:
                     self.short_td -= trade.volume
@@ -180,7 +409,7 @@ class PositionHolding:
             elif trade.offset == Offset.CLOSEYESTERDAY:
                 self.long_yd -= trade.volume
             elif trade.offset == Offset.CLOSE:
-                if trade.exchange in {Exchange.SHFE, Exchange.INE}:
+                if self.close_yd:
                     self.long_yd -= trade.volume
                 else:
                     self.long_td -= trade.volume
@@ -195,47 +424,38 @@ class PositionHolding:
         # Update frozen volume to ensure no more than total volume
         self.sum_pos_frozen()
 
-    def calculate_frozen(self) -> None:
-        """"""
-        self.long_pos_frozen = 0
-        self.long_yd_frozen = 0
-        self.long_td_frozen = 0
+    def get_frozen_volume(self, direction: Direction) -> Optional[FrozenVolume]:
+        """
+        Get frozen volume of position closed by orders with the direction.
+        """
+        if direction == Direction.LONG:
+            return self.short_frozen_volume
+        elif direction == Direction.SHORT:
+            return self.long_frozen_volume
+        return None
 
-        self.short_pos_frozen = 0
-        self.short_yd_frozen = 0
-        self.short_td_frozen = 0
+    def calculate_frozen(self) -> None:
+        """
+        Recalculate frozen volume from all active orders.
+        """
+        self.long_frozen_volume.clear()
+        self.short_frozen_volume.clear()
 
         for order in self.active_orders.values():
             # Ignore position open orders
-            if order.offset == Offset.OPEN:
+            if order.offset not in CLOSE_OFFSETS:
                 continue
 
-            frozen: float = order.volume - order.traded
-
-            if order.direction == Direction.LONG:
-                if order.offset == Offset.CLOSETODAY:
-                    self.short_td_frozen += frozen
-                elif order.offset == Offset.CLOSEYESTERDAY:
-                    self.short_yd_frozen += frozen
-                elif order.offset == Offset.CLOSE:
-                    self.short_td_frozen += frozen
-
-                    if self.short_td_frozen > self.short_td:
-                        self.short_yd_frozen += (self.short_td_frozen
-                                                 - self.short_td)
-                        self.short_td_frozen = self.short_td
-            elif order.direction == Direction.SHORT:
-                if order.offset == Offset.CLOSETODAY:
-                    self.long_td_frozen += frozen
-                elif order.offset == Offset.CLOSEYESTERDAY:
-                    self.long_yd_frozen += frozen
-                elif order.offset == Offset.CLOSE:
-                    self.long_td_frozen += frozen
-
-                    if self.long_td_frozen > self.long_td:
-                        self.long_yd_frozen += (self.long_td_frozen
-                                                - self.long_td)
-                        self.long_td_frozen = self.long_td
+            frozen_volume: Optional[FrozenVolume] = self.get_frozen_volume(order.direction)
+            if frozen_volume:
+                frozen_volume.update(order.vt_orderid, order.offset, order.volume - order.traded)
+
+        self.sum_frozen_volume()
+
+    def sum_frozen_volume(self) -> None:
+        """"""
+        self.long_td_frozen, self.long_yd_frozen = self.long_frozen_volume.get_frozen(self.long_td)
+        self.short_td_frozen, self.short_yd_frozen = self.short_frozen_volume.get_frozen(self.short_td)
 
         self.sum_pos_frozen()
 
@@ -251,6 +471,60 @@ class PositionHolding:
         self.long_pos_frozen = self.long_td_frozen + self.long_yd_frozen
         self.short_pos_frozen = self.short_td_frozen + self.short_yd_frozen
 
+    def get_frozen_data(self) -> tuple:
+        """"""
+        return (
+            self.long_td_frozen,
+            self.long_yd_frozen,
+            self.short_td_frozen,
+            self.short_yd_frozen
+        )
+
+    def set_frozen_data(self, data: tuple) -> None:
+        """"""
+        self.long_td_frozen, self.long_yd_frozen, self.short_td_frozen, self.short_yd_frozen = data
+        self.sum_pos_frozen()
+
+    def freeze_order_requests(self, reqs: List[OrderRequest]) -> List[str]:
+        """
+        Freeze close volume of requests not sent yet, return keys for unfreezing.
+        """
+        keys: List[str] = []
+
+        for req in reqs:
+            if req.offset not in CLOSE_OFFSETS:
+                continue
+
+            frozen_volume: Optional[FrozenVolume] = self.get_frozen_volume(req.direction)
+            if not frozen_volume:
+                continue
+
+            key: str = f"{BASKET_PREFIX}{frozen_volume.count}"
+            frozen_volume.update(key, req.offset, req.volume)
+            keys.append(key)
+
+        self.sum_frozen_volume()
+        return keys
+
+    def unfreeze_order_requests(self, keys: List[str]) -> None:
+        """"""
+        for key in keys:
+            if key in self.long_frozen_volume.orders:
+                self.long_frozen_volume.remove(key)
+            else:
+                self.short_frozen_volume.remove(key)
+
+    def convert_order_request(self, req: OrderRequest, lock: bool, net: bool = False) -> List[OrderRequest]:
+        """"""
+        if lock:
+            return self.convert_order_request_lock(req)
+        elif net:
+            return self.convert_order_request_net(req)
+        elif self.close_yd:
+            return self.convert_order_request_shfe(req)
+        else:
+            return [req]
+
     def convert_order_request_shfe(self, req: OrderRequest) -> List[OrderRequest]:
         """"""
         if req.offset == Offset.OPEN:
@@ -266,19 +540,19 @@ class PositionHolding:
         if req.volume > pos_available:
             return []
         elif req.volume <= td_available:
-            req_td: OrderRequest = copy(req)
+            req_td: OrderRequest = copy_request(req)
             req_td.offset = Offset.CLOSETODAY
             return [req_td]
         else:
             req_list: List[OrderRequest] = []
 
             if td_available > 0:
-                req_td: OrderRequest = copy(req)
+                req_td: OrderRequest = copy_request(req)
                 req_td.offset = Offset.CLOSETODAY
                 req_td.volume = td_available
                 req_list.append(req_td)
 
-            req_yd: OrderRequest = copy(req)
+            req_yd: OrderRequest = copy_request(req)
             req_yd.offset = Offset.CLOSEYESTERDAY
             req_yd.volume = req.volume - td_available
             req_list.append(req_yd)
@@ -294,11 +568,9 @@ class PositionHolding:
             td_volume: int = self.long_td
             yd_available: int = self.long_yd - self.long_yd_frozen
 
-        close_yd_exchanges: Set[Exchange] = {Exchange.SHFE, Exchange.INE}
-
         # If there is td_volume, we can only lock position
-        if td_volume and self.exchange not in close_yd_exchanges:
-            req_open: OrderRequest = copy(req)
+        if td_volume and not self.close_yd:
+            req_open: OrderRequest = copy_request(req)
             req_open.offset = Offset.OPEN
             return [req_open]
         # If no td_volume, we close opposite yd position first
@@ -309,8 +581,8 @@ class PositionHolding:
             req_list: List[OrderRequest] = []
 
             if yd_available:
-                req_yd: OrderRequest = copy(req)
-                if self.exchange in close_yd_exchanges:
+                req_yd: OrderRequest = copy_request(req)
+                if self.close_yd:
                     req_yd.offset = Offset.CLOSEYESTERDAY
                 else:
                     req_yd.offset = Offset.CLOSE
@@ -318,7 +590,7 @@ class PositionHolding:
                 req_list.append(req_yd)
 
             if open_volume:
-                req_open: OrderRequest = copy(req)
+                req_open: OrderRequest = copy_request(req)
                 req_open.offset = Offset.OPEN
                 req_open.volume = open_volume
                 req_list.append(req_open)
@@ -337,7 +609,7 @@ class PositionHolding:
             yd_available: int = self.long_yd - self.long_yd_frozen
 
         # Split close order to close today/yesterday for SHFE/INE exchange
-        if req.exchange in {Exchange.SHFE, Exchange.INE}:
+        if self.close_yd:
             reqs: List[OrderRequest] = []
             volume_left: float = req.volume
 
@@ -345,7 +617,7 @@ class PositionHolding:
                 td_volume: int = min(td_available, volume_left)
                 volume_left -= td_volume
 
-                td_req: OrderRequest = copy(req)
+                td_req: OrderRequest = copy_request(req)
                 td_req.offset = Offset.CLOSETODAY
                 td_req.volume = td_volume
                 reqs.append(td_req)
@@ -354,7 +626,7 @@ class PositionHolding:
                 yd_volume: int = min(yd_available, volume_left)
                 volume_left -= yd_volume
 
-                yd_req: OrderRequest = copy(req)
+                yd_req: OrderRequest = copy_request(req)
                 yd_req.offset = Offset.CLOSEYESTERDAY
                 yd_req.volume = yd_volume
                 reqs.append(yd_req)
@@ -362,7 +634,7 @@ class PositionHolding:
             if volume_left > 0:
                 open_volume: int = volume_left
 
-                open_req: OrderRequest = copy(req)
+                open_req: OrderRequest = copy_request(req)
                 open_req.offset = Offset.OPEN
                 open_req.volume = open_volume
                 reqs.append(open_req)
@@ -377,7 +649,7 @@ class PositionHolding:
                 close_volume: int = min(pos_available, volume_left)
                 volume_left -= pos_available
 
-                close_req: OrderRequest = copy(req)
+                close_req: OrderRequest = copy_request(req)
                 close_req.offset = Offset.CLOSE
                 close_req.volume = close_volume
                 reqs.append(close_req)
@@ -385,7 +657,7 @@ class PositionHolding:
             if volume_left > 0:
                 open_volume: int = volume_left
 
-                open_req: OrderRequest = copy(req)
+                open_req: OrderRequest = copy_request(req)
                 open_req.offset = Offset.OPEN
                 open_req.volume = open_volume
                 reqs.append(open_req)
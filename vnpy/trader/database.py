@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from importlib import import_module
 
 from .constant import Interval, Exchange
-from .object import BarData, TickData
+from .object import BarData, TickData, BarBatch, TickBatch, BarSequence, TickSequence
 from .setting import SETTINGS
 from .utility import ZoneInfo
 from .locale import _
@@ -56,14 +56,14 @@ class BaseDatabase(ABC):
     """
 
     @abstractmethod
-    def save_bar_data(self, bars: List[BarData], stream: bool = False) -> bool:
+    def save_bar_data(self, bars: BarSequence, stream: bool = False) -> bool:
         """
         Save bar data into database.
         """
         pass
 
     @abstractmethod
-    def save_tick_data(self, ticks: List[TickData], stream: bool = False) -> bool:
+    def save_tick_data(self, ticks: TickSequence, stream: bool = False) -> bool:
         """
         Save tick data into database.
         """
@@ -96,6 +96,37 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def load_bar_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> BarBatch:
+        """
+        Load bar data from database as columnar batch.
+
+        Database drivers can override this to fill the batch directly.
+        """
+        bars: List[BarData] = self.load_bar_data(symbol, exchange, interval, start, end)
+        return BarBatch.from_list(bars, symbol=symbol, exchange=exchange, interval=interval)
+
+    def load_tick_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> TickBatch:
+        """
+        Load tick data from database as columnar batch.
+
+        Database drivers can override this to fill the batch directly.
+        """
+        ticks: List[TickData] = self.load_tick_data(symbol, exchange, start, end)
+        return TickBatch.from_list(ticks, symbol=symbol, exchange=exchange)
+
     @abstractmethod
     def delete_bar_data(
         self,
@@ -4,12 +4,14 @@ import smtplib
 import os
 import traceback
 from abc import ABC
+from collections import OrderedDict
+from datetime import datetime, timedelta
 from pathlib import Path
-from datetime import datetime
 from email.message import EmailMessage
 from queue import Empty, Queue
-from threading import Thread
-from typing import Any, Type, Dict, List, Optional
+from threading import Event as ThreadEvent, Lock, Thread
+from time import monotonic
+from typing import Any, Callable, Type, Dict, List, Optional, Tuple
 
 from vnpy.event import Event, EventEngine
 from .app import BaseApp
@@ -21,10 +23,12 @@ from .event import (
     EVENT_ACCOUNT,
     EVENT_CONTRACT,
     EVENT_LOG,
-    EVENT_QUOTE
+    EVENT_QUOTE,
+    EVENT_TIMER
 )
 from .gateway import BaseGateway
 from .object import (
+    BaseData,
     CancelRequest,
     LogData,
     OrderRequest,
@@ -33,7 +37,7 @@ from .object import (
     SubscribeRequest,
     HistoryRequest,
     OrderData,
-    BarData,
+    BarSequence,
     TickData,
     TradeData,
     PositionData,
@@ -42,8 +46,15 @@ from .object import (
     Exchange
 )
 from .setting import SETTINGS
-from .utility import get_folder_path, TRADER_DIR
+from .utility import (
+    get_folder_path,
+    TRADER_DIR,
+    BatchStreamHandler,
+    DailyFileHandler,
+    QueueLogListener
+)
 from .converter import OffsetConverter
+from .journal import JournalIndex, JournalWriter, is_journal_closed, read_journal
 from .locale import _
 
 
@@ -140,6 +151,7 @@ class MainEngine:
         """
         self.add_engine(LogEngine)
         self.add_engine(OmsEngine)
+        self.add_engine(JournalEngine)
         self.add_engine(EmailEngine)
 
     def write_log(self, msg: str, source: str = "") -> None:
@@ -229,6 +241,15 @@ class MainEngine:
         """
         return self.exchanges
 
+    def get_event_stats(self) -> Dict[str, Any]:
+        """
+        获取事件引擎的运行监控统计数据。
+
+        返回：
+        - Dict[str, Any]: 处理器耗时和事件排队统计，未启用监控时为空字典。
+        """
+        return self.event_engine.get_monitor_stats()
+
     def connect(self, setting: dict, gateway_name: str) -> None:
         """
         启动特定网关的连接。
@@ -323,7 +344,7 @@ class MainEngine:
         if gateway:
             gateway.cancel_quote(req)
 
-    def query_history(self, req: HistoryRequest, gateway_name: str) -> Optional[List[BarData]]:
+    def query_history(self, req: HistoryRequest, gateway_name: str) -> Optional[BarSequence]:
         """
         从特定网关查询历史K线数据。
 
@@ -332,7 +353,7 @@ class MainEngine:
         - gateway_name (str): 网关名称。
 
         返回：
-        - Optional[List[BarData]]: 历史K线数据列表，如果找不到网关则返回None。
+        - Optional[BarSequence]: 历史K线数据列表或BarBatch，如果找不到网关则返回None。
         """
         gateway: BaseGateway = self.get_gateway(gateway_name)
         if gateway:
@@ -411,6 +432,8 @@ class LogEngine(BaseEngine):
         """
         super(LogEngine, self).__init__(main_engine, event_engine, "log")
 
+        self.listener: Optional[QueueLogListener] = None
+
         if not SETTINGS["log.active"]:
             return
 
@@ -423,6 +446,11 @@ class LogEngine(BaseEngine):
             "%(asctime)s  %(levelname)s: %(message)s"
         )
 
+        # 异步模式下由后台线程写出日志，事件线程只负责放入有界队列
+        if SETTINGS["log.async"]:
+            self.listener = QueueLogListener(SETTINGS["log.queue_size"])
+            self.logger.addHandler(self.listener.queue_handler)
+
         self.add_null_handler()
 
         if SETTINGS["log.console"]:
@@ -431,6 +459,9 @@ class LogEngine(BaseEngine):
         if SETTINGS["log.file"]:
             self.add_file_handler()
 
+        if self.listener:
+            self.listener.start()
+
         self.register_event()
 
     def add_null_handler(self) -> None:
@@ -450,29 +481,50 @@ class LogEngine(BaseEngine):
         返回：
         - None
         """
-        console_handler: logging.StreamHandler = logging.StreamHandler()
+        console_handler: BatchStreamHandler = BatchStreamHandler(batch=bool(self.listener))
         console_handler.setLevel(self.level)
         console_handler.setFormatter(self.formatter)
-        self.logger.addHandler(console_handler)
+        self.add_handler(console_handler)
 
     def add_file_handler(self) -> None:
         """
-        添加文件输出日志。
+        添加文件输出日志，文件按日期命名，跨日后自动切换到新文件。
 
         返回：
         - None
         """
-        today_date: str = datetime.now().strftime("%Y%m%d")
-        filename: str = f"vt_{today_date}.log"
         log_path: Path = get_folder_path("log")
-        file_path: Path = log_path.joinpath(filename)
 
-        file_handler: logging.FileHandler = logging.FileHandler(
-            file_path, mode="a", encoding="utf8"
-        )
+        file_handler: DailyFileHandler = DailyFileHandler(log_path, "vt", batch=bool(self.listener))
         file_handler.setLevel(self.level)
         file_handler.setFormatter(self.formatter)
-        self.logger.addHandler(file_handler)
+        self.add_handler(file_handler)
+
+    def add_handler(self, handler: logging.Handler) -> None:
+        """
+        添加日志输出处理器，异步模式下由后台线程调用。
+
+        参数：
+        - handler (logging.Handler): 日志处理器。
+
+        返回：
+        - None
+        """
+        if self.listener:
+            self.listener.add_handler(handler)
+        else:
+            self.logger.addHandler(handler)
+
+    def get_dropped_count(self) -> int:
+        """
+        获取因队列已满而丢弃的日志数量。
+
+        返回：
+        - int: 丢弃的日志数量。
+        """
+        if self.listener:
+            return self.listener.queue_handler.dropped
+        return 0
 
     def register_event(self) -> None:
         """
@@ -496,6 +548,16 @@ class LogEngine(BaseEngine):
         log: LogData = event.data
         self.logger.log(log.level, log.msg)
 
+    def close(self) -> None:
+        """
+        关闭日志引擎，写出队列中剩余的日志。
+
+        返回：
+        - None
+        """
+        if self.listener:
+            self.listener.stop()
+
 
 class OmsEngine(BaseEngine):
     """
@@ -525,9 +587,46 @@ class OmsEngine(BaseEngine):
         self.active_orders: Dict[str, OrderData] = {}
         self.active_quotes: Dict[str, QuoteData] = {}
 
+        # 活跃订单和报价按合约、网关和订单备注建立的二级索引
+        self.symbol_active_orders: Dict[str, Dict[str, OrderData]] = {}
+        self.gateway_active_orders: Dict[str, Dict[str, OrderData]] = {}
+        self.reference_active_orders: Dict[str, Dict[str, OrderData]] = {}
+
+        self.symbol_active_quotes: Dict[str, Dict[str, QuoteData]] = {}
+        self.gateway_active_quotes: Dict[str, Dict[str, QuoteData]] = {}
+        self.reference_active_quotes: Dict[str, Dict[str, QuoteData]] = {}
+
         # 存储每个网关的OffsetConverter实例
         self.offset_converters: Dict[str, OffsetConverter] = {}
 
+        # 各数据字典的版本化快照，用于轮询查询
+        self.snapshots: Dict[str, SnapshotView] = {
+            name: SnapshotView(getattr(self, name))
+            for name in [
+                "ticks", "orders", "trades", "positions", "accounts",
+                "contracts", "quotes", "active_orders", "active_quotes"
+            ]
+        }
+
+        # 已结束的订单、报价和成交的保留策略，超出数量或时间的数据被移入归档文件
+        self.history_size: int = SETTINGS["oms.history_size"]
+        self.history_age: float = SETTINGS["oms.history_age"]
+
+        # 按结束时间排列的已结束数据，值为结束时的单调时钟时间
+        self.finished_orders: OrderedDict[str, float] = OrderedDict()
+        self.finished_quotes: OrderedDict[str, float] = OrderedDict()
+        self.finished_trades: OrderedDict[str, float] = OrderedDict()
+
+        # 每次运行使用单独的归档文件，被移除数据在文件中的位置记录在磁盘索引中用于查询
+        self.archive: Optional[JournalWriter] = None
+        self.archive_index: Optional[JournalIndex] = None
+
+        if (self.history_size or self.history_age) and SETTINGS["oms.history_archive"]:
+            start: str = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.archive_path: Path = get_folder_path("archive").joinpath(f"oms_{start}.vtj")
+            self.archive = JournalWriter(self.archive_path)
+            self.archive_index = JournalIndex(self.archive_path.with_suffix(".idx"))
+
         # 添加查询函数到主引擎
         self.add_function()
         # 注册事件处理器
@@ -554,9 +653,23 @@ class OmsEngine(BaseEngine):
         self.main_engine.get_all_quotes = self.get_all_quotes
         self.main_engine.get_all_active_orders = self.get_all_active_orders
         self.main_engine.get_all_active_quotes = self.get_all_active_quotes
+        self.main_engine.get_gateway_active_orders = self.get_gateway_active_orders
+        self.main_engine.get_gateway_active_quotes = self.get_gateway_active_quotes
+        self.main_engine.get_reference_active_orders = self.get_reference_active_orders
+        self.main_engine.get_reference_active_quotes = self.get_reference_active_quotes
+
+        self.main_engine.get_snapshot = self.get_snapshot
+        self.main_engine.get_changes = self.get_changes
+
+        self.main_engine.get_archived_order = self.get_archived_order
+        self.main_engine.get_archived_trade = self.get_archived_trade
+        self.main_engine.get_archived_quote = self.get_archived_quote
+        self.main_engine.get_all_archived_orders = self.get_all_archived_orders
+        self.main_engine.get_all_archived_trades = self.get_all_archived_trades
 
         self.main_engine.update_order_request = self.update_order_request
         self.main_engine.convert_order_request = self.convert_order_request
+        self.main_engine.convert_order_requests = self.convert_order_requests
         self.main_engine.get_converter = self.get_converter
 
     def register_event(self) -> None:
@@ -571,6 +684,9 @@ class OmsEngine(BaseEngine):
         self.event_engine.register(EVENT_CONTRACT, self.process_contract_event)
         self.event_engine.register(EVENT_QUOTE, self.process_quote_event)
 
+        if self.history_age:
+            self.event_engine.register(EVENT_TIMER, self.process_timer_event)
+
     def process_tick_event(self, event: Event) -> None:
         """
         处理市场行情事件。
@@ -580,6 +696,7 @@ class OmsEngine(BaseEngine):
         """
         tick: TickData = event.data
         self.ticks[tick.vt_symbol] = tick
+        self.snapshots["ticks"].changed(tick.vt_symbol)
 
     def process_order_event(self, event: Event) -> None:
         """
@@ -589,14 +706,31 @@ class OmsEngine(BaseEngine):
             event (Event): 包含OrderData的事件对象。
         """
         order: OrderData = event.data
-        self.orders[order.vt_orderid] = order
+        vt_orderid: str = order.vt_orderid
+        self.orders[vt_orderid] = order
+        self.snapshots["orders"].changed(vt_orderid)
+
+        # 先从索引中移除旧数据，以免更新后的订单备注与之前不同
+        old_order: Optional[OrderData] = self.active_orders.get(vt_orderid, None)
+        if old_order:
+            remove_from_index(self.symbol_active_orders, old_order.vt_symbol, vt_orderid)
+            remove_from_index(self.gateway_active_orders, old_order.gateway_name, vt_orderid)
+            remove_from_index(self.reference_active_orders, old_order.reference, vt_orderid)
 
         # 如果订单是活跃的，则更新字典中的数据
         if order.is_active():
-            self.active_orders[order.vt_orderid] = order
+            self.active_orders[vt_orderid] = order
+            self.snapshots["active_orders"].changed(vt_orderid)
+            add_to_index(self.symbol_active_orders, order.vt_symbol, vt_orderid, order)
+            add_to_index(self.gateway_active_orders, order.gateway_name, vt_orderid, order)
+            add_to_index(self.reference_active_orders, order.reference, vt_orderid, order)
         # 否则，从字典中移除不活跃的订单
-        elif order.vt_orderid in self.active_orders:
-            self.active_orders.pop(order.vt_orderid)
+        elif old_order:
+            self.active_orders.pop(vt_orderid)
+            self.snapshots["active_orders"].changed(vt_orderid)
+
+        if self.history_size or self.history_age:
+            self.update_finished("orders", self.finished_orders, vt_orderid, order.is_active())
 
         # 更新OffsetConverter中的订单数据
         converter: OffsetConverter = self.offset_converters.get(order.gateway_name, None)
@@ -612,6 +746,10 @@ class OmsEngine(BaseEngine):
         """
         trade: TradeData = event.data
         self.trades[trade.vt_tradeid] = trade
+        self.snapshots["trades"].changed(trade.vt_tradeid)
+
+        if self.history_size or self.history_age:
+            self.update_finished("trades", self.finished_trades, trade.vt_tradeid, False)
 
         # 更新OffsetConverter中的成交数据
         converter: OffsetConverter = self.offset_converters.get(trade.gateway_name, None)
@@ -627,6 +765,7 @@ class OmsEngine(BaseEngine):
         """
         position: PositionData = event.data
         self.positions[position.vt_positionid] = position
+        self.snapshots["positions"].changed(position.vt_positionid)
 
         # 更新OffsetConverter中的持仓数据
         converter: OffsetConverter = self.offset_converters.get(position.gateway_name, None)
@@ -642,6 +781,7 @@ class OmsEngine(BaseEngine):
         """
         account: AccountData = event.data
         self.accounts[account.vt_accountid] = account
+        self.snapshots["accounts"].changed(account.vt_accountid)
 
     def process_contract_event(self, event: Event) -> None:
         """
@@ -652,10 +792,14 @@ class OmsEngine(BaseEngine):
         """
         contract: ContractData = event.data
         self.contracts[contract.vt_symbol] = contract
+        self.snapshots["contracts"].changed(contract.vt_symbol)
 
-        # 初始化每个网关的OffsetConverter
-        if contract.gateway_name not in self.offset_converters:
+        # 初始化每个网关的OffsetConverter，并刷新合约的开平转换策略
+        converter: OffsetConverter = self.offset_converters.get(contract.gateway_name, None)
+        if not converter:
             self.offset_converters[contract.gateway_name] = OffsetConverter(self)
+        else:
+            converter.update_contract(contract)
 
     def process_quote_event(self, event: Event) -> None:
         """
@@ -665,14 +809,218 @@ class OmsEngine(BaseEngine):
             event (Event): 包含QuoteData的事件对象。
         """
         quote: QuoteData = event.data
-        self.quotes[quote.vt_quoteid] = quote
+        vt_quoteid: str = quote.vt_quoteid
+        self.quotes[vt_quoteid] = quote
+        self.snapshots["quotes"].changed(vt_quoteid)
+
+        old_quote: Optional[QuoteData] = self.active_quotes.get(vt_quoteid, None)
+        if old_quote:
+            remove_from_index(self.symbol_active_quotes, old_quote.vt_symbol, vt_quoteid)
+            remove_from_index(self.gateway_active_quotes, old_quote.gateway_name, vt_quoteid)
+            remove_from_index(self.reference_active_quotes, old_quote.reference, vt_quoteid)
 
         # 如果报价是活跃的，则更新字典中的数据
         if quote.is_active():
-            self.active_quotes[quote.vt_quoteid] = quote
+            self.active_quotes[vt_quoteid] = quote
+            self.snapshots["active_quotes"].changed(vt_quoteid)
+            add_to_index(self.symbol_active_quotes, quote.vt_symbol, vt_quoteid, quote)
+            add_to_index(self.gateway_active_quotes, quote.gateway_name, vt_quoteid, quote)
+            add_to_index(self.reference_active_quotes, quote.reference, vt_quoteid, quote)
         # 否则，从字典中移除不活跃的报价
-        elif quote.vt_quoteid in self.active_quotes:
-            self.active_quotes.pop(quote.vt_quoteid)
+        elif old_quote:
+            self.active_quotes.pop(vt_quoteid)
+            self.snapshots["active_quotes"].changed(vt_quoteid)
+
+        if self.history_size or self.history_age:
+            self.update_finished("quotes", self.finished_quotes, vt_quoteid, quote.is_active())
+
+    def process_timer_event(self, event: Event) -> None:
+        """
+        处理定时器事件，移除超过保留时间的已结束数据。
+
+        参数:
+            event (Event): 定时器事件对象。
+        """
+        deadline: float = monotonic() - self.history_age
+
+        self.evict_finished("orders", self.finished_orders, deadline)
+        self.evict_finished("quotes", self.finished_quotes, deadline)
+        self.evict_finished("trades", self.finished_trades, deadline)
+
+    def update_finished(
+        self,
+        name: str,
+        finished: "OrderedDict[str, float]",
+        vt_id: str,
+        active: bool
+    ) -> None:
+        """
+        记录数据是否已经结束，超出保留数量时移除最早结束的数据。
+
+        参数:
+            name (str): 数据字典名称，如orders。
+            finished (OrderedDict[str, float]): 已结束数据的结束时间。
+            vt_id (str): 数据标识符。
+            active (bool): 数据是否仍然活跃。
+        """
+        if active:
+            finished.pop(vt_id, None)
+            return
+        elif vt_id in finished:
+            return
+
+        finished[vt_id] = monotonic()
+
+        if self.history_size and len(finished) > self.history_size:
+            vt_id = finished.popitem(last=False)[0]
+            self.remove_data(name, vt_id)
+
+    def evict_finished(
+        self,
+        name: str,
+        finished: "OrderedDict[str, float]",
+        deadline: float
+    ) -> None:
+        """
+        移除在deadline之前结束的数据。
+        """
+        while finished:
+            vt_id, finish_time = next(iter(finished.items()))
+            if finish_time > deadline:
+                break
+
+            finished.popitem(last=False)
+            self.remove_data(name, vt_id)
+
+    def remove_data(self, name: str, vt_id: str) -> None:
+        """
+        从数据字典中移除数据并写入归档文件。
+        """
+        view: SnapshotView = self.snapshots[name]
+        data: Optional[BaseData] = view.data.pop(vt_id, None)
+
+        if data:
+            view.changed(vt_id)
+            self.archive_data(name, vt_id, data)
+
+    def archive_data(self, name: str, vt_id: str, data: BaseData) -> None:
+        """
+        将被移除的数据写入归档文件，并记录其位置。
+        """
+        if self.archive:
+            self.archive_index.set(name, vt_id, self.archive.write(data))
+
+    def read_archive(self, name: str, vt_id: str) -> Optional[BaseData]:
+        """
+        按位置从归档文件中读取单条数据。
+
+        参数:
+            name (str): 数据字典名称，如orders。
+            vt_id (str): 数据标识符。
+
+        返回:
+            Optional[BaseData]: 数据对象，如果不存在则返回None。
+        """
+        if not self.archive:
+            return None
+
+        offset: Optional[int] = self.archive_index.get(name, vt_id)
+        if offset is None:
+            return None
+        return self.archive.read(offset)
+
+    def read_all_archive(self, name: str) -> List[BaseData]:
+        """
+        读取某个数据字典被移入归档文件的全部数据。
+
+        参数:
+            name (str): 数据字典名称，如orders。
+        """
+        if not self.archive:
+            return []
+
+        offsets: List[int] = self.archive_index.get_all(name)
+        return [self.archive.read(offset) for offset in offsets]
+
+    def get_archived_order(self, vt_orderid: str) -> Optional[OrderData]:
+        """
+        从归档文件中查询已被移除的订单数据。
+
+        参数:
+            vt_orderid (str): 订单标识符。
+
+        返回:
+            Optional[OrderData]: 订单数据，如果不存在则返回None。
+        """
+        return self.read_archive("orders", vt_orderid)
+
+    def get_archived_trade(self, vt_tradeid: str) -> Optional[TradeData]:
+        """
+        从归档文件中查询已被移除的成交数据。
+
+        参数:
+            vt_tradeid (str): 成交标识符。
+
+        返回:
+            Optional[TradeData]: 成交数据，如果不存在则返回None。
+        """
+        return self.read_archive("trades", vt_tradeid)
+
+    def get_archived_quote(self, vt_quoteid: str) -> Optional[QuoteData]:
+        """
+        从归档文件中查询已被移除的报价数据。
+
+        参数:
+            vt_quoteid (str): 报价标识符。
+
+        返回:
+            Optional[QuoteData]: 报价数据，如果不存在则返回None。
+        """
+        return self.read_archive("quotes", vt_quoteid)
+
+    def get_all_archived_orders(self) -> List[OrderData]:
+        """
+        获取归档文件中的所有订单数据。
+
+        返回:
+            List[OrderData]: 订单数据列表。
+        """
+        return self.read_all_archive("orders")
+
+    def get_all_archived_trades(self) -> List[TradeData]:
+        """
+        获取归档文件中的所有成交数据。
+
+        返回:
+            List[TradeData]: 成交数据列表。
+        """
+        return self.read_all_archive("trades")
+
+    def get_snapshot(self, name: str) -> Tuple[int, Tuple[Any, ...]]:
+        """
+        获取数据字典的只读快照，只有数据在上次调用后发生变化时才会重新生成。
+
+        参数:
+            name (str): 数据字典名称，如orders、trades、positions、active_orders等。
+
+        返回:
+            Tuple[int, Tuple[Any, ...]]: 版本号和所有数据组成的元组。
+        """
+        return self.snapshots[name].get_snapshot()
+
+    def get_changes(self, name: str, version: int) -> Optional[Tuple[int, List[Any], List[str]]]:
+        """
+        获取数据字典在某个版本之后的变化。
+
+        参数:
+            name (str): 数据字典名称。
+            version (int): 上次查询得到的版本号。
+
+        返回:
+            Optional[Tuple[int, List[Any], List[str]]]: 最新版本号、更新的数据和被移除数据的键值，
+            如果该版本过旧、变化记录已被清理，则返回None，此时应重新获取完整快照。
+        """
+        return self.snapshots[name].get_changes(version)
 
     def get_tick(self, vt_symbol: str) -> Optional[TickData]:
         """
@@ -834,12 +1182,7 @@ class OmsEngine(BaseEngine):
         if not vt_symbol:
             return list(self.active_orders.values())
         else:
-            active_orders: List[OrderData] = [
-                order
-                for order in self.active_orders.values()
-                if order.vt_symbol == vt_symbol
-            ]
-            return active_orders
+            return list(self.symbol_active_orders.get(vt_symbol, {}).values())
 
     def get_all_active_quotes(self, vt_symbol: str = "") -> List[QuoteData]:
         """
@@ -854,12 +1197,55 @@ class OmsEngine(BaseEngine):
         if not vt_symbol:
             return list(self.active_quotes.values())
         else:
-            active_quotes: List[QuoteData] = [
-                quote
-                for quote in self.active_quotes.values()
-                if quote.vt_symbol == vt_symbol
-            ]
-            return active_quotes
+            return list(self.symbol_active_quotes.get(vt_symbol, {}).values())
+
+    def get_gateway_active_orders(self, gateway_name: str) -> List[OrderData]:
+        """
+        获取特定网关的所有活跃订单。
+
+        参数:
+            gateway_name (str): 网关名称。
+
+        返回:
+            List[OrderData]: 活跃订单数据列表。
+        """
+        return list(self.gateway_active_orders.get(gateway_name, {}).values())
+
+    def get_gateway_active_quotes(self, gateway_name: str) -> List[QuoteData]:
+        """
+        获取特定网关的所有活跃报价。
+
+        参数:
+            gateway_name (str): 网关名称。
+
+        返回:
+            List[QuoteData]: 活跃报价数据列表。
+        """
+        return list(self.gateway_active_quotes.get(gateway_name, {}).values())
+
+    def get_reference_active_orders(self, reference: str) -> List[OrderData]:
+        """
+        获取特定订单备注的所有活跃订单，通常用于查询某个策略的挂单。
+
+        参数:
+            reference (str): 订单备注。
+
+        返回:
+            List[OrderData]: 活跃订单数据列表。
+        """
+        return list(self.reference_active_orders.get(reference, {}).values())
+
+    def get_reference_active_quotes(self, reference: str) -> List[QuoteData]:
+        """
+        获取特定备注的所有活跃报价。
+
+        参数:
+            reference (str): 报价备注。
+
+        返回:
+            List[QuoteData]: 活跃报价数据列表。
+        """
+        return list(self.reference_active_quotes.get(reference, {}).values())
 
     def update_order_request(self, req: OrderRequest, vt_orderid: str, gateway_name: str) -> None:
         """
@@ -900,6 +1286,31 @@ class OmsEngine(BaseEngine):
         reqs: List[OrderRequest] = converter.convert_order_request(req, lock, net)
         return reqs
 
+    def convert_order_requests(
+        self,
+        reqs: List[OrderRequest],
+        gateway_name: str,
+        lock: bool,
+        net: bool = False
+    ) -> List[List[OrderRequest]]:
+        """
+        批量转换一篮子订单请求，如组合下单或价差交易的多条腿。
+
+        参数:
+            reqs (List[OrderRequest]): 订单请求对象列表。
+            gateway_name (str): 网关名称。
+            lock (bool): 是否锁定。
+            net (bool): 是否净头寸，默认为False。
+
+        返回:
+            List[List[OrderRequest]]: 与输入顺序对应的每个请求转换后的订单请求列表。
+        """
+        converter: OffsetConverter = self.offset_converters.get(gateway_name, None)
+        if not converter:
+            return [[req] for req in reqs]
+
+        return converter.convert_order_requests(reqs, lock, net)
+
     def get_converter(self, gateway_name: str) -> OffsetConverter:
         """
         获取特定网关的OffsetConverter对象。
@@ -912,6 +1323,134 @@ class OmsEngine(BaseEngine):
         """
         return self.offset_converters.get(gateway_name, None)
 
+    def close(self) -> None:
+        """
+        关闭OmsEngine，确保归档数据全部落盘。
+        """
+        if self.archive:
+            self.archive.close()
+            self.archive = None
+
+            self.archive_index.close()
+            self.archive_index = None
+
+
+class SnapshotView:
+    """
+    数据字典的版本化只读快照。
+
+    数据每次变化时版本号加一，并按版本顺序记录变化的键值。快照只在版本号
+    变化后才重新生成，轮询方也可以只查询某个版本之后发生变化的数据。
+    """
+
+    def __init__(self, data: Dict[str, Any], max_changes: int = 10000) -> None:
+        """
+        参数:
+            data (Dict[str, Any]): 数据字典。
+            max_changes (int): 除当前数据外最多保留的变化记录数量，主要是被移除的键值。
+        """
+        self.data: Dict[str, Any] = data
+        self.max_changes: int = max_changes
+
+        self.version: int = 0
+        self.min_version: int = 0
+        self.changes: OrderedDict[str, int] = OrderedDict()
+
+        # 版本号和数据元组作为一个整体发布，查询方不会读到不匹配的组合
+        self.snapshot: Tuple[int, Tuple[Any, ...]] = (-1, ())
+
+    def changed(self, key: str) -> None:
+        """
+        在数据字典中的key被更新或移除后调用，只能由事件引擎线程调用。
+        """
+        # 先记录变化再发布版本号，查询方读到的版本号之前的变化都已经记录
+        version: int = self.version + 1
+
+        changes: OrderedDict[str, int] = self.changes
+        changes[key] = version
+        changes.move_to_end(key)
+
+        self.version = version
+
+        # 清理最早的变化记录，更早版本的查询需要重新获取完整快照
+        if len(changes) > len(self.data) + self.max_changes:
+            _, self.min_version = changes.popitem(last=False)
+
+    def get_snapshot(self) -> Tuple[int, Tuple[Any, ...]]:
+        """
+        返回版本号和数据元组，可以在任意线程中调用。
+        """
+        snapshot: Tuple[int, Tuple[Any, ...]] = self.snapshot
+        if snapshot[0] == self.version:
+            return snapshot
+
+        while True:
+            version: int = self.version
+
+            # 复制期间数据字典被事件引擎线程修改时重新复制
+            try:
+                values: Tuple[Any, ...] = tuple(self.data.values())
+            except RuntimeError:
+                continue
+
+            snapshot = (version, values)
+            self.snapshot = snapshot
+            return snapshot
+
+    def get_changes(self, since: int) -> Optional[Tuple[int, List[Any], List[str]]]:
+        """
+        返回最新版本号、since之后更新的数据和被移除数据的键值，可以在任意线程中调用。
+        """
+        while True:
+            version: int = self.version
+            if since < self.min_version:
+                return None
+
+            updated: List[Any] = []
+            removed: List[str] = []
+
+            # 遍历期间变化记录被事件引擎线程修改时重新查询
+            try:
+                for key, key_version in reversed(self.changes.items()):
+                    if key_version <= since:
+                        break
+
+                    value: Any = self.data.get(key, None)
+                    if value is None:
+                        removed.append(key)
+                    else:
+                        updated.append(value)
+            except RuntimeError:
+                continue
+
+            updated.reverse()
+            removed.reverse()
+            return version, updated, removed
+
+
+def add_to_index(index: Dict[str, Dict[str, Any]], key: str, vt_id: str, data: Any) -> None:
+    """
+    将数据加入二级索引。
+    """
+    bucket: Optional[Dict[str, Any]] = index.get(key, None)
+    if bucket is None:
+        bucket = {}
+        index[key] = bucket
+    bucket[vt_id] = data
+
+
+def remove_from_index(index: Dict[str, Dict[str, Any]], key: str, vt_id: str) -> None:
+    """
+    将数据从二级索引中移除，空的分组会被一并删除。
+    """
+    bucket: Optional[Dict[str, Any]] = index.get(key, None)
+    if bucket is None:
+        return
+
+    bucket.pop(vt_id, None)
+    if not bucket:
+        del index[key]
+
 
 class EmailEngine(BaseEngine):
     """
@@ -1000,3 +1539,216 @@ class EmailEngine(BaseEngine):
 
         self.active = False
         self.thread.join()
+
+
+class JournalEngine(BaseEngine):
+    """
+    将订单、成交、持仓、账户和合约事件追加写入二进制日志文件，
+    并在启动时回放当前交易日的日志以恢复OmsEngine中的数据。
+
+    日志文件按交易日划分，journal.rollover_hour之后的数据（如期货夜盘）属于
+    下一个交易日，因此跨越午夜运行时仍写入同一个文件。到达切换时间时切换到
+    新文件，并先写入当前合约、账户、持仓和活动委托的快照，使新文件可以独立回放。
+    正常关闭的日志文件末尾带有结束标记，启动时如果当前交易日的日志还不存在，
+    而上一个日志文件未正常关闭（如切换前崩溃），则先回放上一个文件。
+    """
+
+    def __init__(self, main_engine: MainEngine, event_engine: EventEngine) -> None:
+        """
+        初始化JournalEngine实例。
+
+        参数:
+            main_engine (MainEngine): 主引擎实例。
+            event_engine (EventEngine): 事件引擎实例。
+        """
+        super(JournalEngine, self).__init__(main_engine, event_engine, "journal")
+
+        self.writer: Optional[JournalWriter] = None
+        self.lock: Lock = Lock()
+        self.thread: Optional[Thread] = None
+        self.stop_event: ThreadEvent = ThreadEvent()
+        self.interval: float = SETTINGS["journal.fsync_interval"]
+        self.rollover_hour: int = SETTINGS["journal.rollover_hour"]
+
+        if not SETTINGS["journal.active"]:
+            return
+
+        self.folder_path: Path = get_folder_path("journal")
+        self.path: Path = self.get_path(datetime.now())
+
+        # 当前交易日首次启动，且上一个日志未正常关闭时，先回放上一个日志
+        recovered: bool = False
+        if not self.path.exists():
+            previous: Optional[Path] = self.get_previous_path(self.path)
+            if previous and not is_journal_closed(previous):
+                recovered = bool(self.replay(previous))
+
+        # 先回放已有日志，再以追加方式继续写入
+        self.replay(self.path)
+        self.writer = JournalWriter(self.path)
+
+        if recovered:
+            self.write_checkpoint()
+
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+        self.register_event()
+
+    def register_event(self) -> None:
+        """
+        注册事件处理器。
+        """
+        for type in [EVENT_ORDER, EVENT_TRADE, EVENT_POSITION, EVENT_ACCOUNT, EVENT_CONTRACT]:
+            self.event_engine.register(type, self.process_event)
+
+        self.event_engine.register(EVENT_TIMER, self.process_timer_event)
+
+    def get_path(self, dt: datetime) -> Path:
+        """
+        获取时间所属交易日的日志文件路径。
+
+        参数:
+            dt (datetime): 当前时间。
+        """
+        if self.rollover_hour and dt.hour >= self.rollover_hour:
+            dt += timedelta(days=1)
+
+        return self.folder_path.joinpath(f"journal_{dt:%Y%m%d}.vtj")
+
+    def get_previous_path(self, path: Path) -> Optional[Path]:
+        """
+        获取早于指定日志文件的最近一个日志文件路径。
+
+        参数:
+            path (Path): 日志文件路径。
+        """
+        paths: List[Path] = sorted(
+            p for p in self.folder_path.glob("journal_*.vtj") if p.name < path.name
+        )
+        if paths:
+            return paths[-1]
+        return None
+
+    def process_timer_event(self, event: Event) -> None:
+        """
+        到达交易日切换时间后切换日志文件。
+
+        参数:
+            event (Event): 定时器事件。
+        """
+        path: Path = self.get_path(datetime.now())
+        if path != self.path:
+            self.rollover(path)
+
+    def rollover(self, path: Path) -> None:
+        """
+        切换到新的日志文件，写入当前数据快照后正常关闭旧文件。
+
+        参数:
+            path (Path): 新日志文件路径。
+        """
+        with self.lock:
+            writer: JournalWriter = self.writer
+
+            self.path = path
+            self.writer = JournalWriter(path)
+            self.write_checkpoint()
+
+            writer.write_end()
+            writer.close()
+
+        msg: str = _("交易日志切换到{}").format(path.name)
+        self.main_engine.write_log(msg, "JOURNAL")
+
+    def write_checkpoint(self) -> None:
+        """
+        将OmsEngine中当前的合约、账户、持仓和活动委托写入日志。
+        """
+        oms_engine: OmsEngine = self.main_engine.get_engine("oms")
+        if not oms_engine:
+            return
+
+        for data in oms_engine.get_all_contracts():
+            self.writer.write(data)
+        for data in oms_engine.get_all_accounts():
+            self.writer.write(data)
+        for data in oms_engine.get_all_positions():
+            self.writer.write(data)
+        for data in oms_engine.get_all_active_orders():
+            self.writer.write(data)
+
+    def process_event(self, event: Event) -> None:
+        """
+        将事件数据写入日志缓冲区。
+
+        参数:
+            event (Event): 订单、成交、持仓、账户或合约事件。
+        """
+        self.writer.write(event.data)
+
+    def replay(self, path: Path) -> int:
+        """
+        回放日志文件，将其中的数据依次交给OmsEngine处理，返回回放的记录数量。
+
+        文件末尾不完整或校验失败的记录（进程崩溃时写入了一半）会被截断，
+        无法解码的记录只会被跳过，文件内容保持不变。
+
+        参数:
+            path (Path): 日志文件路径。
+        """
+        records, size, skipped = read_journal(path)
+
+        if path.exists() and path.stat().st_size > size:
+            with open(path, "r+b") as f:
+                f.truncate(size)
+
+        if skipped:
+            msg: str = _("交易日志中有{}条记录无法解码，已跳过").format(skipped)
+            self.main_engine.write_log(msg, "JOURNAL")
+
+        oms_engine: OmsEngine = self.main_engine.get_engine("oms")
+        if not oms_engine:
+            return 0
+
+        processors: Dict[str, Callable[[Event], None]] = {
+            EVENT_ORDER: oms_engine.process_order_event,
+            EVENT_TRADE: oms_engine.process_trade_event,
+            EVENT_POSITION: oms_engine.process_position_event,
+            EVENT_ACCOUNT: oms_engine.process_account_event,
+            EVENT_CONTRACT: oms_engine.process_contract_event,
+        }
+
+        # 直接调用OmsEngine的处理函数，回放的数据不会再次写入日志
+        for type, data in records:
+            processor: Optional[Callable[[Event], None]] = processors.get(type, None)
+            if processor:
+                processor(Event(type, data))
+
+        if records:
+            msg: str = _("回放交易日志{}条记录").format(len(records))
+            self.main_engine.write_log(msg, "JOURNAL")
+
+        return len(records)
+
+    def run(self) -> None:
+        """
+        定期将日志缓冲区写入磁盘。
+        """
+        while not self.stop_event.wait(self.interval):
+            with self.lock:
+                self.writer.sync()
+
+    def close(self) -> None:
+        """
+        关闭日志引擎，确保缓冲区中的数据全部落盘。
+        """
+        if not self.writer:
+            return
+
+        self.stop_event.set()
+        self.thread.join()
+
+        self.writer.write_end()
+        self.writer.close()
+        self.writer = None
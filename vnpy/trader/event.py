@@ -2,7 +2,7 @@
 Event type string used in the trading platform.
 """
 
-from vnpy.event import EVENT_TIMER  # noqa
+from vnpy.event import EVENT_TIMER, EVENT_MONITOR  # noqa
 
 EVENT_TICK = "eTick."
 EVENT_TRADE = "eTrade."
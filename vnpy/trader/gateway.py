@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Callable
 from copy import copy
+from threading import get_ident
 
 from vnpy.event import Event, EventEngine
 from .event import (
@@ -28,7 +30,7 @@ from .object import (
     HistoryRequest,
     QuoteRequest,
     Exchange,
-    BarData
+    BarSequence
 )
 
 
@@ -85,6 +87,9 @@ class BaseGateway(ABC):
         self.event_engine: EventEngine = event_engine
         self.gateway_name: str = gateway_name
 
+        # Thread id of the last on_tick caller, bound as producer of the event queue
+        self.tick_thread_id: int = 0
+
     def on_event(self, type: str, data: Any = None) -> None:
         """
         General event push.
@@ -96,7 +101,15 @@ class BaseGateway(ABC):
         """
         Tick event push.
         Tick event of a specific vt_symbol is also pushed.
+
+        The calling thread is bound as producer of a single-producer event
+        queue the first time it pushes a tick.
         """
+        thread_id: int = get_ident()
+        if thread_id != self.tick_thread_id:
+            self.tick_thread_id = thread_id
+            self.event_engine.bind_producer(owner=self)
+
         self.on_event(EVENT_TICK, tick)
         self.on_event(EVENT_TICK + tick.vt_symbol, tick)
 
@@ -261,7 +274,7 @@ class BaseGateway(ABC):
         """
         pass
 
-    def query_history(self, req: HistoryRequest) -> List[BarData]:
+    def query_history(self, req: HistoryRequest) -> BarSequence:
         """
         Query bar history data.
         """
@@ -279,8 +292,21 @@ class LocalOrderManager:
     Management tool to support use local order id for trading.
     """
 
-    def __init__(self, gateway: BaseGateway, order_prefix: str = "") -> None:
-        """"""
+    def __init__(
+        self,
+        gateway: BaseGateway,
+        order_prefix: str = "",
+        history_size: int = 0,
+        orderid_map_size: Optional[int] = None
+    ) -> None:
+        """
+        history_size is the max number of finished orders kept, 0 for no
+        limit. Orderid maps of removed orders are kept longer, so that late
+        push data of a removed order still resolves to its original local
+        orderid instead of a new one. orderid_map_size is the max number of
+        removed orders whose maps are kept, None for 100 times history_size
+        and 0 for no limit.
+        """
         self.gateway: BaseGateway = gateway
 
         # For generating local orderid
@@ -288,6 +314,16 @@ class LocalOrderManager:
         self.order_count: int = 0
         self.orders: Dict[str, OrderData] = {}        # local_orderid: order
 
+        # Finished orders in finish sequence, the oldest ones are removed
+        self.history_size: int = history_size
+        self.finished_orderids: OrderedDict[str, None] = OrderedDict()
+
+        # Removed orders in remove sequence, the oldest ones' orderid maps are removed
+        if orderid_map_size is None:
+            orderid_map_size = history_size * 100
+        self.orderid_map_size: int = orderid_map_size
+        self.removed_orderids: OrderedDict[str, None] = OrderedDict()
+
         # Map between local and system orderid
         self.local_sys_orderid_map: Dict[str, str] = {}
         self.sys_local_orderid_map: Dict[str, str] = {}
@@ -367,9 +403,13 @@ class LocalOrderManager:
         else:
             return self.get_order_with_local_orderid(local_orderid)
 
-    def get_order_with_local_orderid(self, local_orderid: str) -> OrderData:
-        """"""
-        order: OrderData = self.orders[local_orderid]
+    def get_order_with_local_orderid(self, local_orderid: str) -> Optional[OrderData]:
+        """
+        Return None if the order is unknown or already removed from history.
+        """
+        order: Optional[OrderData] = self.orders.get(local_orderid, None)
+        if not order:
+            return None
         return copy(order)
 
     def on_order(self, order: OrderData) -> None:
@@ -377,8 +417,58 @@ class LocalOrderManager:
         Keep an order buf before pushing it to gateway.
         """
         self.orders[order.orderid] = copy(order)
+
+        if self.history_size:
+            self.update_finished(order)
+
         self.gateway.on_order(order)
 
+    def update_finished(self, order: OrderData) -> None:
+        """
+        Remove the oldest finished orders exceeding history size.
+        """
+        if order.is_active():
+            self.finished_orderids.pop(order.orderid, None)
+            return
+        elif order.orderid in self.finished_orderids:
+            return
+
+        self.finished_orderids[order.orderid] = None
+
+        if len(self.finished_orderids) > self.history_size:
+            local_orderid: str = self.finished_orderids.popitem(last=False)[0]
+            self.remove_order(local_orderid)
+
+    def remove_order(self, local_orderid: str) -> None:
+        """
+        Remove order data, its orderid map is kept until exceeding
+        orderid_map_size.
+        """
+        self.orders.pop(local_orderid, None)
+        self.cancel_request_buf.pop(local_orderid, None)
+
+        sys_orderid: str = self.local_sys_orderid_map.get(local_orderid, "")
+        if sys_orderid:
+            self.push_data_buf.pop(sys_orderid, None)
+
+        if not self.orderid_map_size:
+            return
+
+        self.removed_orderids[local_orderid] = None
+
+        if len(self.removed_orderids) > self.orderid_map_size:
+            oldest_orderid: str = self.removed_orderids.popitem(last=False)[0]
+            self.remove_orderid_map(oldest_orderid)
+
+    def remove_orderid_map(self, local_orderid: str) -> None:
+        """
+        Remove orderid map of a removed order, later push data of the order
+        is no longer matched.
+        """
+        sys_orderid: Optional[str] = self.local_sys_orderid_map.pop(local_orderid, None)
+        if sys_orderid:
+            self.sys_local_orderid_map.pop(sys_orderid, None)
+
     def cancel_order(self, req: CancelRequest) -> None:
         """"""
         sys_orderid: str = self.get_sys_orderid(req.orderid)
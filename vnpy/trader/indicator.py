@@ -0,0 +1,380 @@
+"""
+Incremental technical indicators.
+
+Each indicator keeps only the state required for the next value, so that
+update_bar costs O(1) instead of recalculating talib over the whole window.
+The values follow talib's algorithms (seeding and smoothing), and are equal
+to talib calculated on the complete bar series. Recursive indicators (EMA,
+MACD, RSI, ATR) calculated by ArrayManager are seeded at the start of its
+window instead, so the two converge but may differ slightly.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from math import nan, sqrt
+from typing import Any, Deque, Optional, Tuple
+
+from .object import BarData
+
+
+class Indicator(ABC):
+    """
+    Base class of incremental indicator.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.count: int = 0
+        self.value: Any = nan
+
+    def update_bar(self, bar: BarData) -> Any:
+        """
+        Update new bar data and return latest indicator value.
+        """
+        self.count += 1
+        self.value = self.update(bar)
+        return self.value
+
+    @abstractmethod
+    def update(self, bar: BarData) -> Any:
+        """
+        Calculate indicator value with new bar data, implemented by subclass.
+        """
+        pass
+
+    @property
+    def inited(self) -> bool:
+        """
+        Whether the indicator value is available.
+        """
+        value: Any = self.value
+        if isinstance(value, tuple):
+            value = value[0]
+        return value == value
+
+
+class RollingWindow:
+    """
+    Fixed length window with running sum and sum of squares.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        self.n: int = n
+        self.values: Deque[float] = deque(maxlen=n)
+        self.total: float = 0
+        self.total_square: float = 0
+        self.updates: int = 0
+
+    def append(self, value: float) -> None:
+        """"""
+        values: Deque[float] = self.values
+
+        if len(values) == self.n:
+            old: float = values[0]
+            self.total -= old
+            self.total_square -= old * old
+
+        values.append(value)
+        self.total += value
+        self.total_square += value * value
+
+        # Recalculate sums periodically to stop floating point drift
+        self.updates += 1
+        if self.updates == self.n * 64:
+            self.updates = 0
+            self.total = 0
+            self.total_square = 0
+            for v in values:
+                self.total += v
+                self.total_square += v * v
+
+    @property
+    def full(self) -> bool:
+        """"""
+        return len(self.values) == self.n
+
+    @property
+    def mean(self) -> float:
+        """"""
+        return self.total / self.n
+
+    @property
+    def std(self) -> float:
+        """
+        Population standard deviation, same as talib.STDDEV.
+        """
+        mean: float = self.total / self.n
+        variance: float = self.total_square / self.n - mean * mean
+        if variance > 0:
+            return sqrt(variance)
+        return 0
+
+
+class Ema:
+    """
+    Exponential moving average seeded with simple average, same as talib.EMA.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        self.n: int = n
+        self.k: float = 2 / (n + 1)
+        self.count: int = 0
+        self.total: float = 0
+        self.value: float = nan
+
+    def update(self, value: float) -> float:
+        """"""
+        self.count += 1
+
+        if self.count < self.n:
+            self.total += value
+        elif self.count == self.n:
+            self.total += value
+            self.value = self.total / self.n
+        else:
+            self.value = (value - self.value) * self.k + self.value
+
+        return self.value
+
+
+class SmaIndicator(Indicator):
+    """
+    Simple moving average of close price.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__()
+        self.window: RollingWindow = RollingWindow(n)
+
+    def update(self, bar: BarData) -> float:
+        """"""
+        self.window.append(bar.close_price)
+
+        if not self.window.full:
+            return nan
+        return self.window.mean
+
+
+class EmaIndicator(Indicator):
+    """
+    Exponential moving average of close price.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__()
+        self.ema: Ema = Ema(n)
+
+    def update(self, bar: BarData) -> float:
+        """"""
+        return self.ema.update(bar.close_price)
+
+
+class AtrIndicator(Indicator):
+    """
+    Average True Range with Wilder smoothing.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__()
+        self.n: int = n
+        self.pre_close: Optional[float] = None
+        self.total: float = 0
+        self.atr: float = nan
+
+    def update(self, bar: BarData) -> float:
+        """"""
+        pre_close: Optional[float] = self.pre_close
+        self.pre_close = bar.close_price
+
+        # The first bar has no true range
+        if pre_close is None:
+            return nan
+
+        tr: float = max(bar.high_price, pre_close) - min(bar.low_price, pre_close)
+        n: int = self.n
+        count: int = self.count - 1
+
+        if count < n:
+            self.total += tr
+        elif count == n:
+            self.total += tr
+            self.atr = self.total / n
+        else:
+            self.atr = (self.atr * (n - 1) + tr) / n
+
+        return self.atr
+
+
+class RsiIndicator(Indicator):
+    """
+    Relative Strength Index with Wilder smoothing.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__()
+        self.n: int = n
+        self.pre_close: Optional[float] = None
+        self.gain: float = 0
+        self.loss: float = 0
+
+    def update(self, bar: BarData) -> float:
+        """"""
+        pre_close: Optional[float] = self.pre_close
+        self.pre_close = bar.close_price
+
+        if pre_close is None:
+            return nan
+
+        change: float = bar.close_price - pre_close
+        n: int = self.n
+        count: int = self.count - 1
+
+        if count <= n:
+            if change < 0:
+                self.loss -= change
+            else:
+                self.gain += change
+
+            if count < n:
+                return nan
+
+            self.gain /= n
+            self.loss /= n
+        else:
+            self.gain *= (n - 1)
+            self.loss *= (n - 1)
+
+            if change < 0:
+                self.loss -= change
+            else:
+                self.gain += change
+
+            self.gain /= n
+            self.loss /= n
+
+        total: float = self.gain + self.loss
+        if -0.00000000000001 < total < 0.00000000000001:
+            return 0
+        return 100 * (self.gain / total)
+
+
+class MacdIndicator(Indicator):
+    """
+    MACD of close price, value is tuple of (macd, signal, hist).
+    """
+
+    def __init__(self, fast_period: int, slow_period: int, signal_period: int) -> None:
+        """"""
+        super().__init__()
+        if slow_period < fast_period:
+            fast_period, slow_period = slow_period, fast_period
+
+        self.fast_period: int = fast_period
+        self.slow_period: int = slow_period
+
+        # Fast EMA is seeded with the last fast_period closes before slow EMA starts
+        self.closes: Deque[float] = deque(maxlen=slow_period)
+        self.fast_ema: Ema = Ema(fast_period)
+        self.slow_ema: Ema = Ema(slow_period)
+        self.signal_ema: Ema = Ema(signal_period)
+
+        self.value = (nan, nan, nan)
+
+    def update(self, bar: BarData) -> Tuple[float, float, float]:
+        """"""
+        close_price: float = bar.close_price
+
+        if self.count <= self.slow_period:
+            self.closes.append(close_price)
+            if self.count < self.slow_period:
+                return (nan, nan, nan)
+
+            skip: int = self.slow_period - self.fast_period
+            for i, value in enumerate(self.closes):
+                self.slow_ema.update(value)
+                if i >= skip:
+                    self.fast_ema.update(value)
+            self.closes.clear()
+        else:
+            self.fast_ema.update(close_price)
+            self.slow_ema.update(close_price)
+
+        macd: float = self.fast_ema.value - self.slow_ema.value
+        signal: float = self.signal_ema.update(macd)
+
+        if signal != signal:
+            return (nan, nan, nan)
+        return (macd, signal, macd - signal)
+
+
+class BollIndicator(Indicator):
+    """
+    Bollinger Channel of close price, value is tuple of (up, down).
+    """
+
+    def __init__(self, n: int, dev: float) -> None:
+        """"""
+        super().__init__()
+        self.dev: float = dev
+        self.window: RollingWindow = RollingWindow(n)
+
+        self.value = (nan, nan)
+
+    def update(self, bar: BarData) -> Tuple[float, float]:
+        """"""
+        window: RollingWindow = self.window
+        window.append(bar.close_price)
+
+        if not window.full:
+            return (nan, nan)
+
+        mid: float = window.mean
+        std: float = window.std
+        return (mid + std * self.dev, mid - std * self.dev)
+
+
+class DonchianIndicator(Indicator):
+    """
+    Donchian Channel, value is tuple of (up, down).
+
+    Highest high and lowest low are maintained with monotonic queues.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__()
+        self.n: int = n
+        self.highs: Deque[Tuple[int, float]] = deque()
+        self.lows: Deque[Tuple[int, float]] = deque()
+
+        self.value = (nan, nan)
+
+    def update(self, bar: BarData) -> Tuple[float, float]:
+        """"""
+        count: int = self.count
+        highs: Deque[Tuple[int, float]] = self.highs
+        lows: Deque[Tuple[int, float]] = self.lows
+
+        while highs and highs[-1][1] <= bar.high_price:
+            highs.pop()
+        highs.append((count, bar.high_price))
+
+        while lows and lows[-1][1] >= bar.low_price:
+            lows.pop()
+        lows.append((count, bar.low_price))
+
+        start: int = count - self.n
+        if highs[0][0] <= start:
+            highs.popleft()
+        if lows[0][0] <= start:
+            lows.popleft()
+
+        if count < self.n:
+            return (nan, nan)
+        return (highs[0][1], lows[0][1])
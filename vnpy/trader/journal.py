@@ -0,0 +1,418 @@
+"""
+Binary journal of trading events for crash recovery and replay.
+"""
+
+import gc
+import marshal
+import os
+import pickle
+import sqlite3
+from dataclasses import Field, fields
+from datetime import datetime, timedelta, timezone, tzinfo
+from enum import Enum
+from pathlib import Path
+from struct import Struct
+from threading import Lock
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Type
+from zlib import crc32
+
+from .event import (
+    EVENT_ORDER,
+    EVENT_TRADE,
+    EVENT_POSITION,
+    EVENT_ACCOUNT,
+    EVENT_CONTRACT,
+    EVENT_QUOTE
+)
+from .object import BaseData, OrderData, TradeData, PositionData, AccountData, ContractData, QuoteData
+
+
+# 每条记录的帧头：负载长度、记录类型、负载的CRC32校验值
+FRAME_HEADER: Struct = Struct("<IBI")
+
+# 记录类型中表示负载使用pickle序列化的标志位
+PICKLE_FLAG: int = 0x80
+
+# 时区定义记录的类型
+TZ_CODE: int = 0
+
+# 日志文件正常关闭时写入的结束标记记录的类型
+END_CODE: int = 0x7F
+
+# 数据记录的类型编号，写入文件后不可修改
+JOURNAL_TYPES: Dict[int, Tuple[str, Type[BaseData]]] = {
+    1: (EVENT_ORDER, OrderData),
+    2: (EVENT_TRADE, TradeData),
+    3: (EVENT_POSITION, PositionData),
+    4: (EVENT_ACCOUNT, AccountData),
+    5: (EVENT_CONTRACT, ContractData),
+    6: (EVENT_QUOTE, QuoteData),
+}
+
+NAIVE_EPOCH: datetime = datetime(1970, 1, 1)
+UTC_EPOCH: datetime = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND: timedelta = timedelta(microseconds=1)
+
+
+class RecordCodec:
+    """
+    数据对象与二进制负载之间的转换。
+
+    负载是dataclass初始化字段的值组成的元组，枚举转换为其取值，时间转换为
+    (微秒时间戳, 时区编号)元组，再用marshal序列化，比直接pickle对象更紧凑，
+    解码也更快。包含marshal无法处理的字段值时退回使用pickle。
+    """
+
+    def __init__(self, code: int, data_class: Type[BaseData]) -> None:
+        """"""
+        self.code: int = code
+        self.data_class: Type[BaseData] = data_class
+
+        init_fields: List[Field] = [f for f in fields(data_class) if f.init]
+        self.names: List[str] = [f.name for f in init_fields]
+        self.enums: List[Tuple[int, Dict[Any, Enum]]] = [
+            (i, {member.value: member for member in f.type})
+            for i, f in enumerate(init_fields)
+            if isinstance(f.type, type) and issubclass(f.type, Enum)
+        ]
+
+        # 名为datetime的字段注解会被其默认值覆盖，因此同时按名称识别
+        self.datetimes: List[int] = [
+            i for i, f in enumerate(init_fields)
+            if f.type is datetime or f.name == "datetime"
+        ]
+
+    def encode(self, data: BaseData, get_tz_id: Callable[[tzinfo], int]) -> Tuple[int, bytes]:
+        """
+        返回记录类型和负载，get_tz_id用于获取时区对应的编号。
+        """
+        values: list = [getattr(data, name) for name in self.names]
+
+        for i, _members in self.enums:
+            value: Any = values[i]
+            if value is not None:
+                values[i] = value.value
+
+        for i in self.datetimes:
+            value = values[i]
+            if value is not None:
+                tz: Optional[tzinfo] = value.tzinfo
+                if tz is None:
+                    values[i] = ((value - NAIVE_EPOCH) // MICROSECOND, -1)
+                else:
+                    values[i] = ((value - UTC_EPOCH) // MICROSECOND, get_tz_id(tz))
+
+        try:
+            return self.code, marshal.dumps(tuple(values))
+        except ValueError:
+            return self.code | PICKLE_FLAG, pickle.dumps(tuple(values), pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, payload: bytes, pickled: bool, tzs: Dict[int, tzinfo]) -> BaseData:
+        """
+        解码负载，tzs为时区编号到时区对象的映射。
+        """
+        if pickled:
+            values: list = list(pickle.loads(payload))
+        else:
+            values = list(marshal.loads(payload))
+
+        for i, members in self.enums:
+            value: Any = values[i]
+            if value is not None:
+                values[i] = members[value]
+
+        for i in self.datetimes:
+            value = values[i]
+            if value is not None:
+                microseconds, tz_id = value
+                if tz_id < 0:
+                    values[i] = NAIVE_EPOCH + timedelta(microseconds=microseconds)
+                else:
+                    dt: datetime = UTC_EPOCH + timedelta(microseconds=microseconds)
+                    values[i] = dt.astimezone(tzs[tz_id])
+
+        return self.data_class(*values)
+
+
+CODECS: Dict[Type[BaseData], RecordCodec] = {
+    data_class: RecordCodec(code, data_class)
+    for code, (_type, data_class) in JOURNAL_TYPES.items()
+}
+DECODERS: Dict[int, RecordCodec] = {codec.code: codec for codec in CODECS.values()}
+
+
+class JournalWriter:
+    """
+    以追加方式写入日志文件，write只写入缓冲区，由sync负责落盘。
+
+    时区对象在首次出现时以单独的记录写入，之后的时间字段只保存其编号。
+
+    write返回记录在文件中的位置，可以用read按位置读取本次写入的记录。
+    """
+
+    def __init__(self, path: Path) -> None:
+        """"""
+        self.path: Path = path
+        self.file: BinaryIO = open(path, "ab")
+        self.reader: Optional[BinaryIO] = None
+        self.lock: Lock = Lock()
+
+        self.tz_ids: Dict[tzinfo, int] = {}
+        self.tzs: Dict[int, tzinfo] = {}
+
+        self.offset: int = os.fstat(self.file.fileno()).st_size
+        self.dirty: bool = False
+
+    def write(self, data: BaseData) -> int:
+        """
+        写入一条记录，返回记录的位置。
+        """
+        code, payload = CODECS[type(data)].encode(data, self.get_tz_id)
+        return self.write_frame(code, payload)
+
+    def write_frame(self, code: int, payload: bytes) -> int:
+        """"""
+        frame: bytes = FRAME_HEADER.pack(len(payload), code, crc32(payload)) + payload
+
+        with self.lock:
+            offset: int = self.offset
+            self.file.write(frame)
+            self.offset += len(frame)
+            self.dirty = True
+
+        return offset
+
+    def read(self, offset: int) -> BaseData:
+        """
+        读取本次写入的某条记录，offset为write返回的位置。
+        """
+        with self.lock:
+            if self.dirty:
+                self.file.flush()
+
+            if not self.reader:
+                self.reader = open(self.path, "rb")
+
+            self.reader.seek(offset)
+            length, code, _checksum = FRAME_HEADER.unpack(self.reader.read(FRAME_HEADER.size))
+            payload: bytes = self.reader.read(length)
+
+        codec: RecordCodec = DECODERS[code & ~PICKLE_FLAG]
+        return codec.decode(payload, bool(code & PICKLE_FLAG), self.tzs)
+
+    def get_tz_id(self, tz: tzinfo) -> int:
+        """
+        获取时区编号，新的时区会先写入一条时区记录。
+        """
+        tz_id: Optional[int] = self.tz_ids.get(tz, None)
+
+        if tz_id is None:
+            with self.lock:
+                tz_id = self.tz_ids.get(tz, None)
+                if tz_id is None:
+                    tz_id = len(self.tz_ids)
+                    payload: bytes = pickle.dumps((tz_id, tz), pickle.HIGHEST_PROTOCOL)
+                    frame: bytes = FRAME_HEADER.pack(len(payload), TZ_CODE, crc32(payload)) + payload
+                    self.file.write(frame)
+                    self.offset += len(frame)
+                    self.tz_ids[tz] = tz_id
+                    self.tzs[tz_id] = tz
+
+        return tz_id
+
+    def write_end(self) -> None:
+        """
+        写入结束标记，表示日志文件已正常关闭。
+        """
+        self.write_frame(END_CODE, b"")
+
+    def sync(self) -> None:
+        """
+        将缓冲区内容写入文件，并调用fsync确保落盘。
+        """
+        with self.lock:
+            if not self.dirty:
+                return
+            self.file.flush()
+            self.dirty = False
+
+        os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        """"""
+        self.sync()
+        self.file.close()
+
+        if self.reader:
+            self.reader.close()
+            self.reader = None
+
+
+class JournalIndex:
+    """
+    日志记录的磁盘索引，按(数据字典名称, 数据标识符)保存记录在日志文件中的位置。
+
+    索引保存在SQLite文件中，内存占用不随记录数量增长。写入的索引在同一连接中
+    立即可查，每写入commit_size条提交一次，关闭时提交剩余部分。
+    """
+
+    commit_size: int = 1000
+
+    def __init__(self, path: Path) -> None:
+        """"""
+        self.path: Path = path
+        self.lock: Lock = Lock()
+        self.pending: int = 0
+
+        self.connection: sqlite3.Connection = sqlite3.connect(str(path), check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=OFF")
+        self.connection.execute("PRAGMA synchronous=OFF")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS journal_index ("
+            "name TEXT, vt_id TEXT, offset INTEGER, PRIMARY KEY (name, vt_id)"
+            ") WITHOUT ROWID"
+        )
+
+    def set(self, name: str, vt_id: str, offset: int) -> None:
+        """
+        记录数据的位置，已有的位置会被替换。
+        """
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO journal_index VALUES (?, ?, ?)",
+                (name, vt_id, offset)
+            )
+
+            self.pending += 1
+            if self.pending >= self.commit_size:
+                self.connection.commit()
+                self.pending = 0
+
+    def get(self, name: str, vt_id: str) -> Optional[int]:
+        """
+        查询数据的位置，不存在时返回None。
+        """
+        with self.lock:
+            row: Optional[tuple] = self.connection.execute(
+                "SELECT offset FROM journal_index WHERE name = ? AND vt_id = ?",
+                (name, vt_id)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return row[0]
+
+    def get_all(self, name: str) -> List[int]:
+        """
+        按写入顺序返回某个数据字典的全部位置。
+        """
+        with self.lock:
+            rows: List[tuple] = self.connection.execute(
+                "SELECT offset FROM journal_index WHERE name = ? ORDER BY offset",
+                (name,)
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        """"""
+        with self.lock:
+            self.connection.commit()
+            self.connection.close()
+
+
+def read_journal(path: Path, data_class: type = None) -> Tuple[List[Tuple[str, BaseData]], int, int]:
+    """
+    读取日志文件，返回(事件类型, 数据对象)列表、有效数据的长度和跳过的记录数量。
+
+    传入data_class时只解码该类型的记录。
+
+    遇到不完整或校验失败的记录（如进程崩溃时写入了一半）即停止读取，
+    该位置之后的内容应被截断。校验通过但无法识别或解码的记录（如数据类
+    增加了字段）会被跳过并计入跳过数量，不影响之后的记录。
+    """
+    if not path.exists():
+        return [], 0, 0
+
+    with open(path, "rb") as f:
+        buffer: bytes = f.read()
+
+    records: List[Tuple[str, BaseData]] = []
+    tzs: Dict[int, tzinfo] = {}
+    size: int = 0
+    skipped: int = 0
+
+    # 解码期间会创建大量对象，暂停垃圾回收以避免反复扫描
+    gc_enabled: bool = gc.isenabled()
+    gc.disable()
+
+    try:
+        for code, payload, end in iter_frames(buffer):
+            size = end
+
+            if code == TZ_CODE:
+                tz_id, tz = pickle.loads(payload)
+                tzs[tz_id] = tz
+                continue
+            elif code == END_CODE:
+                continue
+
+            codec: RecordCodec = DECODERS.get(code & ~PICKLE_FLAG, None)
+            if not codec:
+                skipped += 1
+                continue
+            elif data_class and codec.data_class is not data_class:
+                continue
+
+            try:
+                data: BaseData = codec.decode(payload, bool(code & PICKLE_FLAG), tzs)
+            except Exception:
+                skipped += 1
+                continue
+
+            records.append((JOURNAL_TYPES[codec.code][0], data))
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    return records, size, skipped
+
+
+def iter_frames(buffer: bytes) -> Iterator[Tuple[int, bytes, int]]:
+    """
+    依次返回每条完整且校验通过的记录的(类型, 负载, 结束位置)。
+    """
+    header_size: int = FRAME_HEADER.size
+    total: int = len(buffer)
+    offset: int = 0
+
+    while offset + header_size <= total:
+        length, code, checksum = FRAME_HEADER.unpack_from(buffer, offset)
+
+        start: int = offset + header_size
+        end: int = start + length
+        if end > total:
+            return
+
+        payload: bytes = buffer[start:end]
+        if crc32(payload) != checksum:
+            return
+
+        yield code, payload, end
+        offset = end
+
+
+def is_journal_closed(path: Path) -> bool:
+    """
+    日志文件的最后一条记录是否为结束标记。
+    """
+    if not path.exists():
+        return True
+
+    with open(path, "rb") as f:
+        buffer: bytes = f.read()
+
+    last_code: int = END_CODE
+    for code, _payload, _end in iter_frames(buffer):
+        last_code = code
+    return last_code == END_CODE
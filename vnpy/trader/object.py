@@ -2,15 +2,38 @@
 Basic data structure used for general trading function in the trading platform.
 """
 
-from dataclasses import dataclass, field
-from datetime import datetime
+import sys
+from dataclasses import MISSING, Field, dataclass, field, fields, make_dataclass
+from datetime import datetime, tzinfo
 from logging import INFO
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+
+import numpy as np
 
 from .constant import Direction, Exchange, Interval, Offset, Status, Product, OptionType, OrderType
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 ACTIVE_STATUSES = set([Status.SUBMITTING, Status.NOTTRADED, Status.PARTTRADED])
 
+# 已生成的vt_symbol缓存，相同合约的数据对象共享同一个字符串
+VT_SYMBOLS: Dict[Tuple[str, Exchange], str] = {}
+
+
+def get_vt_symbol(symbol: str, exchange: Exchange) -> str:
+    """
+    获取合约的vt_symbol，结果经过驻留，避免每个数据对象各自持有一份字符串。
+    """
+    key: Tuple[str, Exchange] = (symbol, exchange)
+    vt_symbol: str = VT_SYMBOLS.get(key, None)
+
+    if vt_symbol is None:
+        vt_symbol = sys.intern(f"{symbol}.{exchange.value}")
+        VT_SYMBOLS[key] = vt_symbol
+
+    return vt_symbol
+
 
 @dataclass
 class BaseData:
@@ -130,7 +153,7 @@ class TickData(BaseData):
         """
         初始化后处理函数，生成vt_symbol。
         """
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -173,7 +196,41 @@ class BarData(BaseData):
         总结:
             该方法用于在初始化后设置vt_symbol属性，格式为"{symbol}.{exchange.value}"。
         """
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
+
+
+def create_compact_class(cls: type, name: str) -> type:
+    """
+    根据数据类生成字段相同的__slots__版本，实例不再持有__dict__。
+
+    构造参数、属性、比较和repr与原数据类保持一致，vt_symbol作为不参与初始化的字段保存。
+    Python 3.10以下不支持slots参数，此时仅生成普通数据类。
+    """
+    specs: List[tuple] = []
+
+    for f in fields(cls):
+        if f.default is not MISSING:
+            spec: Field = field(default=f.default, init=f.init)
+        else:
+            spec = field(init=f.init)
+        specs.append((f.name, f.type, spec))
+
+    specs.append(("vt_symbol", str, field(init=False, repr=False, compare=False)))
+
+    namespace: dict = {
+        "__module__": __name__,
+        "__doc__": cls.__doc__,
+        "__post_init__": cls.__post_init__
+    }
+
+    if sys.version_info >= (3, 10):
+        return make_dataclass(name, specs, namespace=namespace, slots=True)
+    return make_dataclass(name, specs, namespace=namespace)
+
+
+# 大量回放数据使用的紧凑版本，接口与TickData/BarData一致
+CompactTickData: type = create_compact_class(TickData, "CompactTickData")
+CompactBarData: type = create_compact_class(BarData, "CompactBarData")
 
 
 @dataclass
@@ -562,3 +619,152 @@ class QuoteRequest:
             gateway_name=gateway_name,
         )
         return quote
+
+
+class DataBatch:
+    """
+    单个合约行情数据的列式容器，底层为NumPy结构化数组，每个字段对应一列。
+
+    合约代码等不随行变化的信息保存为属性，时间列以不带时区的datetime64[us]存储，
+    datetime列的时区信息单独保存，逐行访问时再按需生成数据对象。
+    """
+
+    data_class: type = None
+    meta_fields: Tuple[str, ...] = ()
+    dtype: np.dtype = None
+
+    def __init__(self, data: np.ndarray, tz: tzinfo = None, **meta: Any) -> None:
+        """
+        :param data: 结构化数组，dtype须与类的dtype一致。
+        :param tz: 时间列的时区。
+        :param meta: 合约代码、交易所等不随行变化的字段。
+        """
+        self.data: np.ndarray = data
+        self.tz: tzinfo = tz
+
+        for name in self.meta_fields:
+            setattr(self, name, meta.get(name, None))
+
+        self.vt_symbol: str = ""
+        if self.symbol and self.exchange:
+            self.vt_symbol = get_vt_symbol(self.symbol, self.exchange)
+
+    @classmethod
+    def from_list(cls, objects: Sequence[BaseData], **meta: Any) -> "DataBatch":
+        """
+        由数据对象列表生成，元信息默认取自第一个数据对象。
+        """
+        data: np.ndarray = np.empty(len(objects), dtype=cls.dtype)
+        tz: tzinfo = None
+
+        if len(objects):
+            first: BaseData = objects[0]
+            tz = first.datetime.tzinfo
+
+            for name in cls.meta_fields:
+                meta.setdefault(name, getattr(first, name))
+
+        for name in cls.dtype.names:
+            values: list = [getattr(obj, name) for obj in objects]
+
+            if cls.dtype[name].kind == "M":
+                values = [dt.replace(tzinfo=None) if dt else None for dt in values]
+
+            data[name] = values
+
+        return cls(data, tz, **meta)
+
+    def to_list(self) -> list:
+        """
+        转换为数据对象列表。
+        """
+        return list(self)
+
+    def to_pandas(self) -> "pd.DataFrame":
+        """
+        转换为DataFrame，各列直接引用底层数组，不复制数据。
+        """
+        import pandas as pd
+
+        data: np.ndarray = self.data
+        return pd.DataFrame({name: data[name] for name in data.dtype.names}, copy=False)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        获取某一列的数组视图。
+        """
+        return self.data[name]
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[BaseData]:
+        """"""
+        for values in self.data.tolist():
+            yield self._create_object(values)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[BaseData, "DataBatch"]:
+        """
+        整数索引返回单行的数据对象，切片返回共享底层数组的新容器。
+        """
+        if isinstance(index, slice):
+            meta: dict = {name: getattr(self, name) for name in self.meta_fields}
+            return type(self)(self.data[index], self.tz, **meta)
+
+        return self._create_object(self.data[index].item())
+
+    def _create_object(self, values: tuple) -> BaseData:
+        """
+        由一行数据生成数据对象。
+        """
+        kwargs: dict = {name: getattr(self, name) for name in self.meta_fields}
+        kwargs.update(zip(self.dtype.names, values))
+
+        # 时区只属于datetime列，localtime等其他时间列保持不带时区
+        dt: Optional[datetime] = kwargs["datetime"]
+        if dt and self.tz:
+            kwargs["datetime"] = dt.replace(tzinfo=self.tz)
+
+        return self.data_class(**kwargs)
+
+
+class BarBatch(DataBatch):
+    """
+    K线数据的列式容器，可以代替List[BarData]在历史数据相关接口中传递。
+    """
+
+    data_class: type = BarData
+    meta_fields: Tuple[str, ...] = ("gateway_name", "symbol", "exchange", "interval")
+    dtype: np.dtype = np.dtype([
+        ("datetime", "datetime64[us]"),
+        ("volume", "f8"),
+        ("turnover", "f8"),
+        ("open_interest", "f8"),
+        ("open_price", "f8"),
+        ("high_price", "f8"),
+        ("low_price", "f8"),
+        ("close_price", "f8"),
+    ])
+
+
+class TickBatch(DataBatch):
+    """
+    Tick数据的列式容器，可以代替List[TickData]在历史数据相关接口中传递。
+    """
+
+    data_class: type = TickData
+    meta_fields: Tuple[str, ...] = ("gateway_name", "symbol", "exchange", "name")
+    dtype: np.dtype = np.dtype(
+        [("datetime", "datetime64[us]")]
+        + [
+            (f.name, "f8") for f in fields(TickData)
+            if f.type is float or f.type == "float"
+        ]
+        + [("localtime", "datetime64[us]")]
+    )
+
+
+# 历史数据接口同时接受的数据类型
+BarSequence = Union[List[BarData], BarBatch]
+TickSequence = Union[List[TickData], TickBatch]
@@ -17,6 +17,16 @@ SETTINGS: Dict[str, Any] = {
     "log.level": CRITICAL,
     "log.console": True,
     "log.file": True,
+    "log.async": True,
+    "log.queue_size": 10000,
+
+    "oms.history_size": 0,
+    "oms.history_age": 0,
+    "oms.history_archive": True,
+
+    "journal.active": False,
+    "journal.fsync_interval": 1,
+    "journal.rollover_hour": 20,
 
     "email.server": "smtp.qq.com",
     "email.port": 465,
@@ -4,19 +4,25 @@ General utility functions.
 
 import json
 import logging
+import logging.handlers
 import sys
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import Callable, Dict, Tuple, Union, Optional
+from queue import Empty, Full, Queue
+from threading import Thread
+from typing import Any, Callable, Dict, List, Tuple, Union, Optional
 from decimal import Decimal
 from math import floor, ceil
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import talib
 import pandas as pd
 
-from .object import BarData, TickData
-from .constant import Exchange, Interval
+from .object import BarData, TickData, BarBatch, TickBatch
+from .indicator import Indicator
+from .constant import BarType, Exchange, Interval
 from .locale import _
 
 if sys.version_info >= (3, 9):
@@ -129,15 +135,39 @@ def round_to(value: float, target: float) -> float:
     """
     Round price to price tick value.
     """
+    rounder: PriceRounder = price_rounders.get(target, None) or get_price_rounder(target)
+    return rounder.round_to(value)
+
+
+def floor_to(value: float, target: float) -> float:
+    """
+    Similar to math.floor function, but to target float number.
+    """
+    rounder: PriceRounder = price_rounders.get(target, None) or get_price_rounder(target)
+    return rounder.floor_to(value)
+
+
+def ceil_to(value: float, target: float) -> float:
+    """
+    Similar to math.ceil function, but to target float number.
+    """
+    rounder: PriceRounder = price_rounders.get(target, None) or get_price_rounder(target)
+    return rounder.ceil_to(value)
+
+
+def decimal_round_to(value: float, target: float) -> float:
+    """
+    Reference implementation of round_to with Decimal.
+    """
     value: Decimal = Decimal(str(value))
     target: Decimal = Decimal(str(target))
     rounded: float = float(int(round(value / target)) * target)
     return rounded
 
 
-def floor_to(value: float, target: float) -> float:
+def decimal_floor_to(value: float, target: float) -> float:
     """
-    Similar to math.floor function, but to target float number.
+    Reference implementation of floor_to with Decimal.
     """
     value: Decimal = Decimal(str(value))
     target: Decimal = Decimal(str(target))
@@ -145,9 +175,9 @@ def floor_to(value: float, target: float) -> float:
     return result
 
 
-def ceil_to(value: float, target: float) -> float:
+def decimal_ceil_to(value: float, target: float) -> float:
     """
-    Similar to math.ceil function, but to target float number.
+    Reference implementation of ceil_to with Decimal.
     """
     value: Decimal = Decimal(str(value))
     target: Decimal = Decimal(str(target))
@@ -155,6 +185,178 @@ def ceil_to(value: float, target: float) -> float:
     return result
 
 
+class PriceRounder:
+    """
+    Rounding helper of one price tick, with the same results as the Decimal
+    implementation but using float division and integer scaling.
+
+    The price tick is stored as integer ticks / 10 ** digits, so that the
+    result n * ticks / 10 ** digits is correctly rounded.
+
+    When value / target is too close to an integer for float precision (e.g.
+    price already on the tick grid), value is compared with the grid price
+    k * ticks / 10 ** digits, which is exact as long as k * ticks < 2 ** 53.
+    Only values close to the half tick boundary of round_to, or too large
+    for exact calculation, use the Decimal implementation.
+    """
+
+    # Relative tolerance of value / target, far larger than float error
+    tolerance: float = 1e-9
+
+    def __init__(self, target: float) -> None:
+        """"""
+        self.target: float = target
+
+        self.valid: bool = target > 0 and target != float("inf")
+        if self.valid:
+            digits: int = get_digits(target)
+            self.scale: int = 10 ** digits
+            self.ticks: int = int(Decimal(str(target)) * self.scale)
+        else:
+            self.scale = 1
+            self.ticks = 0
+
+        # Float array calculation is exact only when n * ticks and scale are exact
+        self.array_limit: float = 0
+        if self.valid and self.scale <= 10 ** 22:
+            self.array_limit = min(4503599627370496, 9007199254740992 / self.ticks)
+
+    def round_to(self, value: float) -> float:
+        """
+        Round value to price tick.
+        """
+        if self.valid:
+            x: float = value / self.target
+            if abs(x) < 4503599627370496:
+                n: int = floor(x)
+                diff: float = x - n - 0.5
+                if abs(diff) > self.tolerance * (1 + abs(x)):
+                    if diff > 0:
+                        n += 1
+                    return n * self.ticks / self.scale
+
+        return decimal_round_to(value, self.target)
+
+    def floor_to(self, value: float) -> float:
+        """
+        Floor value to price tick.
+        """
+        if self.valid:
+            x: float = value / self.target
+            if abs(x) < 4503599627370496:
+                n: int = floor(x)
+                tolerance: float = self.tolerance * (1 + abs(x))
+                if tolerance < x - n < 1 - tolerance:
+                    return n * self.ticks / self.scale
+
+            # Close to integer k, below the grid price means floor is k - 1
+            if abs(x) < self.array_limit:
+                k: int = round(x)
+                grid: float = k * self.ticks / self.scale
+                if value < grid:
+                    return (k - 1) * self.ticks / self.scale
+                return grid
+
+        return decimal_floor_to(value, self.target)
+
+    def ceil_to(self, value: float) -> float:
+        """
+        Ceil value to price tick.
+        """
+        if self.valid:
+            x: float = value / self.target
+            if abs(x) < 4503599627370496:
+                n: int = floor(x)
+                tolerance: float = self.tolerance * (1 + abs(x))
+                if tolerance < x - n < 1 - tolerance:
+                    return (n + 1) * self.ticks / self.scale
+
+            # Close to integer k, above the grid price means ceil is k + 1
+            if abs(x) < self.array_limit:
+                k: int = round(x)
+                grid: float = k * self.ticks / self.scale
+                if value > grid:
+                    return (k + 1) * self.ticks / self.scale
+                return grid
+
+        return decimal_ceil_to(value, self.target)
+
+    def round_array(self, values: np.ndarray) -> np.ndarray:
+        """
+        Round array of values to price tick.
+        """
+        return self._process_array(values, np.round, decimal_round_to, 0.5)
+
+    def floor_array(self, values: np.ndarray) -> np.ndarray:
+        """
+        Floor array of values to price tick.
+        """
+        return self._process_array(values, np.floor, decimal_floor_to, 0)
+
+    def ceil_array(self, values: np.ndarray) -> np.ndarray:
+        """
+        Ceil array of values to price tick.
+        """
+        return self._process_array(values, np.ceil, decimal_ceil_to, 0)
+
+    def _process_array(
+        self,
+        values: np.ndarray,
+        func: Callable,
+        reference: Callable,
+        boundary: float
+    ) -> np.ndarray:
+        """
+        Process array with NumPy, values close to boundary use reference function.
+        """
+        values = np.asarray(values, dtype=float)
+
+        if not self.array_limit:
+            return np.array([reference(v, self.target) for v in values.ravel()]).reshape(values.shape)
+
+        x: np.ndarray = values / self.target
+
+        with np.errstate(invalid="ignore"):
+            unsafe: np.ndarray = ~(np.abs(x) < self.array_limit)
+
+        if boundary:
+            # NumPy rounds half to even, same as Decimal
+            n: np.ndarray = func(x)
+
+            distance: np.ndarray = np.abs(x - np.floor(x) - boundary)
+            with np.errstate(invalid="ignore"):
+                unsafe |= ~(distance > self.tolerance * (1 + np.abs(x)))
+        else:
+            # Close to integer k, the side of the grid price decides the result
+            k: np.ndarray = np.round(x)
+            grid: np.ndarray = k * self.ticks / self.scale
+
+            with np.errstate(invalid="ignore"):
+                near: np.ndarray = np.abs(x - k) <= self.tolerance * (1 + np.abs(x))
+                n = np.where(near, func(k + np.sign(values - grid) * 0.5), func(x))
+
+        result: np.ndarray = n * self.ticks / self.scale + 0.0
+
+        for index in zip(*np.nonzero(unsafe)):
+            result[index] = reference(float(values[index]), self.target)
+
+        return result
+
+
+price_rounders: Dict[float, PriceRounder] = {}
+
+
+def get_price_rounder(target: float) -> PriceRounder:
+    """
+    Get cached rounding helper of price tick, e.g. ContractData.pricetick.
+    """
+    rounder: PriceRounder = price_rounders.get(target, None)
+    if rounder is None:
+        rounder = PriceRounder(target)
+        price_rounders[target] = rounder
+    return rounder
+
+
 def get_digits(value: float) -> int:
     """
     Get number of digits after decimal point.
@@ -171,23 +373,44 @@ def get_digits(value: float) -> int:
         return 0
 
 
+EPOCH: datetime = datetime(1970, 1, 1)
+
+
+def to_nanoseconds(dt: datetime) -> int:
+    """
+    Convert wall-clock time of datetime into int64 nanoseconds since epoch,
+    the same value as numpy datetime64[ns] of the naive datetime.
+    """
+    delta: timedelta = dt.replace(tzinfo=None) - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+
 class BarGenerator:
     """
     For:
     1. generating 1 minute bar data from tick data
     2. generating x minute bar/x hour bar data from 1 minute data
+    3. generating x second/volume/range bar data directly from tick data
     Notice:
-    1. for x minute bar, x must be able to divide 60: 2, 3, 5, 6, 10, 15, 20, 30
+    1. for x minute bar, windows are counted from 00:00 of the day, so x
+       should be able to divide 1440 (e.g. 2, 3, 5, 15, 45, 90), otherwise
+       the last window bar before midnight is shorter than x minutes
     2. for x hour bar, x can be any number
+    3. for x second bar, use interval SECOND, windows are counted from 00:00
+    4. for volume/range bar, use bar_type VOLUME/RANGE with window as the
+       volume/price range threshold, the bar is pushed once reaching it
+    5. x second/volume/range bars are only generated by update_tick, and
+       update_bar does nothing for them
     """
 
     def __init__(
         self,
         on_bar: Callable,
-        window: int = 0,
+        window: float = 0,
         on_window_bar: Callable = None,
         interval: Interval = Interval.MINUTE,
-        daily_end: time = None
+        daily_end: time = None,
+        bar_type: BarType = BarType.TIME
     ) -> None:
         """Constructor"""
         self.bar: BarData = None
@@ -209,6 +432,15 @@ class BarGenerator:
         if self.interval == Interval.DAILY and not self.daily_end:
             raise RuntimeError(_("合成日K线必须传入每日收盘时间"))
 
+        # Bars generated directly from tick data
+        self.bar_type: BarType = bar_type
+        self.tick_window: bool = bar_type != BarType.TIME or interval == Interval.SECOND
+        self.tick_bar: BarData = None
+        self.tick_bar_key: int = 0
+
+        if self.tick_window and window <= 0:
+            raise RuntimeError(_("合成秒级、成交量或价格区间K线必须传入大于0的窗口"))
+
     def update_tick(self, tick: TickData) -> None:
         """
         Update new tick data into generator.
@@ -258,19 +490,103 @@ class BarGenerator:
             self.bar.open_interest = tick.open_interest
             self.bar.datetime = tick.datetime
 
+        volume_change: float = 0
+        turnover_change: float = 0
+
         if self.last_tick:
-            volume_change: float = tick.volume - self.last_tick.volume
-            self.bar.volume += max(volume_change, 0)
+            volume_change = max(tick.volume - self.last_tick.volume, 0)
+            self.bar.volume += volume_change
 
-            turnover_change: float = tick.turnover - self.last_tick.turnover
-            self.bar.turnover += max(turnover_change, 0)
+            turnover_change = max(tick.turnover - self.last_tick.turnover, 0)
+            self.bar.turnover += turnover_change
+
+        if self.tick_window:
+            self.update_tick_window(tick, volume_change, turnover_change)
 
         self.last_tick = tick
 
+    def update_tick_window(
+        self,
+        tick: TickData,
+        volume_change: float,
+        turnover_change: float
+    ) -> None:
+        """
+        Update tick data into x second/volume/range bar.
+        """
+        bar: BarData = self.tick_bar
+        dt: datetime = tick.datetime
+
+        # Check if time window changed
+        if self.bar_type == BarType.TIME:
+            seconds: int = dt.hour * 3600 + dt.minute * 60 + dt.second
+            start: int = int(seconds // self.window * self.window)
+            key: int = dt.toordinal() * 86400 + start
+
+            if bar and key != self.tick_bar_key:
+                self.on_window_bar(bar)
+                bar = None
+
+            self.tick_bar_key = key
+
+        # Create new bar or update existing one
+        if not bar:
+            if self.bar_type == BarType.TIME:
+                dt = dt.replace(
+                    hour=start // 3600,
+                    minute=start % 3600 // 60,
+                    second=start % 60,
+                    microsecond=0
+                )
+                interval: Interval = Interval.SECOND
+            else:
+                interval = None
+
+            bar = BarData(
+                symbol=tick.symbol,
+                exchange=tick.exchange,
+                interval=interval,
+                datetime=dt,
+                gateway_name=tick.gateway_name,
+                open_price=tick.last_price,
+                high_price=tick.last_price,
+                low_price=tick.last_price,
+                close_price=tick.last_price,
+                open_interest=tick.open_interest
+            )
+            self.tick_bar = bar
+        else:
+            bar.high_price = max(bar.high_price, tick.last_price)
+            if tick.high_price > self.last_tick.high_price:
+                bar.high_price = max(bar.high_price, tick.high_price)
+
+            bar.low_price = min(bar.low_price, tick.last_price)
+            if tick.low_price < self.last_tick.low_price:
+                bar.low_price = min(bar.low_price, tick.low_price)
+
+            bar.close_price = tick.last_price
+            bar.open_interest = tick.open_interest
+
+        bar.volume += volume_change
+        bar.turnover += turnover_change
+
+        # Push volume/range bar once reaching threshold
+        if (
+            (self.bar_type == BarType.VOLUME and bar.volume >= self.window)
+            or (self.bar_type == BarType.RANGE and bar.high_price - bar.low_price >= self.window)
+        ):
+            self.on_window_bar(bar)
+            self.tick_bar = None
+
     def update_bar(self, bar: BarData) -> None:
         """
         Update 1 minute bar into generator
         """
+        # Window of tick bars is not a number of minutes, ignore 1 minute
+        # bars forwarded from on_bar
+        if self.tick_window:
+            return
+
         if self.interval == Interval.MINUTE:
             self.update_bar_minute_window(bar)
         elif self.interval == Interval.HOUR:
@@ -309,8 +625,8 @@ class BarGenerator:
         self.window_bar.turnover += bar.turnover
         self.window_bar.open_interest = bar.open_interest
 
-        # Check if window bar completed
-        if not (bar.datetime.minute + 1) % self.window:
+        # Check if window bar completed, counted by minute of the day
+        if not (bar.datetime.hour * 60 + bar.datetime.minute + 1) % self.window:
             self.on_window_bar(self.window_bar)
             self.window_bar = None
 
@@ -485,7 +801,310 @@ class BarGenerator:
         return bar
 
 
-class ArrayManager(object):
+def _segment_bars(
+    data: np.ndarray,
+    starts: np.ndarray,
+    datetimes: np.ndarray,
+    open_price: np.ndarray,
+    high_price: np.ndarray,
+    low_price: np.ndarray
+) -> np.ndarray:
+    """
+    Aggregate consecutive segments of bar data into new bar array.
+    """
+    ends: np.ndarray = np.append(starts[1:], len(data)) - 1
+
+    result: np.ndarray = np.empty(len(starts), dtype=BarBatch.dtype)
+    result["datetime"] = datetimes
+    result["open_price"] = open_price[starts]
+    result["high_price"] = np.maximum.reduceat(high_price, starts)
+    result["low_price"] = np.minimum.reduceat(low_price, starts)
+    result["close_price"] = data["close_price"][ends]
+    result["volume"] = np.add.reduceat(data["volume"], starts)
+    result["turnover"] = np.add.reduceat(data["turnover"], starts)
+    result["open_interest"] = data["open_interest"][ends]
+    return result
+
+
+class BulkBarGenerator:
+    """
+    Vectorized version of BarGenerator for historical data, which generates
+    bars from whole TickBatch/BarBatch with NumPy segment operations.
+
+    The rules are the same as BarGenerator (zero price filter, volume and
+    turnover from tick deltas, tick high/low extremes, window boundaries and
+    daily_end), and only the bars which BarGenerator would push are returned.
+    Each call is independent, the data should be one continuous series.
+    """
+
+    def __init__(
+        self,
+        window: int = 0,
+        interval: Interval = Interval.MINUTE,
+        daily_end: time = None
+    ) -> None:
+        """Constructor"""
+        self.window: int = window
+        self.interval: Interval = interval
+
+        self.daily_end: time = daily_end
+        if self.interval == Interval.DAILY and not self.daily_end:
+            raise RuntimeError(_("合成日K线必须传入每日收盘时间"))
+
+    def generate_bars(self, ticks: TickBatch, flush: bool = False) -> BarBatch:
+        """
+        Generate 1 minute bars from ticks.
+
+        The last bar is only returned when flush is True, same as calling
+        BarGenerator.generate after the last tick.
+        """
+        # Filter tick data with 0 last price, only copy the columns used
+        valid: np.ndarray = ticks.data["last_price"] != 0
+        data: Dict[str, np.ndarray] = {
+            name: ticks.data[name][valid]
+            for name in (
+                "datetime", "last_price", "high_price", "low_price",
+                "volume", "turnover", "open_interest"
+            )
+        }
+        count: int = len(data["datetime"])
+
+        minutes: np.ndarray = data["datetime"].astype("datetime64[m]")
+        keys: np.ndarray = minutes.astype(np.int64) % 1440
+
+        changed: np.ndarray = np.empty(count, dtype=bool)
+        changed[:1] = True
+        changed[1:] = keys[1:] != keys[:-1]
+        starts: np.ndarray = np.flatnonzero(changed)
+
+        # Tick high/low extremes are only used when they moved within the bar
+        high: np.ndarray = data["high_price"]
+        low: np.ndarray = data["low_price"]
+        high_price: np.ndarray = data["last_price"].copy()
+        low_price: np.ndarray = data["last_price"].copy()
+
+        rise: np.ndarray = np.zeros(count, dtype=bool)
+        rise[1:] = (high[1:] > high[:-1]) & ~changed[1:]
+        np.maximum(high_price, np.where(rise, high, high_price), out=high_price)
+
+        fall: np.ndarray = np.zeros(count, dtype=bool)
+        fall[1:] = (low[1:] < low[:-1]) & ~changed[1:]
+        np.minimum(low_price, np.where(fall, low, low_price), out=low_price)
+
+        deltas: np.ndarray = np.zeros(count, dtype=[("volume", "f8"), ("turnover", "f8")])
+        deltas["volume"][1:] = np.maximum(np.diff(data["volume"]), 0)
+        deltas["turnover"][1:] = np.maximum(np.diff(data["turnover"]), 0)
+
+        if not count:
+            result: np.ndarray = np.empty(0, dtype=BarBatch.dtype)
+        else:
+            ends: np.ndarray = np.append(starts[1:], count) - 1
+
+            result = np.empty(len(starts), dtype=BarBatch.dtype)
+            result["datetime"] = minutes[ends]
+            result["open_price"] = data["last_price"][starts]
+            result["high_price"] = np.maximum.reduceat(high_price, starts)
+            result["low_price"] = np.minimum.reduceat(low_price, starts)
+            result["close_price"] = data["last_price"][ends]
+            result["volume"] = np.add.reduceat(deltas["volume"], starts)
+            result["turnover"] = np.add.reduceat(deltas["turnover"], starts)
+            result["open_interest"] = data["open_interest"][ends]
+
+            if not flush:
+                result = result[:-1]
+
+        return BarBatch(
+            result,
+            ticks.tz,
+            gateway_name=ticks.gateway_name,
+            symbol=ticks.symbol,
+            exchange=ticks.exchange,
+            interval=Interval.MINUTE
+        )
+
+    def generate_window_bars(self, bars: BarBatch) -> BarBatch:
+        """
+        Generate x minute/x hour/daily bars from 1 minute bars.
+        """
+        data: np.ndarray = bars.data
+
+        if not len(data):
+            result: np.ndarray = np.empty(0, dtype=BarBatch.dtype)
+        elif self.interval == Interval.MINUTE:
+            result = self._generate_minute_window(data)
+        elif self.interval == Interval.HOUR:
+            result = self._generate_hour_window(data)
+        else:
+            result = self._generate_daily_window(data)
+
+        # Window bars of BarGenerator are created without interval
+        return BarBatch(
+            result,
+            bars.tz,
+            gateway_name=bars.gateway_name,
+            symbol=bars.symbol,
+            exchange=bars.exchange
+        )
+
+    def _generate_minute_window(self, data: np.ndarray) -> np.ndarray:
+        """"""
+        minutes: np.ndarray = data["datetime"].astype("datetime64[m]")
+
+        finished: np.ndarray = (minutes.astype(np.int64) % 1440 + 1) % self.window == 0
+        starts: np.ndarray = np.flatnonzero(np.concatenate(([True], finished[:-1])))
+
+        result: np.ndarray = _segment_bars(
+            data,
+            starts,
+            minutes[starts],
+            data["open_price"],
+            data["high_price"],
+            data["low_price"]
+        )
+        return result[finished[np.append(starts[1:], len(data)) - 1]]
+
+    def _generate_hour_window(self, data: np.ndarray) -> np.ndarray:
+        """"""
+        minutes: np.ndarray = data["datetime"].astype("datetime64[m]").astype(np.int64)
+        hours: List[int] = (minutes // 60 % 24).tolist()
+        is_59: List[bool] = (minutes % 60 == 59).tolist()
+
+        # A new hour bar starts after a bar of minute 59 or when hour changes
+        start_flags: List[bool] = []
+        closed: bool = True
+
+        for i, hour in enumerate(hours):
+            start: bool = closed or hour != hours[i - 1]
+            start_flags.append(start)
+            closed = is_59[i] and not start
+
+        starts: np.ndarray = np.flatnonzero(start_flags)
+        hour_bars: np.ndarray = _segment_bars(
+            data,
+            starts,
+            data["datetime"][starts].astype("datetime64[h]"),
+            data["open_price"],
+            data["high_price"],
+            data["low_price"]
+        )
+
+        # The last hour bar is pushed only when closed by minute 59
+        if not closed:
+            hour_bars = hour_bars[:-1]
+
+        if self.window <= 1:
+            return hour_bars
+
+        count: int = len(hour_bars) // self.window * self.window
+        hour_bars = hour_bars[:count]
+
+        return _segment_bars(
+            hour_bars,
+            np.arange(0, count, self.window),
+            hour_bars["datetime"][::self.window],
+            hour_bars["open_price"],
+            hour_bars["high_price"],
+            hour_bars["low_price"]
+        )
+
+    def _generate_daily_window(self, data: np.ndarray) -> np.ndarray:
+        """"""
+        dt: np.ndarray = data["datetime"]
+        days: np.ndarray = dt.astype("datetime64[D]")
+
+        end: datetime = datetime.combine(datetime(1970, 1, 1), self.daily_end)
+        end_offset: np.timedelta64 = np.timedelta64(end - EPOCH, "us")
+
+        finished: np.ndarray = (dt - days) == end_offset
+        starts: np.ndarray = np.flatnonzero(np.concatenate(([True], finished[:-1])))
+        ends: np.ndarray = np.append(starts[1:], len(data)) - 1
+
+        result: np.ndarray = _segment_bars(
+            data,
+            starts,
+            days[ends],
+            data["open_price"],
+            data["high_price"],
+            data["low_price"]
+        )
+        return result[finished[ends]]
+
+
+def freeze_result(result: Any) -> None:
+    """
+    Make arrays of an indicator result read-only.
+    """
+    if isinstance(result, np.ndarray):
+        result.setflags(write=False)
+    elif isinstance(result, tuple):
+        for item in result:
+            if isinstance(item, np.ndarray):
+                item.setflags(write=False)
+
+
+def cache_indicator(func: Callable) -> Callable:
+    """
+    Memoize indicator result of ArrayManager until next update_bar.
+
+    Results are keyed by (function, args, bar count). The returned arrays are
+    shared by all callers within the same bar, so they are made read-only.
+    """
+    name: str = func.__name__
+
+    @wraps(func)
+    def wrapper(self: "ArrayManager", *args, **kwargs) -> Any:
+        if self._cache_count != self.count:
+            self._cache.clear()
+            self._cache_count = self.count
+
+        if kwargs:
+            key: tuple = (name, args, tuple(kwargs.items()))
+        else:
+            key = (name, args)
+
+        try:
+            result: Any = self._cache[key]
+            self.cache_hits += 1
+        except KeyError:
+            result = func(self, *args, **kwargs)
+            freeze_result(result)
+            self._cache[key] = result
+            self.cache_misses += 1
+
+        return result
+
+    return wrapper
+
+
+class BaseArrayManager:
+    """
+    State shared by all array managers: window size, update count and
+    indicator result cache.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Constructor"""
+        self.count: int = 0
+        self.size: int = size
+        self.inited: bool = False
+
+        self._cache: Dict[tuple, Any] = {}
+        self._cache_count: int = 0
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Get hit/miss statistics of indicator result cache.
+        """
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._cache)
+        }
+
+
+class ArrayManager(BaseArrayManager):
     """
     For:
     1. time series container of bar data
@@ -494,9 +1113,18 @@ class ArrayManager(object):
 
     def __init__(self, size: int = 100) -> None:
         """Constructor"""
-        self.count: int = 0
-        self.size: int = size
-        self.inited: bool = False
+        super().__init__(size)
+
+        self.indicators: Dict[str, Indicator] = {}
+
+        self.init_arrays()
+
+    def init_arrays(self) -> None:
+        """
+        Allocate storage of time series, overridden by subclass with
+        different storage layout.
+        """
+        size: int = self.size
 
         self.open_array: np.ndarray = np.zeros(size)
         self.high_array: np.ndarray = np.zeros(size)
@@ -506,6 +1134,7 @@ class ArrayManager(object):
         self.turnover_array: np.ndarray = np.zeros(size)
         self.open_interest_array: np.ndarray = np.zeros(size)
         self.datetime_array: np.ndarray = np.zeros(size)
+
     def update_bar(self, bar: BarData) -> None:
         """
         Update new bar data into array manager.
@@ -531,9 +1160,26 @@ class ArrayManager(object):
         self.turnover_array[-1] = bar.turnover
         self.open_interest_array[-1] = bar.open_interest
         self.datetime_array[-1] = self.datetime_array[-1] = np.datetime64(pd.to_datetime(bar.datetime).date())
+
+        for indicator in self.indicators.values():
+            indicator.update_bar(bar)
         # print(bar.datetime)
         # print('dddd')
 
+    def register_indicator(self, name: str, indicator: Indicator) -> Indicator:
+        """
+        Register incremental indicator, which will be updated with every new
+        bar. Indicators should be registered before the first update_bar.
+        """
+        self.indicators[name] = indicator
+        return indicator
+
+    def get_indicator(self, name: str) -> Optional[Indicator]:
+        """
+        Get registered incremental indicator.
+        """
+        return self.indicators.get(name, None)
+
     @property
     def open(self) -> np.ndarray:
         """
@@ -583,6 +1229,7 @@ class ArrayManager(object):
         """
         return self.open_interest_array
 
+    @cache_indicator
     def sma(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Simple moving average.
@@ -592,6 +1239,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def ema(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Exponential moving average.
@@ -601,6 +1249,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def kama(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         KAMA.
@@ -610,6 +1259,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def wma(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         WMA.
@@ -619,6 +1269,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def apo(
         self,
         fast_period: int,
@@ -634,6 +1285,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def cmo(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         CMO.
@@ -643,6 +1295,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def mom(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         MOM.
@@ -652,6 +1305,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def ppo(
         self,
         fast_period: int,
@@ -667,6 +1321,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def roc(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROC.
@@ -676,6 +1331,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def rocr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROCR.
@@ -685,6 +1341,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def rocp(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROCP.
@@ -694,6 +1351,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def rocr_100(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROCR100.
@@ -703,6 +1361,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def trix(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         TRIX.
@@ -712,6 +1371,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def std(self, n: int, nbdev: int = 1, array: bool = False) -> Union[float, np.ndarray]:
         """
         Standard deviation.
@@ -721,6 +1381,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def obv(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         OBV.
@@ -730,6 +1391,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def cci(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Commodity Channel Index (CCI).
@@ -739,6 +1401,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def atr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Average True Range (ATR).
@@ -748,6 +1411,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def natr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         NATR.
@@ -757,6 +1421,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def rsi(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Relative Strenght Index (RSI).
@@ -766,6 +1431,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def macd(
         self,
         fast_period: int,
@@ -786,6 +1452,7 @@ class ArrayManager(object):
             return macd, signal, hist
         return macd[-1], signal[-1], hist[-1]
 
+    @cache_indicator
     def adx(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ADX.
@@ -795,6 +1462,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def adxr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ADXR.
@@ -804,6 +1472,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def dx(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         DX.
@@ -813,6 +1482,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def minus_di(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         MINUS_DI.
@@ -822,6 +1492,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def plus_di(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         PLUS_DI.
@@ -831,6 +1502,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def willr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         WILLR.
@@ -840,6 +1512,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def ultosc(
         self,
         time_period1: int = 7,
@@ -855,6 +1528,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def trange(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         TRANGE.
@@ -864,6 +1538,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def boll(
         self,
         n: int,
@@ -884,6 +1559,7 @@ class ArrayManager(object):
 
         return up, down
 
+    @cache_indicator
     def keltner(
         self,
         n: int,
@@ -904,6 +1580,7 @@ class ArrayManager(object):
 
         return up, down
 
+    @cache_indicator
     def donchian(
         self, n: int, array: bool = False
     ) -> Union[
@@ -920,6 +1597,7 @@ class ArrayManager(object):
             return up, down
         return up[-1], down[-1]
 
+    @cache_indicator
     def aroon(
         self,
         n: int,
@@ -937,6 +1615,7 @@ class ArrayManager(object):
             return aroon_up, aroon_down
         return aroon_up[-1], aroon_down[-1]
 
+    @cache_indicator
     def aroonosc(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Aroon Oscillator.
@@ -947,6 +1626,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def minus_dm(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         MINUS_DM.
@@ -957,6 +1637,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def plus_dm(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         PLUS_DM.
@@ -967,6 +1648,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def mfi(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Money Flow Index.
@@ -976,6 +1658,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def ad(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         AD.
@@ -985,6 +1668,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def adosc(
         self,
         fast_period: int,
@@ -999,6 +1683,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def bop(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         BOP.
@@ -1009,6 +1694,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def stoch(
         self,
         fastk_period: int,
@@ -1038,6 +1724,7 @@ class ArrayManager(object):
             return k, d
         return k[-1], d[-1]
 
+    @cache_indicator
     def sar(self, acceleration: float, maximum: float, array: bool = False) -> Union[float, np.ndarray]:
         """
         SAR.
@@ -1048,6 +1735,364 @@ class ArrayManager(object):
         return result[-1]
 
 
+def _ring_view(row: int) -> property:
+    """
+    Create property of ordered view on one row of RingArrayManager buffer.
+    """
+    def view(self: "RingArrayManager") -> np.ndarray:
+        return self._buffer[row, self._index:self._index + self.size]
+
+    return property(view)
+
+
+def _panel_view(row: int) -> property:
+    """
+    Create property of ordered view on one field of PanelArrayManager buffer.
+    """
+    def view(self: "PanelArrayManager") -> np.ndarray:
+        return self._buffer[row, :, self._index:self._index + self.size]
+
+    return property(view)
+
+
+class RingArrayManager(ArrayManager):
+    """
+    ArrayManager backed by ring buffer.
+
+    Each field is stored twice in a buffer of 2 * size, so that update_bar
+    only writes the new values (O(1)) while the time series are still
+    contiguous ordered views which can be passed to talib directly.
+
+    The views are only valid until the next update_bar, copy them if they
+    need to be kept. datetime_array is int64 nanoseconds of bar wall-clock
+    time (view as datetime64[ns] with datetime property).
+    """
+
+    def init_arrays(self) -> None:
+        """"""
+        size: int = self.size
+
+        self._index: int = 0
+        self._buffer: np.ndarray = np.zeros((7, size * 2))
+        self._datetime_buffer: np.ndarray = np.zeros(size * 2, dtype=np.int64)
+
+    def update_bar(self, bar: BarData) -> None:
+        """
+        Update new bar data into array manager.
+        """
+        self.count += 1
+        if not self.inited and self.count >= self.size:
+            self.inited = True
+
+        values: tuple = (
+            bar.open_price,
+            bar.high_price,
+            bar.low_price,
+            bar.close_price,
+            bar.volume,
+            bar.turnover,
+            bar.open_interest
+        )
+        dt: int = to_nanoseconds(bar.datetime)
+
+        index: int = self._index
+        size: int = self.size
+
+        self._buffer[:, index] = values
+        self._buffer[:, index + size] = values
+        self._datetime_buffer[index] = dt
+        self._datetime_buffer[index + size] = dt
+
+        index += 1
+        if index == size:
+            index = 0
+        self._index = index
+
+        for indicator in self.indicators.values():
+            indicator.update_bar(bar)
+
+    open_array: np.ndarray = _ring_view(0)
+    high_array: np.ndarray = _ring_view(1)
+    low_array: np.ndarray = _ring_view(2)
+    close_array: np.ndarray = _ring_view(3)
+    volume_array: np.ndarray = _ring_view(4)
+    turnover_array: np.ndarray = _ring_view(5)
+    open_interest_array: np.ndarray = _ring_view(6)
+
+    @property
+    def datetime_array(self) -> np.ndarray:
+        """
+        Get bar datetime time series in int64 nanoseconds.
+        """
+        return self._datetime_buffer[self._index:self._index + self.size]
+
+    @property
+    def datetime(self) -> np.ndarray:
+        """
+        Get bar datetime time series in datetime64[ns].
+        """
+        return self.datetime_array.view("datetime64[ns]")
+
+
+@lru_cache(maxsize=None)
+def get_ema_matrix(length: int, period: int, alpha: float) -> np.ndarray:
+    """
+    Get weight matrix of EMA seeded with simple average of the first period
+    values (talib style), so that EMA of series x is x @ matrix.T.
+
+    Rows before the first available value are NaN.
+    """
+    matrix: np.ndarray = np.zeros((length, length))
+    matrix[:period - 1] = np.nan
+
+    decay: float = 1 - alpha
+    for row in range(period - 1, length):
+        matrix[row, :period] = decay ** (row - period + 1) / period
+        matrix[row, period:row + 1] = alpha * decay ** np.arange(row - period, -1, -1)
+
+    return matrix
+
+
+def seeded_ema(x: np.ndarray, period: int, alpha: float, array: bool) -> np.ndarray:
+    """
+    Calculate seeded EMA of every row in 2-D array x.
+    """
+    matrix: np.ndarray = get_ema_matrix(x.shape[1], period, alpha)
+    if array:
+        return x @ matrix.T
+    return x @ matrix[-1]
+
+
+class PanelArrayManager(BaseArrayManager):
+    """
+    Time series container of multiple symbols, each field is stored in a
+    2-D (symbols x window) ring buffer.
+
+    Bars of all symbols are updated together as one cross section, and
+    indicators are calculated for all symbols in one vectorized call. The
+    results are arrays ordered the same as vt_symbols, with shape (symbols,),
+    or (symbols, size) when array is True.
+
+    Recursive indicators follow the talib algorithms seeded at the start of
+    the window, same as ArrayManager.
+    """
+
+    def __init__(self, vt_symbols: List[str], size: int = 100) -> None:
+        """Constructor"""
+        self.vt_symbols: List[str] = list(vt_symbols)
+        self.indexes: Dict[str, int] = {vt_symbol: i for i, vt_symbol in enumerate(self.vt_symbols)}
+
+        super().__init__(size)
+
+        self._index: int = 0
+        self._buffer: np.ndarray = np.zeros((7, len(self.vt_symbols), size * 2))
+        self._datetime_buffer: np.ndarray = np.zeros(size * 2, dtype=np.int64)
+        self._last: np.ndarray = np.zeros((7, len(self.vt_symbols)))
+
+    def update_bars(self, bars: Dict[str, BarData]) -> None:
+        """
+        Update cross section of bar data into array manager.
+
+        Symbols without bar are filled with previous close price and zero
+        volume/turnover.
+        """
+        self.count += 1
+        if not self.inited and self.count >= self.size:
+            self.inited = True
+
+        values: np.ndarray = self._last
+        values[0] = values[1] = values[2] = values[3]
+        values[4] = values[5] = 0
+
+        dt: Optional[datetime] = None
+
+        for vt_symbol, bar in bars.items():
+            i: Optional[int] = self.indexes.get(vt_symbol, None)
+            if i is None:
+                continue
+
+            values[:, i] = (
+                bar.open_price,
+                bar.high_price,
+                bar.low_price,
+                bar.close_price,
+                bar.volume,
+                bar.turnover,
+                bar.open_interest
+            )
+            dt = bar.datetime
+
+        index: int = self._index
+        size: int = self.size
+
+        self._buffer[:, :, index] = values
+        self._buffer[:, :, index + size] = values
+
+        if dt:
+            ns: int = to_nanoseconds(dt)
+            self._datetime_buffer[index] = ns
+            self._datetime_buffer[index + size] = ns
+
+        index += 1
+        if index == size:
+            index = 0
+        self._index = index
+
+    def get_index(self, vt_symbol: str) -> Optional[int]:
+        """
+        Get row index of symbol in arrays.
+        """
+        return self.indexes.get(vt_symbol, None)
+
+    open: np.ndarray = _panel_view(0)
+    high: np.ndarray = _panel_view(1)
+    low: np.ndarray = _panel_view(2)
+    close: np.ndarray = _panel_view(3)
+    volume: np.ndarray = _panel_view(4)
+    turnover: np.ndarray = _panel_view(5)
+    open_interest: np.ndarray = _panel_view(6)
+
+    @property
+    def datetime(self) -> np.ndarray:
+        """
+        Get bar datetime time series in datetime64[ns].
+        """
+        return self._datetime_buffer[self._index:self._index + self.size].view("datetime64[ns]")
+
+    @cache_indicator
+    def sma(self, n: int, array: bool = False) -> np.ndarray:
+        """
+        Simple moving average.
+        """
+        close: np.ndarray = self.close
+
+        if not array:
+            return close[:, -n:].mean(axis=1)
+
+        result: np.ndarray = np.full(close.shape, np.nan)
+        result[:, n - 1:] = sliding_window_view(close, n, axis=1).mean(axis=2)
+        return result
+
+    @cache_indicator
+    def ema(self, n: int, array: bool = False) -> np.ndarray:
+        """
+        Exponential moving average.
+        """
+        return seeded_ema(self.close, n, 2 / (n + 1), array)
+
+    @cache_indicator
+    def std(self, n: int, nbdev: int = 1, array: bool = False) -> np.ndarray:
+        """
+        Standard deviation.
+        """
+        close: np.ndarray = self.close
+
+        if not array:
+            return close[:, -n:].std(axis=1) * nbdev
+
+        result: np.ndarray = np.full(close.shape, np.nan)
+        result[:, n - 1:] = sliding_window_view(close, n, axis=1).std(axis=2) * nbdev
+        return result
+
+    @cache_indicator
+    def atr(self, n: int, array: bool = False) -> np.ndarray:
+        """
+        Average True Range (ATR).
+        """
+        high: np.ndarray = self.high[:, 1:]
+        low: np.ndarray = self.low[:, 1:]
+        pre_close: np.ndarray = self.close[:, :-1]
+
+        tr: np.ndarray = np.maximum(high, pre_close) - np.minimum(low, pre_close)
+        result: np.ndarray = seeded_ema(tr, n, 1 / n, array)
+
+        if not array:
+            return result
+        return np.hstack((np.full((tr.shape[0], 1), np.nan), result))
+
+    @cache_indicator
+    def rsi(self, n: int, array: bool = False) -> np.ndarray:
+        """
+        Relative Strenght Index (RSI).
+        """
+        change: np.ndarray = np.diff(self.close, axis=1)
+
+        gain: np.ndarray = seeded_ema(np.maximum(change, 0), n, 1 / n, array)
+        loss: np.ndarray = seeded_ema(np.maximum(-change, 0), n, 1 / n, array)
+        total: np.ndarray = gain + loss
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result: np.ndarray = np.where(np.abs(total) < 1e-14, 0, 100 * gain / total)
+        result[np.isnan(total)] = np.nan
+
+        if not array:
+            return result
+        return np.hstack((np.full((change.shape[0], 1), np.nan), result))
+
+    @cache_indicator
+    def macd(
+        self,
+        fast_period: int,
+        slow_period: int,
+        signal_period: int,
+        array: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        MACD.
+        """
+        if slow_period < fast_period:
+            fast_period, slow_period = slow_period, fast_period
+
+        # Fast EMA is seeded at the same bar as slow EMA (talib alignment)
+        close: np.ndarray = self.close
+        start: int = slow_period - 1
+
+        fast: np.ndarray = seeded_ema(close[:, slow_period - fast_period:], fast_period, 2 / (fast_period + 1), True)
+        slow: np.ndarray = seeded_ema(close, slow_period, 2 / (slow_period + 1), True)
+        line: np.ndarray = fast[:, -(close.shape[1] - start):] - slow[:, start:]
+
+        signal: np.ndarray = seeded_ema(line, signal_period, 2 / (signal_period + 1), True)
+        line[:, :signal_period - 1] = np.nan
+
+        if not array:
+            return line[:, -1], signal[:, -1], line[:, -1] - signal[:, -1]
+
+        padding: np.ndarray = np.full((close.shape[0], start), np.nan)
+        macd: np.ndarray = np.hstack((padding, line))
+        signal = np.hstack((padding, signal))
+        return macd, signal, macd - signal
+
+    @cache_indicator
+    def boll(self, n: int, dev: float, array: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bollinger Channel.
+        """
+        mid: np.ndarray = self.sma(n, array)
+        std: np.ndarray = self.std(n, 1, array)
+
+        up: np.ndarray = mid + std * dev
+        down: np.ndarray = mid - std * dev
+
+        return up, down
+
+    @cache_indicator
+    def donchian(self, n: int, array: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Donchian Channel.
+        """
+        high: np.ndarray = self.high
+        low: np.ndarray = self.low
+
+        if not array:
+            return high[:, -n:].max(axis=1), low[:, -n:].min(axis=1)
+
+        up: np.ndarray = np.full(high.shape, np.nan)
+        down: np.ndarray = np.full(low.shape, np.nan)
+        up[:, n - 1:] = sliding_window_view(high, n, axis=1).max(axis=2)
+        down[:, n - 1:] = sliding_window_view(low, n, axis=1).min(axis=2)
+        return up, down
+
+
 def virtual(func: Callable) -> Callable:
     """
     mark a function as "virtual", which means that this function can be override.
@@ -1077,3 +2122,178 @@ def get_file_logger(filename: str) -> logging.Logger:
     handler.setFormatter(log_formatter)
     logger.addHandler(handler)  # each handler will be added only once.
     return logger
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler which can leave flushing to the caller, so that records
+    written in one batch are flushed only once.
+    """
+
+    def __init__(self, stream: Any = None, batch: bool = False) -> None:
+        """"""
+        super().__init__(stream)
+        self.batch: bool = batch
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """"""
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if not self.batch:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+
+class DailyFileHandler(logging.FileHandler):
+    """
+    FileHandler writing into file named with date of each record
+    (e.g. vt_20240102.log), so that log file is switched every day.
+    """
+
+    def __init__(self, folder: Path, prefix: str = "vt", batch: bool = False) -> None:
+        """"""
+        self.folder: Path = folder
+        self.prefix: str = prefix
+        self.batch: bool = batch
+
+        now: datetime = datetime.now()
+        self.rollover_at: float = self.get_rollover_at(now)
+
+        super().__init__(self.get_path(now), mode="a", encoding="utf8", delay=True)
+
+    def get_path(self, dt: datetime) -> Path:
+        """"""
+        return self.folder.joinpath(f"{self.prefix}_{dt.strftime('%Y%m%d')}.log")
+
+    def get_rollover_at(self, dt: datetime) -> float:
+        """
+        Get timestamp of next midnight.
+        """
+        tomorrow: datetime = datetime.combine(dt.date() + timedelta(days=1), time.min)
+        return tomorrow.timestamp()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """"""
+        try:
+            if record.created >= self.rollover_at:
+                dt: datetime = datetime.fromtimestamp(record.created)
+                self.rollover_at = self.get_rollover_at(dt)
+                self.baseFilename = str(self.get_path(dt))
+                self.close()
+
+            if self.stream is None:
+                self.stream = self._open()
+
+            self.stream.write(self.format(record) + self.terminator)
+            if not self.batch:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler which never blocks the caller, records are dropped and
+    counted when the queue is full.
+
+    Records are put into queue as they are, and formatted in writer thread.
+    """
+
+    def __init__(self, queue: Queue) -> None:
+        """"""
+        super().__init__(queue)
+        self.dropped: int = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """"""
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """"""
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+
+class QueueLogListener:
+    """
+    Background writer of log records put by NonBlockingQueueHandler.
+
+    Records available in queue are written together, and handlers are
+    flushed once per batch.
+    """
+
+    def __init__(self, maxsize: int = 10000, batch_size: int = 1000) -> None:
+        """"""
+        self.queue: Queue = Queue(maxsize)
+        self.queue_handler: NonBlockingQueueHandler = NonBlockingQueueHandler(self.queue)
+        self.handlers: List[logging.Handler] = []
+        self.batch_size: int = batch_size
+
+        self.reported: int = 0
+        self.active: bool = False
+        self.thread: Thread = Thread(target=self.run, daemon=True)
+
+    def add_handler(self, handler: logging.Handler) -> None:
+        """"""
+        self.handlers.append(handler)
+
+    def start(self) -> None:
+        """"""
+        self.active = True
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop writer thread after remaining records are written.
+        """
+        if not self.active:
+            return
+
+        self.active = False
+        self.thread.join()
+
+        for handler in self.handlers:
+            handler.close()
+
+    def run(self) -> None:
+        """"""
+        while self.active or not self.queue.empty():
+            try:
+                record: logging.LogRecord = self.queue.get(timeout=0.5)
+            except Empty:
+                continue
+
+            batch: List[logging.LogRecord] = [record]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self.queue.get_nowait())
+            except Empty:
+                pass
+
+            dropped: int = self.queue_handler.dropped
+            if dropped > self.reported:
+                batch.append(self.create_drop_record(dropped - self.reported))
+                self.reported = dropped
+
+            for record in batch:
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+
+            for handler in self.handlers:
+                handler.flush()
+
+    def create_drop_record(self, count: int) -> logging.LogRecord:
+        """"""
+        return logging.LogRecord(
+            "veighna",
+            logging.WARNING,
+            __file__,
+            0,
+            _("日志队列已满，丢弃{}条日志").format(count),
+            None,
+            None
+        )